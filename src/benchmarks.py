@@ -0,0 +1,318 @@
+"""
+benchmarks de rendimiento del simulador
+mide pasos procesados por segundo y aviones procesados por segundo sobre una matriz de escenarios,
+ajusta el exponente de escalado del costo por paso contra la cantidad de aviones activos y guarda/compara
+baselines en json para detectar regresiones entre commits
+
+uso:
+    python src/benchmarks.py --rapida
+    python src/benchmarks.py --guardar benchmarks/base.json
+    python src/benchmarks.py --comparar benchmarks/base.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sim_core import Simulacion, ejecutar_multiples_simulaciones
+
+# tasas de arribo por minuto: desde trafico liviano hasta cerca de la saturacion (un avion cada 4 min = 0.25)
+LAMBDAS = (0.02, 0.05, 0.1, 0.2, 0.25)
+LAMBDAS_RAPIDA = (0.05, 0.2)
+
+# variantes de condiciones: nombre -> parametros de Simulacion
+VARIANTES = {
+    "base": {},
+    "viento": {"viento_activo": True, "p_goaround": 0.1},
+    "tormenta": {"storm_activa": True, "storm_prob": 1.0, "storm_duracion_min": 60},
+    "metering": {"enable_metering": True},
+}
+
+# metricas donde un valor menor es una regresion
+METRICAS_RENDIMIENTO = ("pasos_por_segundo", "aviones_por_segundo")
+
+# que mide cada ritmo, se guarda en la baseline. los minutos que saltar_periodos_inactivos adelanta sin procesar no
+# cuentan: dependerian de cuantos minutos ociosos tuvo la corrida y no de cuanto trabajo se hizo
+UNIDADES = {
+    "pasos_por_segundo": "llamadas a procesar_paso_temporal por segundo (sin los minutos salteados)",
+    "aviones_por_segundo": "aviones generados por segundo",
+    "replicas_por_segundo": "replicas completas por segundo (ejecutar_multiples_simulaciones)",
+}
+
+
+# corre f en silencio (la simulacion imprime progreso) y devuelve (resultado, segundos)
+def _cronometrar(f, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        resultado = f(*args, **kwargs)
+        segundos = time.perf_counter() - inicio
+    return resultado, segundos
+
+
+# hash corto del commit actual (None si no hay git)
+def _commit_actual() -> Optional[str]:
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return salida.stdout.strip() or None
+
+
+# envuelve procesar_paso_temporal de la simulacion para contar los pasos procesados; devuelve el contador (una lista
+# de un elemento que se va actualizando)
+def _contar_pasos(sim: Simulacion) -> list:
+    pasos = [0]
+    procesar = sim.procesar_paso_temporal
+
+    def contando() -> None:
+        pasos[0] += 1
+        procesar()
+
+    sim.procesar_paso_temporal = contando
+    return pasos
+
+
+# mide una corrida de ejecutar_simulacion_completa con la configuracion dada. minutos_simulados incluye los que
+# saltar_periodos_inactivos adelanta sin trabajo; el ritmo se calcula con pasos_procesados
+def medir_corrida(semilla: int = 0, repeticiones: int = 1, **config) -> dict:
+    mejor = float("inf")
+    for _ in range(repeticiones): # se queda con la mas rapida (la menos afectada por ruido del sistema)
+        sim = Simulacion(**config, semilla=semilla)
+        tiempo_inicial = sim.tiempo_actual
+        pasos = _contar_pasos(sim)
+        _, segundos = _cronometrar(sim.ejecutar_simulacion_completa)
+        mejor = min(mejor, segundos)
+
+    return {
+        "segundos": mejor,
+        "minutos_simulados": sim.tiempo_actual - tiempo_inicial,
+        "pasos_procesados": pasos[0],
+        "aviones": sim.estadisticas["total_aviones"],
+        "pasos_por_segundo": pasos[0] / mejor,
+        "aviones_por_segundo": sim.estadisticas["total_aviones"] / mejor,
+    }
+
+
+# mide ejecutar_multiples_simulaciones (replicas secuenciales o en pool de procesos). los pasos procesados quedan en
+# otros procesos o en el motor de replicas, asi que el ritmo se da en replicas y aviones por segundo
+def medir_multiples(num_simulaciones: int = 4, num_workers: Optional[int] = 1, semilla: int = 0, **config) -> dict:
+    stats, segundos = _cronometrar(ejecutar_multiples_simulaciones, num_simulaciones=num_simulaciones,
+                                   num_workers=num_workers, semilla=semilla, **config)
+    aviones = float(np.sum(stats["total_aviones"]["valores"]))
+    return {
+        "segundos": segundos,
+        "num_simulaciones": num_simulaciones,
+        "num_workers": num_workers,
+        "replicas_por_segundo": num_simulaciones / segundos,
+        "aviones_por_segundo": aviones / segundos,
+    }
+
+
+# corre una simulacion con perfilar=True y devuelve el tiempo por fase de procesar_paso_temporal
+def medir_perfil(semilla: int = 0, **config) -> dict:
+    sim = Simulacion(**config, semilla=semilla, perfilar=True)
+    _cronometrar(sim.ejecutar_simulacion_completa)
+    return sim.obtener_perfil()
+
+
+# ajusta costo = a * n^b por minimos cuadrados en escala log-log y devuelve el exponente b
+def ajustar_exponente(n_aviones, segundos) -> float:
+    n_aviones = np.asarray(n_aviones, dtype=float)
+    segundos = np.asarray(segundos, dtype=float)
+    validos = (n_aviones > 0) & (segundos > 0)
+    if np.count_nonzero(validos) < 2:
+        return float("nan")
+    b, _ = np.polyfit(np.log(n_aviones[validos]), np.log(segundos[validos]), 1)
+    return float(b)
+
+
+# cronometra cada paso temporal y agrupa por cantidad de aviones activos al inicio del paso;
+# devuelve la mediana del costo por paso para cada cantidad y el exponente de escalado ajustado
+def medir_escalado(lambdas=LAMBDAS, dias_simulacion: int = 1, motor: str = "objetos", semilla: int = 0,
+                   minimo_muestras: int = 20) -> dict:
+    muestras = {}
+    for lambda_param in lambdas:
+        sim = Simulacion(lambda_param=lambda_param, dias_simulacion=dias_simulacion, motor=motor, semilla=semilla)
+        tiempo_total = dias_simulacion * 1440
+        reloj = time.perf_counter
+        with contextlib.redirect_stdout(io.StringIO()):
+            while sim.tiempo_actual < tiempo_total:
+                n = sim.cantidad_aviones_activos()
+                inicio = reloj()
+                sim.procesar_paso_temporal()
+                muestras.setdefault(n, []).append(reloj() - inicio)
+
+    n_aviones = sorted(n for n, tiempos in muestras.items() if n > 0 and len(tiempos) >= minimo_muestras)
+    segundos_por_paso = [float(np.median(muestras[n])) for n in n_aviones]
+    return {
+        "motor": motor,
+        "n_aviones": n_aviones,
+        "segundos_por_paso": segundos_por_paso,
+        "exponente": ajustar_exponente(n_aviones, segundos_por_paso),
+    }
+
+
+# cociente de velocidad vectorizado / objetos (pasos por segundo) para cada escenario medido con ambos motores:
+# mayor a 1 significa que el motor vectorizado es mas rapido
+def comparar_motores(corridas: List[dict]) -> List[dict]:
+    por_motor = {}
+    for corrida in corridas:
+        por_motor.setdefault(corrida["motor"], {})[_clave_corrida(corrida)[1:]] = corrida
+    objetos, vectorizado = por_motor.get("objetos", {}), por_motor.get("vectorizado", {})
+    comparacion = []
+    for clave in objetos:
+        if clave in vectorizado:
+            aceleracion = vectorizado[clave]["pasos_por_segundo"] / objetos[clave]["pasos_por_segundo"]
+            comparacion.append(dict(zip(("variante", "dias_simulacion", "lambda_param"), clave), aceleracion=aceleracion))
+    return comparacion
+
+
+# corre la suite completa (o la rapida) y devuelve un dict serializable a json
+def ejecutar_suite(rapida: bool = False, motores=("objetos", "vectorizado"), semilla: int = 0) -> dict:
+    lambdas = LAMBDAS_RAPIDA if rapida else LAMBDAS
+    horizontes = (1,) if rapida else (1, 3)
+    repeticiones = 3
+
+    corridas = []
+    for motor in motores:
+        for nombre, variante in VARIANTES.items():
+            for dias in horizontes:
+                for lambda_param in lambdas:
+                    medicion = medir_corrida(semilla=semilla, repeticiones=repeticiones, lambda_param=lambda_param,
+                                             dias_simulacion=dias, motor=motor, **variante)
+                    corridas.append({"motor": motor, "variante": nombre, "dias_simulacion": dias,
+                                     "lambda_param": lambda_param, **medicion})
+                    print(f"{motor:>11} {nombre:>9} dias={dias} lambda={lambda_param:<5} "
+                          f"{medicion['pasos_por_segundo']:10.0f} pasos/s {medicion['aviones_por_segundo']:9.0f} aviones/s")
+
+    comparacion = comparar_motores(corridas)
+    if comparacion:
+        aceleraciones = [fila["aceleracion"] for fila in comparacion]
+        print(f"vectorizado / objetos: entre {min(aceleraciones):.2f}x y {max(aceleraciones):.2f}x")
+
+    multiples = []
+    for num_workers in ((1,) if rapida else (1, None)):
+        medicion = medir_multiples(num_simulaciones=2 if rapida else 8, num_workers=num_workers, semilla=semilla,
+                                   lambda_param=0.1, dias_simulacion=1)
+        multiples.append({"lambda_param": 0.1, "dias_simulacion": 1, **medicion})
+        print(f"multiples workers={num_workers}: {medicion['replicas_por_segundo']:.1f} replicas/s")
+    medicion = medir_multiples(num_simulaciones=16 if rapida else 200, semilla=semilla, lambda_param=0.1,
+                               dias_simulacion=1, motor="replicas")
+    multiples.append({"lambda_param": 0.1, "dias_simulacion": 1, "motor": "replicas", **medicion})
+    print(f"multiples motor=replicas: {medicion['replicas_por_segundo']:.1f} replicas/s "
+          f"({medicion['replicas_por_segundo'] / multiples[0]['replicas_por_segundo']:.1f}x las replicas de a una)")
+
+    escalado = [medir_escalado(lambdas=lambdas, motor=motor, semilla=semilla) for motor in motores]
+    for e in escalado:
+        print(f"escalado {e['motor']}: costo por paso ~ n^{e['exponente']:.2f}")
+
+    perfiles = {motor: medir_perfil(semilla=semilla, lambda_param=max(lambdas), dias_simulacion=1, motor=motor,
+                                    enable_metering=True, viento_activo=True) for motor in motores}
+    for motor, perfil in perfiles.items():
+        fases = sorted(perfil["fases"].items(), key=lambda item: -item[1]["segundos"])
+        print(f"perfil {motor}: " + ", ".join(f"{fase} {datos['fraccion']:.0%}" for fase, datos in fases[:3]))
+
+    return {
+        "meta": {
+            "commit": _commit_actual(),
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "rapida": rapida,
+            "unidades": UNIDADES,
+        },
+        "corridas": corridas,
+        "comparacion_motores": comparacion,
+        "multiples": multiples,
+        "escalado": escalado,
+        "perfiles": perfiles,
+    }
+
+
+# guarda el resultado de la suite como baseline json
+def guardar_baseline(resultado: dict, ruta: str) -> None:
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta, "w") as f:
+        json.dump(resultado, f, indent=2)
+
+
+# carga una baseline json
+def cargar_baseline(ruta: str) -> dict:
+    with open(ruta) as f:
+        return json.load(f)
+
+
+# clave que identifica una corrida entre dos resultados
+def _clave_corrida(corrida: dict) -> tuple:
+    return (corrida["motor"], corrida["variante"], corrida["dias_simulacion"], corrida["lambda_param"])
+
+
+# compara contra una baseline: devuelve las corridas cuyo rendimiento cayo mas que la tolerancia relativa
+def comparar_con_baseline(resultado: dict, baseline: dict, tolerancia: float = 0.2) -> List[dict]:
+    anteriores = {_clave_corrida(corrida): corrida for corrida in baseline["corridas"]}
+    regresiones = []
+    for corrida in resultado["corridas"]:
+        anterior = anteriores.get(_clave_corrida(corrida))
+        if anterior is None:
+            continue
+        for metrica in METRICAS_RENDIMIENTO:
+            if metrica not in anterior: # baseline con otra metrica (ej. minutos_por_segundo, que contaba minutos salteados)
+                continue
+            if anterior[metrica] > 0 and corrida[metrica] < anterior[metrica] * (1 - tolerancia):
+                regresiones.append({
+                    "corrida": dict(zip(("motor", "variante", "dias_simulacion", "lambda_param"), _clave_corrida(corrida))),
+                    "metrica": metrica,
+                    "antes": anterior[metrica],
+                    "ahora": corrida[metrica],
+                    "cambio_relativo": corrida[metrica] / anterior[metrica] - 1,
+                })
+    return regresiones
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="benchmarks de rendimiento del simulador")
+    parser.add_argument("--rapida", action="store_true", help="matriz reducida (para chequeos rapidos)")
+    parser.add_argument("--guardar", metavar="RUTA", help="guardar el resultado como baseline json")
+    parser.add_argument("--comparar", metavar="RUTA", help="comparar contra una baseline json")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="caida relativa tolerada antes de marcar regresion")
+    parser.add_argument("--motor", choices=("objetos", "vectorizado"), action="append",
+                        help="motor a medir (se puede repetir; por defecto ambos)")
+    args = parser.parse_args()
+
+    resultado = ejecutar_suite(rapida=args.rapida, motores=tuple(args.motor or ("objetos", "vectorizado")))
+
+    if args.guardar:
+        guardar_baseline(resultado, args.guardar)
+        print(f"baseline guardada en {args.guardar}")
+
+    if args.comparar:
+        regresiones = comparar_con_baseline(resultado, cargar_baseline(args.comparar), args.tolerancia)
+        if regresiones:
+            print(f"{len(regresiones)} regresiones respecto de {args.comparar}:")
+            for r in regresiones:
+                print(f"- {r['corrida']} {r['metrica']}: {r['antes']:.0f} -> {r['ahora']:.0f} "
+                      f"({r['cambio_relativo']:+.0%})")
+            return 1
+        print(f"sin regresiones respecto de {args.comparar}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
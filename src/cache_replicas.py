@@ -0,0 +1,91 @@
+"""
+cache en disco de las estadisticas de cada replica, direccionado por contenido
+la clave de un escenario es el hash de su configuracion completa mas la semilla maestra; como la replica i
+siempre usa la semilla derivada (semilla, i), las replicas guardadas de un escenario son exactamente las
+primeras de cualquier corrida con esa configuracion y esa semilla, y pedir mas solo calcula las que faltan
+
+formato en disco:
+    <raiz>/<clave>/escenario.json    configuracion, semilla, columnas y version (para inspeccionar a mano)
+    <raiz>/<clave>/replicas.bin      una fila binaria de tamaño fijo por replica (DTYPE), en orden; se abre con memmap
+                                     y se agregan filas al final. una fila incompleta al final (corte a mitad de
+                                     una escritura) se ignora
+
+uso: ejecutar_multiples_simulaciones(..., semilla=1, cache="cache/")
+"""
+
+import hashlib
+import json
+import os
+from typing import List
+
+import numpy as np
+
+# version de la logica de simulacion: subirla invalida todo lo guardado (cambia la clave de cada escenario)
+# 2: flujos separados de aproximacion y desvio (los desviados no son lideres ni extremos de un gap)
+VERSION = 2
+
+# columnas de cada replica (mismas claves que sim_core.CLAVES_REPLICA)
+DTYPE = np.dtype([
+    ('total_aviones', np.int64),
+    ('aterrizados', np.int64),
+    ('desviados', np.int64),
+    ('tiempo_promedio_aterrizaje', np.float64),
+    ('desvios_a_montevideo', np.int64),
+    ('desvios_viento', np.int64),
+    ('desvios_tormenta', np.int64),
+    ('desvios_cierre', np.int64),
+    ('reincerciones_exitosas', np.int64),
+])
+
+
+# hash sha256 de la configuracion (claves ordenadas) y la semilla maestra
+def clave_escenario(config: dict, semilla: int) -> str:
+    contenido = json.dumps({"version": VERSION, "semilla": int(semilla), "config": config}, sort_keys=True)
+    return hashlib.sha256(contenido.encode()).hexdigest()
+
+
+# almacen de replicas por escenario bajo el directorio raiz
+class CacheReplicas:
+
+    def __init__(self, raiz: str) -> None:
+        self.raiz = raiz
+
+    def _directorio(self, config: dict, semilla: int) -> str:
+        return os.path.join(self.raiz, clave_escenario(config, semilla))
+
+    # cantidad de replicas completas guardadas del escenario
+    def cantidad(self, config: dict, semilla: int) -> int:
+        ruta = os.path.join(self._directorio(config, semilla), "replicas.bin")
+        if not os.path.exists(ruta):
+            return 0
+        return os.path.getsize(ruta) // DTYPE.itemsize
+
+    # replicas guardadas del escenario como arreglo estructurado (memmap de solo lectura, sin copiar a memoria)
+    def leer(self, config: dict, semilla: int) -> np.ndarray:
+        n = self.cantidad(config, semilla)
+        if n == 0:  # memmap no acepta archivos vacios
+            return np.zeros(0, dtype=DTYPE)
+        return np.memmap(os.path.join(self._directorio(config, semilla), "replicas.bin"), dtype=DTYPE, mode="r", shape=(n,))
+
+    # las primeras n replicas guardadas como dicts (el formato de sim_core._ejecutar_replica)
+    def replicas(self, config: dict, semilla: int, n: int) -> List[dict]:
+        filas = self.leer(config, semilla)[:n]
+        return [{key: fila[key].item() for key in DTYPE.names} for fila in filas]
+
+    # agrega al final las estadisticas de las replicas siguientes a las ya guardadas
+    def agregar(self, config: dict, semilla: int, estadisticas_replicas: List[dict]) -> None:
+        directorio = self._directorio(config, semilla)
+        os.makedirs(directorio, exist_ok=True)
+        descripcion = os.path.join(directorio, "escenario.json")
+        if not os.path.exists(descripcion):
+            with open(descripcion, "w") as f:
+                json.dump({"version": VERSION, "semilla": int(semilla), "config": config,
+                           "columnas": {key: DTYPE[key].name for key in DTYPE.names}}, f, indent=2)
+
+        filas = np.array([tuple(stats[key] for key in DTYPE.names) for stats in estadisticas_replicas], dtype=DTYPE)
+        ruta = os.path.join(directorio, "replicas.bin")
+        completas = self.cantidad(config, semilla) * DTYPE.itemsize
+        if os.path.exists(ruta) and os.path.getsize(ruta) != completas:  # descartar una fila a medio escribir
+            os.truncate(ruta, completas)
+        with open(ruta, "ab") as f:
+            filas.tofile(f)
@@ -0,0 +1,273 @@
+import io
+import json
+import math
+import os
+from typing import List, Optional
+
+import numpy as np
+
+import const as c
+from estadisticas_online import AcumuladorOnline
+from motor_vectorizado import MotorVectorizado
+from plane import Plane
+from sim_core import Simulacion, crear_flujos
+
+# formato de las instantaneas: un .npz (arreglos numpy, sin pickle) con los aviones en columnas
+# y un json con el resto del estado escalar
+FORMATO = 1
+
+# atributos escalares de Simulacion que se guardan tal cual
+CAMPOS_ESCALARES = (
+    "lambda_param", "dias_simulacion", "tiempo_actual", "dia_actual",
+    "viento_activo", "p_goaround", "storm_activa", "storm_prob", "storm_duracion_min", "storm_inicio_min",
+    "enable_metering", "_last_sta_meter", "motor", "saltar_periodos_inactivos", "reciclar_aviones",
+    "modo_streaming", "perfilar",
+)
+
+# atributos que no se pueden cambiar al bifurcar (cambian la forma del estado guardado)
+CAMPOS_FIJOS = ("motor", "modo_streaming", "reciclar_aviones")
+
+# buffers de numeros pre-sorteados de la simulacion
+_BUFFERS = ("_velocidades_iniciales", "_velocidades", "_goarounds")
+
+# columnas de un Plane en la instantanea (los None se guardan como nan o -1)
+_COLUMNAS_PLANE = ("id", "t_spawn", "x", "v", "codigo_estado", "tiempo_estimado", "minutos_bloqueo",
+                   "t_landing", "sta_meter", "metering", "motivo_desvio")
+
+
+# escalares numpy -> tipos de python para json
+def _a_json(valor):
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"no se puede serializar {type(valor).__name__}")
+
+
+# None -> nan para columnas float
+def _o_nan(valor) -> float:
+    return math.nan if valor is None else valor
+
+
+# nan -> None al reconstruir
+def _o_none(valor: float, tipo=float):
+    return None if math.isnan(valor) else tipo(valor)
+
+
+# columnas numpy de una lista de aviones
+def _columnas_aviones(aviones: List[Plane]) -> dict:
+    return {
+        "id": np.array([a.id for a in aviones], dtype=np.int64),
+        "t_spawn": np.array([a.t_spawn for a in aviones], dtype=np.int64),
+        "x": np.array([a.x for a in aviones], dtype=float),
+        "v": np.array([a.v for a in aviones], dtype=float),
+        "codigo_estado": np.array([a.codigo_estado for a in aviones], dtype=np.int8),
+        "tiempo_estimado": np.array([_o_nan(a.tiempo_estimado) for a in aviones], dtype=float),
+        "minutos_bloqueo": np.array([a.minutos_bloqueo for a in aviones], dtype=np.int64),
+        "t_landing": np.array([_o_nan(a.t_landing) for a in aviones], dtype=float),
+        "sta_meter": np.array([_o_nan(a.sta_meter) for a in aviones], dtype=float),
+        "metering": np.array([a.metering for a in aviones], dtype=bool),
+        "motivo_desvio": np.array([-1 if a.motivo_desvio is None else c.MOTIVOS_DESVIO.index(a.motivo_desvio)
+                                   for a in aviones], dtype=np.int8),
+    }
+
+
+# reconstruye los aviones a partir de sus columnas
+def _aviones_desde_columnas(columnas: dict, aleatorio=None) -> List[Plane]:
+    aviones = []
+    for i in range(len(columnas["id"])):
+        avion = Plane(id=int(columnas["id"][i]), t_spawn=int(columnas["t_spawn"][i]),
+                      x=float(columnas["x"][i]), v=float(columnas["v"][i]),
+                      tiempo_estimado=_o_none(columnas["tiempo_estimado"][i]),
+                      minutos_bloqueo=int(columnas["minutos_bloqueo"][i]),
+                      t_landing=_o_none(columnas["t_landing"][i], int),
+                      sta_meter=_o_none(columnas["sta_meter"][i]),
+                      metering=bool(columnas["metering"][i]))
+        avion.codigo_estado = int(columnas["codigo_estado"][i])
+        motivo = int(columnas["motivo_desvio"][i])
+        avion.motivo_desvio = None if motivo < 0 else c.MOTIVOS_DESVIO[motivo]
+        avion.aleatorio = aleatorio
+        aviones.append(avion)
+    return aviones
+
+
+# estado de un acumulador online: escalares para el json, histograma como arreglo
+def _estado_acumulador(acum: AcumuladorOnline) -> tuple:
+    escalares = {"n": acum.n, "media": acum.media, "m2": acum._m2, "minimo": acum.minimo, "maximo": acum.maximo}
+    return escalares, acum.bordes, acum.histograma
+
+
+def _restaurar_acumulador(escalares: dict, bordes: np.ndarray, histograma: np.ndarray) -> AcumuladorOnline:
+    acum = AcumuladorOnline(minimo_hist=float(bordes[0]), maximo_hist=float(bordes[-1]), num_bins=len(histograma))
+    acum.n = escalares["n"]
+    acum.media = escalares["media"]
+    acum._m2 = escalares["m2"]
+    acum.minimo = escalares["minimo"]
+    acum.maximo = escalares["maximo"]
+    acum.bordes = bordes.copy()
+    acum.histograma = histograma.copy()
+    return acum
+
+
+# instantanea binaria del estado completo de la simulacion: aviones, estadisticas, tormenta programada,
+# _last_sta_meter, estado del generador y de los buffers de numeros pre-sorteados.
+# el perfil (perfilar=True) no se guarda: arranca de cero al restaurar
+def crear_instantanea(sim: Simulacion, comprimir: bool = True) -> bytes:
+    meta = {campo: getattr(sim, campo) for campo in CAMPOS_ESCALARES}
+    meta["formato"] = FORMATO
+    meta["semilla"] = sim.semilla if isinstance(sim.semilla, (int, np.integer)) else None
+    meta["estadisticas"] = sim.estadisticas
+    meta["flujos"] = {nombre: rng.bit_generator.state for nombre, rng in sim.flujos.items()}
+    meta["llegadas_clave"] = sim._llegadas_clave
+    meta["tamano_bloque"] = sim._velocidades.tamano_bloque
+
+    arreglos = {
+        "llegadas_dia": sim._llegadas_dia if sim._llegadas_dia is not None else np.zeros(0, dtype=np.int64),
+        "registros_aterrizaje": np.array(sim._registros_aterrizaje, dtype=np.int64).reshape(-1, 3),
+    }
+    for nombre in _BUFFERS: # solo la parte del bloque que todavia no se uso
+        buffer = getattr(sim, nombre)
+        arreglos[f"buffer/{nombre}"] = np.array(buffer._bloque[buffer._i:], dtype=float)
+    for nombre, aviones in (("cola", sim.aviones_en_sistema()), ("aterrizados", sim.aviones_aterrizados),
+                            ("desviados", sim.aviones_desviados)):
+        for columna, valores in _columnas_aviones(aviones).items():
+            arreglos[f"{nombre}/{columna}"] = valores
+
+    if sim._motor is not None:
+        motor = sim._motor
+        for columna in MotorVectorizado._COLUMNAS:
+            arreglos[f"motor/{columna}"] = getattr(motor, columna)[:motor.n]
+
+    if sim.modo_streaming:
+        acumuladores = {"aterrizaje": sim._acum_aterrizaje,
+                        **{f"desvio_{motivo}": acum for motivo, acum in sim._acum_desvios.items()}}
+        meta["acumuladores"] = {}
+        for nombre, acum in acumuladores.items():
+            escalares, bordes, histograma = _estado_acumulador(acum)
+            meta["acumuladores"][nombre] = escalares
+            arreglos[f"acum/{nombre}/bordes"] = bordes
+            arreglos[f"acum/{nombre}/histograma"] = histograma
+
+    arreglos["meta"] = np.frombuffer(json.dumps(meta, default=_a_json).encode("utf-8"), dtype=np.uint8)
+
+    salida = io.BytesIO()
+    (np.savez_compressed if comprimir else np.savez)(salida, **arreglos)
+    return salida.getvalue()
+
+
+# reconstruye una simulacion a partir de una instantanea; cambios sobreescribe parametros (ej. enable_metering=True).
+# semilla=... en cambios reemplaza el generador por uno nuevo (continuacion independiente); si no, se sigue
+# con el mismo estado aleatorio (util para comparar variantes con los mismos numeros)
+def restaurar_instantanea(datos: bytes, **cambios) -> Simulacion:
+    with np.load(io.BytesIO(datos), allow_pickle=False) as npz:
+        arreglos = {nombre: npz[nombre] for nombre in npz.files}
+    meta = json.loads(arreglos.pop("meta").tobytes().decode("utf-8"))
+    if meta["formato"] != FORMATO:
+        raise ValueError(f"formato de instantanea no soportado: {meta['formato']}")
+
+    for campo in cambios:
+        if campo in CAMPOS_FIJOS:
+            raise ValueError(f"no se puede cambiar {campo} al restaurar una instantanea")
+        if campo not in CAMPOS_ESCALARES and campo != "semilla":
+            raise ValueError(f"parametro desconocido: {campo!r}")
+
+    flujos = {}
+    for nombre, estado in meta["flujos"].items():
+        flujos[nombre] = np.random.Generator(getattr(np.random, estado["bit_generator"])())
+
+    sim = Simulacion(lambda_param=meta["lambda_param"], dias_simulacion=meta["dias_simulacion"], motor=meta["motor"],
+                     modo_streaming=meta["modo_streaming"], reciclar_aviones=meta["reciclar_aviones"],
+                     perfilar=meta["perfilar"], semilla=meta["semilla"], flujos=flujos)
+    # __post_init__ programa la tormenta del dia con los generadores: se pisa todo con el estado guardado
+    for nombre, estado in meta["flujos"].items():
+        flujos[nombre].bit_generator.state = estado
+    for campo in CAMPOS_ESCALARES:
+        setattr(sim, campo, meta[campo])
+    sim.estadisticas = meta["estadisticas"]
+    sim._llegadas_clave = tuple(meta["llegadas_clave"]) if meta["llegadas_clave"] is not None else None
+    sim._llegadas_dia = arreglos["llegadas_dia"] if sim._llegadas_clave is not None else None
+    for nombre in _BUFFERS:
+        buffer = getattr(sim, nombre)
+        buffer.tamano_bloque = meta["tamano_bloque"]
+        buffer._bloque = arreglos[f"buffer/{nombre}"].tolist()
+        buffer._i = 0
+    sim._registros_aterrizaje = [tuple(int(v) for v in fila) for fila in arreglos["registros_aterrizaje"]]
+
+    def columnas(prefijo: str) -> dict:
+        return {col: arreglos[f"{prefijo}/{col}"] for col in _COLUMNAS_PLANE}
+
+    sim._repartir_aviones(_aviones_desde_columnas(columnas("cola"), aleatorio=sim._velocidades)) # aproximacion y desvio
+    sim.aviones_aterrizados = _aviones_desde_columnas(columnas("aterrizados"))
+    sim.aviones_desviados = _aviones_desde_columnas(columnas("desviados"))
+
+    if sim._motor is not None:
+        n = len(arreglos["motor/id"])
+        motor = sim._crear_motor(capacidad=max(64, n))
+        for columna in MotorVectorizado._COLUMNAS:
+            getattr(motor, columna)[:n] = arreglos[f"motor/{columna}"]
+        motor.n = n
+        sim._motor = motor
+
+    if sim.modo_streaming:
+        acumuladores = {nombre: _restaurar_acumulador(escalares, arreglos[f"acum/{nombre}/bordes"],
+                                                      arreglos[f"acum/{nombre}/histograma"])
+                        for nombre, escalares in meta["acumuladores"].items()}
+        sim._acum_aterrizaje = acumuladores["aterrizaje"]
+        sim._acum_desvios = {motivo: acumuladores[f"desvio_{motivo}"] for motivo in c.MOTIVOS_DESVIO}
+
+    if "semilla" in cambios: # continuacion independiente: generadores y buffers nuevos, llegadas del dia re-sorteadas
+        _reemplazar_flujos(sim, cambios.pop("semilla"))
+    for campo, valor in cambios.items():
+        setattr(sim, campo, valor)
+    return sim
+
+
+# reemplaza los generadores de la simulacion por los de otra semilla (y descarta todo lo pre-sorteado)
+def _reemplazar_flujos(sim: Simulacion, semilla) -> None:
+    import utilidades as u
+    sim.semilla = semilla
+    sim.flujos = crear_flujos(semilla)
+    sim._velocidades_iniciales = u.BufferAleatorio(sim.flujos["velocidades_iniciales"], sim._velocidades.tamano_bloque)
+    sim._velocidades = u.BufferAleatorio(sim.flujos["velocidades"], sim._velocidades.tamano_bloque)
+    sim._goarounds = u.BufferAleatorio(sim.flujos["goarounds"], sim._goarounds.tamano_bloque)
+    sim._llegadas_clave = None
+    for avion in sim.aviones_en_sistema():
+        avion.aleatorio = sim._velocidades
+    if sim._motor is not None:
+        sim._motor.rng = sim.flujos["velocidades"]
+        sim._motor.rng_goarounds = sim.flujos["goarounds"]
+
+
+# guarda una instantanea en disco (escritura atomica: un corte a mitad no deja un checkpoint roto)
+def guardar_checkpoint(sim: Simulacion, ruta: str) -> None:
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "wb") as f:
+        f.write(crear_instantanea(sim))
+    os.replace(temporal, ruta)
+
+
+# carga un checkpoint de disco; para reanudar: cargar_checkpoint(ruta).ejecutar_simulacion_completa()
+def cargar_checkpoint(ruta: str, **cambios) -> Simulacion:
+    with open(ruta, "rb") as f:
+        return restaurar_instantanea(f.read(), **cambios)
+
+
+# semillas hijas para las bifurcaciones de una instantanea: la entropia sale del estado de todos sus generadores, asi
+# que dependen de la semilla original y de cuanto avanzo la simulacion, y la hija i es la misma en cada llamada
+def _semillas_hijas(sim: Simulacion, cantidad: int) -> List[np.random.SeedSequence]:
+    import hashlib
+    estados = json.dumps({nombre: rng.bit_generator.state for nombre, rng in sim.flujos.items()},
+                         sort_keys=True, default=_a_json)
+    entropia = int.from_bytes(hashlib.sha256(estados.encode("utf-8")).digest(), "big")
+    return np.random.SeedSequence(entropia).spawn(cantidad)
+
+
+# bifurca la simulacion en una continuacion por cada dict de cambios, sin recalcular el prefijo comun.
+# ej: bifurcar(sim, [{"enable_metering": False}, {"enable_metering": True}])
+# cada bifurcacion sigue con su propia semilla hija (continuaciones independientes), salvo que sus cambios traigan
+# semilla. con numeros_comunes=True todas siguen con el mismo estado aleatorio de sim (comparacion pareada)
+def bifurcar(sim: Simulacion, variantes: Optional[List[dict]] = None, numeros_comunes: bool = False) -> List[Simulacion]:
+    variantes = variantes or [{}]
+    datos = crear_instantanea(sim, comprimir=False)
+    if numeros_comunes:
+        return [restaurar_instantanea(datos, **cambios) for cambios in variantes]
+    return [restaurar_instantanea(datos, **{"semilla": semilla, **cambios})
+            for cambios, semilla in zip(variantes, _semillas_hijas(sim, len(variantes)))]
@@ -0,0 +1,35 @@
+import bisect
+from typing import Iterable
+
+
+def _distancia(avion) -> float:
+    return avion.x
+
+
+# lista de aviones que se mantiene ordenada por distancia al aeropuerto (mas cerca primero).
+# sigue siendo una list, asi el avion de adelante/atras de self[i] es self[i-1]/self[i+1] en O(1).
+# en cada paso la simulacion no la reordena: saca los pocos aviones que se pasaron y los vuelve a agregar. la
+# posicion se busca en O(log n); el list.insert corre el resto de la lista (un memmove en C, sin trabajo en python)
+class ColaAviones(list):
+
+    # agrega un avion: O(1) si queda ultimo (los spawns en las 100 mn), si no lo ubica por busqueda binaria
+    def agregar(self, avion) -> None:
+        if not self or self[-1].x <= avion.x:
+            self.append(avion)
+        else:
+            self.insert(bisect.bisect_right(self, avion.x, key=_distancia), avion)
+
+    # restaura el orden de una cola desordenada de cualquier forma (sort in-place, estable)
+    def reordenar(self) -> None:
+        self.sort(key=_distancia)
+
+    # aviones inmediatamente adelante (x menor) y atras (x mayor o igual) de la posicion x, None si no hay
+    def vecinos(self, x: float) -> tuple:
+        i = bisect.bisect_left(self, x, key=_distancia)
+        return (self[i - 1] if i > 0 else None), (self[i] if i < len(self) else None)
+
+    # remueve de una sola pasada todos los aviones indicados, manteniendo el orden del resto
+    def remover(self, aviones: Iterable) -> None:
+        a_remover = {id(avion) for avion in aviones}
+        if a_remover:
+            self[:] = [avion for avion in self if id(avion) not in a_remover]
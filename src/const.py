@@ -14,4 +14,38 @@ METERING_ENABLE = True                 # activar/desactivar
 METER_POINT_MN = 15                    # punto de control (5 o 15 mn)
 METER_TARGET_SPACING_MIN = 5           # separación deseada entre STAs
 METER_DEADBAND_SEC = 30                # +/- 30s sin corregir
-METER_SPEED_STEP = 10                  # ajuste de velocidad por minuto (kt)
\ No newline at end of file
+METER_SPEED_STEP = 10                  # ajuste de velocidad por minuto (kt)
+
+# tablas compiladas una sola vez a partir de rangos, ordenadas de menor a mayor distancia para buscar con bisect
+BORDES_RANGOS = tuple(dmin for dmin, _, _ in reversed(rangos))            # (0, 5, 15, 50, 100)
+TOPES_RANGOS = tuple(dmax for _, dmax, _ in reversed(rangos))             # (5, 15, 50, 100, inf)
+RANGOS_VELOCIDAD = tuple(vel for _, _, vel in reversed(rangos))           # (vmin, vmax) de cada rango
+VMIN_RANGOS = tuple(vmin for vmin, _ in RANGOS_VELOCIDAD)
+VMAX_RANGOS = tuple(vmax for _, vmax in RANGOS_VELOCIDAD)
+
+# minutos acumulados desde el borde inferior de cada rango hasta el umbral (0 mn) volando a vmax
+MINUTOS_VMAX_DESDE_BORDE = [0.0]
+for _i in range(1, len(BORDES_RANGOS)):
+    MINUTOS_VMAX_DESDE_BORDE.append(MINUTOS_VMAX_DESDE_BORDE[-1] +
+                                    60 * (BORDES_RANGOS[_i] - BORDES_RANGOS[_i - 1]) / VMAX_RANGOS[_i - 1])
+MINUTOS_VMAX_DESDE_BORDE = tuple(MINUTOS_VMAX_DESDE_BORDE)
+
+# base acumulada de la estimacion de arribo de Plane.time_to_arrive: por cada limite de LISTA_RANGOS
+# se suman los tramos completos anteriores a la vmax del rango que empieza en el limite previo
+ANCHOS_LISTA_RANGOS = tuple(b - a for a, b in zip((0,) + LISTA_RANGOS[:-1], LISTA_RANGOS))
+ETA_BASE_LISTA_RANGOS = [0.0]
+for _anterior, _limite in zip((0,) + LISTA_RANGOS[:-1], LISTA_RANGOS):
+    ETA_BASE_LISTA_RANGOS.append(ETA_BASE_LISTA_RANGOS[-1] + 60 * _limite / VMAX_RANGOS[BORDES_RANGOS.index(_anterior)])
+ETA_BASE_LISTA_RANGOS = tuple(ETA_BASE_LISTA_RANGOS)
+
+# codigos enteros de estado para el motor vectorizado (mismo orden que plane.Status)
+ESTADOS = ("en_fila", "desacelerando", "reinsercion", "desviado", "aterrizaje_confirmado", "intento_aterrizar")
+EN_FILA = 0
+DESACELERANDO = 1
+REINSERCION = 2
+DESVIADO = 3
+ATERRIZAJE_CONFIRMADO = 4
+INTENTO_ATERRIZAR = 5
+
+# motivos de desvio (el ultimo motivo por el que se desvio un avion que termina yendose a montevideo)
+MOTIVOS_DESVIO = ("congestion", "viento", "tormenta", "cierre")
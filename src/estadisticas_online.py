@@ -0,0 +1,67 @@
+from typing import Optional
+import math
+import numpy as np
+
+
+# acumulador online de una variable: cantidad, media y varianza (welford), minimo/maximo e histograma de bins fijos.
+# usa memoria constante sin importar cuantos valores se agreguen
+class AcumuladorOnline:
+
+    def __init__(self, minimo_hist: float = 0.0, maximo_hist: float = 300.0, num_bins: int = 60) -> None:
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0                           # suma de cuadrados de desvios (welford)
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.bordes = np.linspace(minimo_hist, maximo_hist, num_bins + 1)
+        self.histograma = np.zeros(num_bins, dtype=np.int64)   # los valores fuera de rango caen en el primer/ultimo bin
+
+    # agrega un valor
+    def agregar(self, valor: float) -> None:
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (valor - self.media)
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+        self.histograma[self._bin(valor)] += 1
+
+    # agrega varios valores de una vez (combina con la formula de chan para varianzas)
+    def agregar_muchos(self, valores) -> None:
+        valores = np.asarray(valores, dtype=float)
+        k = len(valores)
+        if k == 0:
+            return
+        media_lote = float(valores.mean())
+        m2_lote = float(((valores - media_lote) ** 2).sum())
+        total = self.n + k
+        delta = media_lote - self.media
+        self.media += delta * k / total
+        self._m2 += m2_lote + delta ** 2 * self.n * k / total
+        self.n = total
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+        bins = np.clip(np.searchsorted(self.bordes, valores, side="right") - 1, 0, len(self.histograma) - 1)
+        self.histograma += np.bincount(bins, minlength=len(self.histograma))
+
+    def _bin(self, valor: float) -> int:
+        i = int(np.searchsorted(self.bordes, valor, side="right")) - 1
+        return min(max(i, 0), len(self.histograma) - 1)
+
+    # varianza muestral (None con menos de 2 valores)
+    def varianza(self) -> Optional[float]:
+        if self.n < 2:
+            return None
+        return self._m2 / (self.n - 1)
+
+    # resumen como diccionario
+    def resumen(self) -> dict:
+        return {
+            'cantidad': self.n,
+            'media': self.media if self.n else 0.0,
+            'varianza': self.varianza(),
+            'minimo': self.minimo if self.n else None,
+            'maximo': self.maximo if self.n else None,
+            'bordes_histograma': self.bordes.tolist(),
+            'histograma': self.histograma.tolist()
+        }
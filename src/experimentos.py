@@ -0,0 +1,195 @@
+"""
+corrida de experimentos sin interaccion a partir de archivos de configuracion
+cada experimento se corre con ejecutar_multiples_simulaciones (no se importa matplotlib) y los resultados se
+escriben en json (y opcionalmente un resumen csv con una fila por experimento y estadistica)
+
+formato del archivo (.json siempre; .yaml/.yml si esta instalado PyYAML):
+    {
+      "comun": {"dias_simulacion": 3, "num_simulaciones": 20, "semilla": 1, "num_workers": 4},
+      "experimentos": [
+        {"nombre": "base", "lambda_param": 0.1},
+        {"nombre": "viento", "lambda_param": 0.1, "viento_activo": true, "p_goaround": 0.1}
+      ]
+    }
+"comun" es opcional y cada experimento puede pisar sus valores; un archivo con un unico dict (sin "experimentos")
+es un solo experimento. las claves son los parametros de ejecutar_multiples_simulaciones mas "nombre"
+
+uso:
+    python src/experimentos.py configs/ejemplo.json --salida resultados/ejemplo.json
+    python src/experimentos.py configs/a.yaml configs/b.json --salida resultados.json --csv resumen.csv --workers 4
+    python src/experimentos.py configs/ejemplo.json --cache cache/   (solo calcula las replicas que no esten guardadas)
+"""
+
+import argparse
+import contextlib
+import csv
+import inspect
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sim_core import CLAVES_REPLICA, ejecutar_multiples_simulaciones
+
+# parametros que acepta un experimento (los de ejecutar_multiples_simulaciones)
+PARAMETROS = tuple(inspect.signature(ejecutar_multiples_simulaciones).parameters)
+OBLIGATORIOS = ("lambda_param", "dias_simulacion")
+
+
+# lee un archivo de configuracion json o yaml
+def _leer_archivo(ruta: str):
+    nombre = os.path.basename(ruta)
+    extension = (os.path.splitext(nombre)[1] or (nombre if nombre.startswith(".") else "")).lower()  # ".yaml" solo tambien cuenta
+    with open(ruta) as f:
+        if extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError(f"leer {ruta} requiere PyYAML (pip install pyyaml); se puede usar el mismo contenido en .json")
+            return yaml.safe_load(f)
+        if extension == ".json":
+            return json.load(f)
+    raise ValueError(f"formato de configuracion no soportado: {extension!r} (usar .json, .yaml o .yml)")
+
+
+# valida un experimento y completa el nombre; devuelve el dict listo para ejecutar_experimento
+def _validar_experimento(experimento: dict, origen: str) -> dict:
+    desconocidas = set(experimento) - set(PARAMETROS) - {"nombre"}
+    if desconocidas:
+        raise ValueError(f"{origen}: parametros desconocidos {sorted(desconocidas)} (validos: {', '.join(PARAMETROS)})")
+    faltantes = [clave for clave in OBLIGATORIOS if clave not in experimento]
+    if faltantes:
+        raise ValueError(f"{origen}: faltan parametros obligatorios {faltantes}")
+    return {"nombre": origen, **experimento}
+
+
+# lista de experimentos definidos en un archivo de configuracion
+def cargar_experimentos(ruta: str) -> List[dict]:
+    contenido = _leer_archivo(ruta)
+    base = os.path.splitext(os.path.basename(ruta))[0]
+    if not contenido:
+        raise ValueError(f"{ruta}: la configuracion esta vacia")
+    if not isinstance(contenido, dict):
+        raise ValueError(f"{ruta}: se esperaba un objeto con 'experimentos' o los parametros de un experimento")
+    if "experimentos" not in contenido:
+        return [_validar_experimento(contenido, base)]
+
+    comun = contenido.get("comun") or {}
+    otras = set(contenido) - {"comun", "experimentos"}
+    if otras:
+        raise ValueError(f"{ruta}: claves desconocidas {sorted(otras)} (usar 'comun' y 'experimentos')")
+    return [_validar_experimento({**comun, **experimento}, f"{base}[{i}]")
+            for i, experimento in enumerate(contenido["experimentos"])]
+
+
+# convierte escalares y arreglos de numpy a tipos de json
+def _a_json(valor):
+    if isinstance(valor, dict):
+        return {str(k): _a_json(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_a_json(v) for v in valor]
+    if isinstance(valor, np.ndarray):
+        return _a_json(valor.tolist())
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+# corre un experimento y devuelve un dict serializable: parametros, estadisticas y tiempo de pared
+def ejecutar_experimento(experimento: dict, silencioso: bool = True) -> dict:
+    parametros = {k: v for k, v in experimento.items() if k != "nombre"}
+    salida = contextlib.redirect_stdout(io.StringIO()) if silencioso else contextlib.nullcontext()
+    with salida:
+        inicio = time.perf_counter()
+        estadisticas = ejecutar_multiples_simulaciones(**parametros)
+        segundos = time.perf_counter() - inicio
+    return {
+        "nombre": experimento["nombre"],
+        "parametros": parametros,
+        "segundos": segundos,
+        "estadisticas": _a_json(estadisticas),
+    }
+
+
+# corre todos los experimentos de los archivos dados; cambios (ej. {"num_workers": 4}) pisa a todos
+def ejecutar_configs(rutas: List[str], cambios: Optional[dict] = None, silencioso: bool = True) -> dict:
+    experimentos = [{**experimento, **(cambios or {})} for ruta in rutas for experimento in cargar_experimentos(ruta)]
+    resultados = []
+    for i, experimento in enumerate(experimentos):
+        print(f"experimento {i+1}/{len(experimentos)}: {experimento['nombre']}", file=sys.stderr)
+        resultados.append(ejecutar_experimento(experimento, silencioso=silencioso))
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "configs": list(rutas),
+        "experimentos": resultados,
+    }
+
+
+# escribe los resultados completos en json
+def guardar_resultados(resultado: dict, ruta: str) -> None:
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta, "w") as f:
+        json.dump(resultado, f, indent=2)
+
+
+# escribe un resumen csv: una fila por experimento y estadistica con promedio y error estandar
+def guardar_resumen_csv(resultado: dict, ruta: str) -> None:
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta, "w", newline="") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["nombre", "estadistica", "promedio", "error_estandar", "replicas"])
+        for experimento in resultado["experimentos"]:
+            for clave in CLAVES_REPLICA:
+                valores = experimento["estadisticas"][clave]
+                escritor.writerow([experimento["nombre"], clave, valores["promedio"], valores["error_estandar"],
+                                   len(valores["valores"])])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="corre experimentos definidos en archivos de configuracion (json o yaml)")
+    parser.add_argument("configs", nargs="+", help="archivos de configuracion")
+    parser.add_argument("--salida", metavar="RUTA", help="archivo json de resultados (por defecto a stdout)")
+    parser.add_argument("--csv", metavar="RUTA", help="ademas, un resumen csv por experimento y estadistica")
+    parser.add_argument("--workers", type=int, default=None, help="pisa num_workers de todos los experimentos (0 = todos los nucleos)")
+    parser.add_argument("--semilla", type=int, default=None, help="pisa la semilla de todos los experimentos")
+    parser.add_argument("--cache", metavar="DIRECTORIO", help="reusar y guardar las replicas en este cache (requiere semilla)")
+    parser.add_argument("--verboso", action="store_true", help="mostrar el progreso de cada simulacion")
+    args = parser.parse_args()
+
+    cambios = {}
+    if args.workers is not None:
+        cambios["num_workers"] = args.workers or None
+    if args.semilla is not None:
+        cambios["semilla"] = args.semilla
+    if args.cache is not None:
+        cambios["cache"] = args.cache
+    try:
+        resultado = ejecutar_configs(args.configs, cambios, silencioso=not args.verboso)
+    except (ValueError, RuntimeError, OSError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+
+    if args.salida:
+        guardar_resultados(resultado, args.salida)
+        print(f"{len(resultado['experimentos'])} experimentos guardados en {args.salida}", file=sys.stderr)
+    else:
+        json.dump(resultado, sys.stdout, indent=2)
+        print()
+    if args.csv:
+        guardar_resumen_csv(resultado, args.csv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+exportacion sin ventana de una simulacion (o de una grabacion de trayectorias) a imagenes o video
+usa el backend Agg y el mismo diseño que viz.py (setup_plot y dibujar_aviones). los cuadros se reparten
+en rangos contiguos entre un pool de procesos; cada proceso abre la grabacion con memmap y escribe sus
+cuadros numerados, asi el orden final sale del nombre del archivo
+
+salidas:
+    un directorio          secuencia cuadro_000000.png, cuadro_000001.png, ...
+    archivo .gif           se escribe cuadro a cuadro con Pillow (viene con matplotlib)
+    archivo .mp4 / .webm   se codifica con ffmpeg (tiene que estar instalado)
+
+uso:
+    python src/exportar_video.py --lambda 0.2 --dias 3 --salida corrida.mp4 --pasos-por-cuadro 5 --workers 4
+    python src/exportar_video.py --grabacion grabaciones/corrida --salida cuadros/ --desde 1800 --hasta 2400
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import List, Optional
+
+import matplotlib
+matplotlib.use("Agg")  # antes de importar viz (que importa pyplot): nunca se abre una ventana
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from trayectorias import LectorTrayectorias, grabar_simulacion
+from viz import visualizador_replay
+
+FORMATOS_FFMPEG = (".mp4", ".webm", ".mkv", ".avi")
+
+
+# visualizador de replay sin controles: solo dibuja pasos de la grabacion en una figura Agg.
+# la animacion vertical es instantanea, asi cada cuadro depende solo de su paso y no de los cuadros anteriores
+# (un rango se puede dibujar en cualquier proceso y da lo mismo que dibujar todo en orden)
+class visualizador_exportacion(visualizador_replay):
+
+    def __init__(self, ruta: str) -> None:
+        super().__init__(ruta)
+        self.velocidad_animacion_vertical = 1.0
+
+    def setup_controls(self) -> None:
+        # sin sliders ni botones
+        self.fig.subplots_adjust(bottom=0.08)
+
+    def dibujar_paso(self, i: int) -> None:
+        # deja la figura lista con el paso i
+        self.ir_a_paso(i, interpolar=False)
+        self._redibujar()
+
+
+# indices de los pasos a dibujar (uno por cuadro) entre los minutos desde/hasta, tomando uno cada pasos_por_cuadro
+def pasos_a_exportar(lector: LectorTrayectorias, pasos_por_cuadro: int = 1,
+                     desde_minuto: Optional[int] = None, hasta_minuto: Optional[int] = None) -> np.ndarray:
+    primero = 0 if desde_minuto is None else lector.indice_minuto(max(desde_minuto, int(lector.minutos[0])))
+    ultimo = len(lector) - 1 if hasta_minuto is None else lector.indice_minuto(hasta_minuto)
+    return np.arange(primero, ultimo + 1, max(1, pasos_por_cuadro))
+
+
+# dibuja los cuadros [inicio, fin) de la lista de pasos y los guarda como png numerados en directorio
+def _renderizar_rango(ruta: str, pasos: List[int], inicio: int, fin: int, directorio: str, dpi: int) -> int:
+    visualizador = visualizador_exportacion(ruta)
+    for k in range(inicio, fin):
+        visualizador.dibujar_paso(pasos[k])
+        visualizador.fig.savefig(os.path.join(directorio, f"cuadro_{k:06d}.png"), dpi=dpi)
+    plt.close(visualizador.fig)
+    return fin - inicio
+
+
+# escribe el gif de a un cuadro: cada png se abre, se codifica como gif de un cuadro con Pillow y se cierra, y sus
+# bloques se copian a la salida. asi hay un solo archivo abierto y la memoria no crece con la cantidad de cuadros
+# (Pillow con append_images guarda todos los cuadros hasta el final). la paleta global de cada cuadro pasa a ser
+# su paleta local; el primero deja el encabezado, su paleta como global y el loop infinito
+def _escribir_gif(rutas: List[str], salida: str, duracion_ms: int) -> None:
+    import io
+    from PIL import Image
+    with open(salida, "wb") as gif:
+        for k, ruta in enumerate(rutas):
+            buffer = io.BytesIO()
+            with Image.open(ruta) as cuadro:
+                cuadro.save(buffer, format="GIF", duration=duracion_ms, **({"loop": 0} if k == 0 else {}))
+            datos = buffer.getvalue()
+            empaquetado = datos[10]  # descriptor de pantalla: bit 7 = hay paleta global, bits 0-2 = su tamano
+            fin_paleta = 13 + (3 << ((empaquetado & 7) + 1) if empaquetado & 0x80 else 0)
+            if k == 0:
+                gif.write(datos[:-1])  # todo menos el terminador
+                continue
+            i = fin_paleta
+            while datos[i] != 0x3B:  # bloques hasta el terminador
+                if datos[i] == 0x21:  # extension: etiqueta y sub-bloques hasta uno de largo 0
+                    j = i + 2
+                    while datos[j]:
+                        j += datos[j] + 1
+                    gif.write(datos[i:j + 1])
+                    i = j + 1
+                    continue
+                descriptor = bytearray(datos[i:i + 10])  # imagen: descriptor, paleta local y datos lzw
+                i += 10
+                if not descriptor[9] & 0x80 and empaquetado & 0x80:
+                    descriptor[9] |= 0x80 | (empaquetado & 7)
+                    gif.write(descriptor + datos[13:fin_paleta])
+                else:
+                    gif.write(descriptor)
+                j = i + 1  # tamano minimo de codigo lzw
+                while datos[j]:
+                    j += datos[j] + 1
+                gif.write(datos[i:j + 1])
+                i = j + 1
+        gif.write(b";")
+
+
+# une los png numerados en un gif (Pillow) o un video (ffmpeg)
+def _unir_cuadros(directorio: str, cantidad: int, salida: str, fps: int) -> None:
+    extension = os.path.splitext(salida)[1].lower()
+    if extension == ".gif":
+        _escribir_gif([os.path.join(directorio, f"cuadro_{k:06d}.png") for k in range(cantidad)], salida, int(1000 / fps))
+        return
+    if extension not in FORMATOS_FFMPEG:
+        raise ValueError(f"formato de salida no soportado: {extension!r} (usar un directorio, .gif o {', '.join(FORMATOS_FFMPEG)})")
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError(f"exportar a {extension} requiere ffmpeg; se puede exportar a un directorio o a .gif")
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-framerate", str(fps),
+                    "-i", os.path.join(directorio, "cuadro_%06d.png"),
+                    "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", salida], check=True)
+
+
+# exporta una grabacion de trayectorias: salida es un directorio (secuencia png) o un archivo .gif/.mp4/...
+# cada cuadro muestra un paso; pasos_por_cuadro > 1 acelera el video (5 = cinco minutos simulados por cuadro).
+# los cuadros se reparten en num_workers rangos contiguos (None = un proceso por cpu). devuelve la cantidad de cuadros
+def exportar_grabacion(ruta: str, salida: str, fps: int = 30, pasos_por_cuadro: int = 1,
+                       desde_minuto: Optional[int] = None, hasta_minuto: Optional[int] = None,
+                       num_workers: Optional[int] = 1, dpi: int = 80) -> int:
+    pasos = pasos_a_exportar(LectorTrayectorias(ruta), pasos_por_cuadro, desde_minuto, hasta_minuto).tolist()
+    es_directorio = os.path.splitext(salida)[1] == ""
+    directorio = salida if es_directorio else tempfile.mkdtemp(prefix="cuadros_")
+    os.makedirs(directorio, exist_ok=True)
+
+    try:
+        workers = num_workers or os.cpu_count() or 1
+        limites = np.linspace(0, len(pasos), min(workers, max(1, len(pasos))) + 1).astype(int)
+        rangos = [(int(a), int(b)) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+        if workers == 1:
+            for inicio, fin in rangos:
+                _renderizar_rango(ruta, pasos, inicio, fin, directorio, dpi)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_renderizar_rango, [ruta] * len(rangos), [pasos] * len(rangos),
+                              [a for a, _ in rangos], [b for _, b in rangos],
+                              [directorio] * len(rangos), [dpi] * len(rangos)))
+        if not es_directorio:
+            _unir_cuadros(directorio, len(pasos), salida, fps)
+    finally:
+        if not es_directorio:
+            shutil.rmtree(directorio, ignore_errors=True)
+    return len(pasos)
+
+
+# corre una simulacion (config son los parametros de Simulacion), la graba en un directorio temporal y la exporta
+def exportar_simulacion(salida: str, fps: int = 30, pasos_por_cuadro: int = 1,
+                        desde_minuto: Optional[int] = None, hasta_minuto: Optional[int] = None,
+                        num_workers: Optional[int] = 1, dpi: int = 80, **config) -> int:
+    with tempfile.TemporaryDirectory(prefix="grabacion_") as ruta:
+        grabar_simulacion(ruta, **config)
+        return exportar_grabacion(ruta, salida, fps=fps, pasos_por_cuadro=pasos_por_cuadro, desde_minuto=desde_minuto,
+                                  hasta_minuto=hasta_minuto, num_workers=num_workers, dpi=dpi)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="exporta una simulacion o una grabacion a imagenes o video sin ventana")
+    parser.add_argument("--salida", required=True, help="directorio (secuencia png) o archivo .gif/.mp4/.webm")
+    parser.add_argument("--grabacion", metavar="RUTA", help="exportar una grabacion existente en vez de simular")
+    parser.add_argument("--lambda", dest="lambda_param", type=float, default=0.1, help="tasa de arribos por minuto")
+    parser.add_argument("--dias", type=int, default=1, help="dias a simular")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--viento", type=float, default=None, metavar="P_GOAROUND", help="activar viento con esta prob de go-around")
+    parser.add_argument("--tormenta", type=float, default=None, metavar="PROB", help="activar tormentas con esta prob diaria")
+    parser.add_argument("--duracion-tormenta", type=int, default=30, help="duracion de cada tormenta en minutos")
+    parser.add_argument("--metering", action="store_true", help="usar el protocolo de metering")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--pasos-por-cuadro", type=int, default=1, help="minutos simulados por cuadro")
+    parser.add_argument("--desde", type=int, default=None, metavar="MINUTO", help="primer minuto a exportar")
+    parser.add_argument("--hasta", type=int, default=None, metavar="MINUTO", help="ultimo minuto a exportar")
+    parser.add_argument("--workers", type=int, default=None, help="procesos para dibujar (por defecto uno por cpu)")
+    parser.add_argument("--dpi", type=int, default=80)
+    args = parser.parse_args()
+
+    opciones = dict(fps=args.fps, pasos_por_cuadro=args.pasos_por_cuadro, desde_minuto=args.desde,
+                    hasta_minuto=args.hasta, num_workers=args.workers, dpi=args.dpi)
+    if args.grabacion:
+        cuadros = exportar_grabacion(args.grabacion, args.salida, **opciones)
+    else:
+        cuadros = exportar_simulacion(args.salida, lambda_param=args.lambda_param, dias_simulacion=args.dias,
+                                      semilla=args.semilla,
+                                      viento_activo=args.viento is not None, p_goaround=args.viento or 0.0,
+                                      storm_activa=args.tormenta is not None, storm_prob=args.tormenta or 0.0,
+                                      storm_duracion_min=args.duracion_tormenta, enable_metering=args.metering,
+                                      **opciones)
+    print(f"{cuadros} cuadros exportados a {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
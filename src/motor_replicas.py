@@ -0,0 +1,443 @@
+from typing import List, Optional
+import numpy as np
+import utilidades as u
+import const as c
+
+VACIO = -1  # codigo de estado de un lugar libre en la matriz
+_SEPARACION_FILAS = 1000.0  # mayor que cualquier x en aproximacion: fila * separacion + x ordena por fila y distancia
+TAMANO_BLOQUE = 512  # replicas por motor en simular_replicas: mas grande es mas rapido, mas chico reparte mejor entre workers
+
+# velocidades permitidas al aparecer en las 100 mn
+_VMIN_SPAWN, _VMAX_SPAWN = u.velocidad_permitida(100.0)
+
+
+# motor que avanza R replicas independientes juntas: cada columna de estado es una matriz (replica x lugar).
+# cada fila esta ordenada por distancia (mas cerca primero) con los lugares libres al final (x = inf, estado VACIO).
+# llegadas, cambios de rango, separacion, aterrizajes, go-arounds y cierres por tormenta se resuelven para todas
+# las replicas con una pasada de operaciones sobre matrices por minuto. cada operacion de numpy tiene un costo fijo
+# que se reparte entre las replicas, asi que conviene con muchas: con pocas decenas no gana contra correrlas de a una. replica la logica de MotorVectorizado
+# (incluido el modelo de dos flujos: los desviados no son lideres ni extremos de un gap de reinsercion)
+class MotorReplicas:
+
+    def __init__(self, num_replicas: int, lambda_param: float,
+                 viento_activo: bool = False, p_goaround: float = 0.10,
+                 storm_activa: bool = False, storm_prob: float = 0.0, storm_duracion_min: int = 30,
+                 enable_metering: bool = False, semilla=None, capacidad: int = 16,
+                 saltar_periodos_inactivos: bool = True) -> None:
+        from sim_core import Simulacion, crear_flujos
+        self.R = num_replicas
+        self.lambda_param = lambda_param
+        self.viento_activo = viento_activo
+        self.p_goaround = p_goaround
+        self.storm_activa = storm_activa
+        self.storm_prob = storm_prob
+        self.storm_duracion_min = storm_duracion_min
+        self.enable_metering = enable_metering
+        self.saltar_periodos_inactivos = saltar_periodos_inactivos
+        self.flujos = crear_flujos(semilla)
+        self.tiempo_actual = Simulacion.tiempo_actual  # mismo minuto de arranque que Simulacion
+
+        R = num_replicas
+        self.n = np.zeros(R, dtype=np.int64)                       # aviones activos por replica
+        self.t_spawn = np.zeros((R, capacidad), dtype=np.int64)
+        self.x = np.full((R, capacidad), np.inf)
+        self.v = np.zeros((R, capacidad))
+        self.estado = np.full((R, capacidad), VACIO, dtype=np.int8)
+        self.minutos_bloqueo = np.zeros((R, capacidad), dtype=np.int64)
+        self.sta_meter = np.full((R, capacidad), np.nan)
+        self.metering = np.zeros((R, capacidad), dtype=bool)
+
+        self._last_sta_meter = np.full(R, np.nan)                  # nan = ninguna sta asignada hoy
+        self.storm_inicio_min = np.full(R, -1, dtype=np.int64)     # -1 = sin tormenta hoy
+        self._llegadas_dia = None
+        self._llegadas_clave = None
+
+        self.estadisticas = {clave: np.zeros(R, dtype=np.int64) for clave in
+                             ('total_aviones', 'aterrizados', 'desviados', 'desvios_a_montevideo', 'desvios_viento',
+                              'desvios_cierre', 'desvios_tormenta', 'reincerciones_exitosas')}
+        self._suma_tiempos_aterrizaje = np.zeros(R)
+        self.dias_completados = 0
+        self._programar_tormentas_del_dia()
+
+    _COLUMNAS = ("t_spawn", "x", "v", "estado", "minutos_bloqueo", "sta_meter", "metering")
+    _RELLENOS = {"t_spawn": 0, "x": np.inf, "v": 0.0, "estado": VACIO, "minutos_bloqueo": 0,
+                 "sta_meter": np.nan, "metering": False}
+
+    # duplica la cantidad de lugares por replica
+    def _crecer(self, minimo: int) -> None:
+        capacidad = self.x.shape[1]
+        while capacidad < minimo:
+            capacidad *= 2
+        for nombre in self._COLUMNAS:
+            viejo = getattr(self, nombre)
+            nuevo = np.full((self.R, capacidad), self._RELLENOS[nombre], dtype=viejo.dtype)
+            nuevo[:, :viejo.shape[1]] = viejo
+            setattr(self, nombre, nuevo)
+
+    # cantidad de columnas con algun avion: como cada fila esta compactada a la izquierda, el resto esta libre
+    def _ancho(self) -> int:
+        return int(self.n.max())
+
+    # ordena por distancia las filas de las primeras ancho columnas que se desordenaron (los lugares libres, con
+    # x = inf, quedan al final); las filas que siguen en orden no se tocan
+    def _ordenar(self, ancho: int) -> None:
+        x = self.x[:, :ancho]
+        filas = np.flatnonzero((x[:, 1:] < x[:, :-1]).any(axis=1))
+        if not filas.size:
+            return
+        orden = np.argsort(x[filas], axis=1, kind="stable")
+        for nombre in self._COLUMNAS:
+            arr = getattr(self, nombre)
+            arr[filas, :ancho] = arr[filas[:, None], orden]
+
+    # tormenta de hoy para cada replica (igual que Simulacion._programar_tormenta_del_dia)
+    def _programar_tormentas_del_dia(self) -> None:
+        if not self.storm_activa or self.storm_prob <= 0.0:
+            self.storm_inicio_min[:] = -1
+            return
+        rng = self.flujos["tormentas"]
+        hay = rng.random(self.R) < self.storm_prob
+        max_ini = max(0, 1440 - self.storm_duracion_min)
+        inicio = np.floor(rng.uniform(0, max_ini + 1, size=self.R)).astype(np.int64)
+        self.storm_inicio_min[:] = np.where(hay, inicio, -1)
+
+    # mascara de replicas en tormenta en el minuto m del dia (solo cuenta dentro del horario operativo)
+    def _en_tormenta(self, m: int) -> np.ndarray:
+        if not self.storm_activa or not (c.MINUTOS_OPEN <= m < c.MINUTOS_CLOSE):
+            return np.zeros(self.R, dtype=bool)
+        inicio = self.storm_inicio_min % 1440
+        fin = (inicio + self.storm_duracion_min) % 1440
+        dentro = np.where(inicio < fin, (inicio <= m) & (m < fin), (m >= inicio) | (m < fin))
+        return (self.storm_inicio_min >= 0) & dentro
+
+    # minutos hasta que reabra cada replica cerrada por tormenta (igual que Simulacion._minutos_hasta_apertura)
+    def _minutos_hasta_fin_tormenta(self, m: int) -> np.ndarray:
+        inicio = self.storm_inicio_min % 1440
+        fin = (inicio + self.storm_duracion_min) % 1440
+        return np.where(inicio < fin, np.maximum(0, fin - m),
+                        np.where(m >= inicio, (1440 - m) + fin, np.maximum(0, fin - m)))
+
+    # agrega las llegadas poisson del minuto a cada replica (todas en las 100 mn, con sta de metering si corresponde)
+    def _generar_llegadas(self, m: int) -> None:
+        clave = self.tiempo_actual // 1440
+        if self._llegadas_clave != clave:  # llegadas de todo el horario operativo del dia, para todas las replicas
+            self._llegadas_dia = self.flujos["llegadas"].poisson(self.lambda_param,
+                                                                  size=(c.MINUTOS_CLOSE - c.MINUTOS_OPEN, self.R))
+            self._llegadas_clave = clave
+        k = self._llegadas_dia[m - c.MINUTOS_OPEN]
+        k_max = int(k.max())
+        if k_max == 0:
+            return
+        if int((self.n + k).max()) > self.x.shape[1]:
+            self._crecer(int((self.n + k).max()))
+
+        if self.enable_metering:  # primera sta: la candidata o 5 min despues de la ultima; las siguientes de a 5 min
+            sta_cand = self.tiempo_actual + u.tiempo_min_vmax_a_punto(100.0, c.METER_POINT_MN)
+            primera = np.where(np.isnan(self._last_sta_meter), sta_cand,
+                               np.maximum(sta_cand, self._last_sta_meter + c.METER_TARGET_SPACING_MIN))
+
+        # todas las llegadas del minuto de una vez: la j-esima llegada de la fila r va al lugar n[r] + j
+        filas = np.repeat(np.arange(self.R), k)
+        j = np.arange(len(filas)) - np.repeat(np.cumsum(k) - k, k)
+        lugares = self.n[filas] + j
+        velocidades = self.flujos["velocidades_iniciales"].uniform(_VMIN_SPAWN, _VMAX_SPAWN, size=(k_max, self.R))
+        self.t_spawn[filas, lugares] = self.tiempo_actual
+        self.x[filas, lugares] = 100.0
+        self.v[filas, lugares] = velocidades[j, filas]
+        self.estado[filas, lugares] = c.EN_FILA
+        self.minutos_bloqueo[filas, lugares] = 0
+        if self.enable_metering:
+            self.sta_meter[filas, lugares] = primera[filas] + j * c.METER_TARGET_SPACING_MIN
+            self.metering[filas, lugares] = True
+        else:
+            self.sta_meter[filas, lugares] = np.nan
+            self.metering[filas, lugares] = False
+        if self.enable_metering:
+            con_llegadas = k > 0
+            self._last_sta_meter[con_llegadas] = primera[con_llegadas] + (k[con_llegadas] - 1) * c.METER_TARGET_SPACING_MIN
+        self.n += k
+        self.estadisticas['total_aviones'] += k
+
+    # equivalente de MotorVectorizado._aplicar_metering sobre la matriz
+    def _aplicar_metering(self, ancho: int) -> None:
+        x, v, est = self.x[:, :ancho], self.v[:, :ancho], self.estado[:, :ancho]
+        sta_meter = self.sta_meter[:, :ancho]
+        activos = (self.metering[:, :ancho] & ~np.isnan(sta_meter) & (est != VACIO) & (est != c.DESVIADO)
+                   & (x > c.METER_POINT_MN))
+        if not activos.any():
+            return
+        k = u.indice_rango_vec(x)
+        vmin, vmax = u.VMIN_RANGOS[k], u.VMAX_RANGOS[k]
+        with np.errstate(invalid="ignore"):
+            v_eta = np.where(v > 0, v, vmax)
+            eat = self.tiempo_actual + 60.0 * (x - c.METER_POINT_MN) / v_eta
+        error_min = sta_meter - eat
+        deadband_min = c.METER_DEADBAND_SEC / 60.0
+        temprano = activos & (error_min < -deadband_min)
+        tarde = activos & (error_min > deadband_min)
+        v_baja = v - c.METER_SPEED_STEP
+        v_baja_ok = np.clip(v_baja, vmin, vmax)
+        v_sube_ok = np.clip(v + c.METER_SPEED_STEP, vmin, vmax)
+        est[temprano & (v_baja_ok < v_baja + 1e-9)] = c.DESACELERANDO
+        v[temprano] = v_baja_ok[temprano]
+        v[tarde] = v_sube_ok[tarde]
+
+    # pasa a desviado los aviones marcados (la mascara puede cubrir solo las primeras columnas)
+    def _set_desviado(self, mascara: np.ndarray) -> None:
+        ancho = mascara.shape[1]
+        self.estado[:, :ancho][mascara] = c.DESVIADO
+        self.v[:, :ancho][mascara] = 200
+
+    # MotorVectorizado._resolver_lideres para todas las filas juntas: lideres son los lugares (filas, columnas) en
+    # orden de fila y distancia, y el primero de cada fila no tiene lider. en cada pasada extra se desvia el primer
+    # avion que no llega a vmin de cada fila, asi que hay tantas pasadas como desvios por congestion en la peor fila
+    def _resolver_lideres(self, lideres: tuple, aproxima: np.ndarray, vmin: np.ndarray, vmax: np.ndarray,
+                          ancho: int) -> None:
+        x, v, est = self.x[:, :ancho], self.v[:, :ancho], self.estado[:, :ancho]
+        filas, columnas = lideres
+        v_libera = np.full(len(filas), np.nan)                # velocidad sorteada para los que dejan de desacelerar
+        while True:
+            x_l, v_l = x[filas, columnas], v[filas, columnas]
+            gap = np.full(len(filas), -np.inf)                 # el primero de cada fila no tiene lider
+            gap[1:] = np.where(filas[1:] == filas[:-1], x_l[1:] - x_l[:-1], -np.inf)
+            delante = gap > 0
+            aproxima_l = aproxima[filas, columnas]
+            cerca = aproxima_l & delante & (gap * 60 < 4 * v_l)
+            libera = (aproxima_l & (est[filas, columnas] == c.DESACELERANDO) & ~cerca &
+                      (~delante | (gap * 60 > 5 * v_l)))
+            nuevos = libera & np.isnan(v_libera)               # solo se sortea para los que liberan
+            if nuevos.any():
+                f, k = filas[nuevos], columnas[nuevos]
+                v_libera[nuevos] = self.flujos["velocidades"].uniform(vmin[f, k], vmax[f, k])
+            if not cerca.any():
+                break
+            raiz = np.maximum.accumulate(np.where(cerca, 0, np.arange(len(filas))))
+            cercanos = np.cumsum(cerca)
+            v_nueva = np.where(libera, v_libera, v_l)[raiz] - 20 * (cercanos - cercanos[raiz])
+            falla = cerca & (v_nueva < vmin[filas, columnas])
+            if not falla.any():
+                v[filas[cerca], columnas[cerca]] = v_nueva[cerca]
+                est[filas[cerca], columnas[cerca]] = c.DESACELERANDO
+                break
+            pos = np.flatnonzero(falla)
+            pos = pos[np.concatenate(([True], filas[pos[1:]] != filas[pos[:-1]]))]  # la primera falla de cada fila
+            v[filas[pos], columnas[pos]] = 200
+            est[filas[pos], columnas[pos]] = c.DESVIADO
+            quedan = np.ones(len(filas), dtype=bool)
+            quedan[pos] = False
+            filas, columnas, v_libera = filas[quedan], columnas[quedan], v_libera[quedan]
+        v[filas[libera], columnas[libera]] = v_libera[libera]
+
+    # reinsercion de los desviados candidatos (indices planos de la matriz, por fila y en orden de distancia), igual
+    # que MotorVectorizado._reinsertar pero para todas las filas juntas: la aproximacion de todas las replicas va en un
+    # solo arreglo ordenado por fila * _SEPARACION_FILAS + x, y en cada ronda se acepta el primero que se reinserta
+    # de cada fila
+    def _reinsertar(self, candidatos: np.ndarray, en_aproximacion: np.ndarray, x_inicio: np.ndarray) -> None:
+        C = en_aproximacion.shape[1]
+        x, v, est = self.x[:, :C], self.v[:, :C], self.estado[:, :C]
+        filas_aprox = np.nonzero(en_aproximacion)[0]
+        x_aprox = x[en_aproximacion]
+        orden = np.argsort(filas_aprox * _SEPARACION_FILAS + x_aprox, kind="stable")
+        filas_aprox, x_aprox = filas_aprox[orden], x_aprox[orden]
+        while candidatos.size and x_aprox.size:
+            filas, columnas = np.divmod(candidatos, C)
+            j = np.searchsorted(filas_aprox * _SEPARACION_FILAS + x_aprox,
+                                filas * _SEPARACION_FILAS + x_inicio[filas, columnas], side="left")
+            adelante = np.maximum(j - 1, 0)
+            atras = np.minimum(j, len(x_aprox) - 1)
+            hay_lider = (j > 0) & (filas_aprox[adelante] == filas)
+            hay_atras = (j < len(x_aprox)) & (filas_aprox[atras] == filas)
+            x_lider = x_aprox[adelante]
+            x_atras = np.where(hay_atras, x_aprox[atras], 100.0)  # el ultimo usa el gap hasta las 100 mn
+            gap = x_atras - x_lider
+            punto_medio = x_lider + gap / 2.0
+            x_cand = x[filas, columnas]
+            reinserta = (hay_lider & (gap >= v[filas, columnas] / 60.0 * 10.0) &
+                         (x_lider < x_cand) & (x_cand <= punto_medio) & (punto_medio > 5.0))
+            if not reinserta.any():
+                return
+            primero = np.full(self.R, len(candidatos))  # posicion del primero que se reinserta en cada fila
+            np.minimum.at(primero, filas[reinserta], np.flatnonzero(reinserta))
+            acepta = np.flatnonzero(primero[filas] == np.arange(len(candidatos)))
+            fa, ca = filas[acepta], columnas[acepta]
+            x[fa, ca] = punto_medio[acepta]
+            est[fa, ca] = c.REINSERCION
+            k_medio = u.indice_rango_vec(punto_medio[acepta])
+            v[fa, ca] = self.flujos["velocidades"].uniform(u.VMIN_RANGOS[k_medio], u.VMAX_RANGOS[k_medio])
+
+            # los reinsertados pasan a la aproximacion; siguen pendientes los de despues en las filas con reinsercion
+            donde = np.searchsorted(filas_aprox * _SEPARACION_FILAS + x_aprox, fa * _SEPARACION_FILAS + x[fa, ca], side="right")
+            filas_aprox, x_aprox = np.insert(filas_aprox, donde, fa), np.insert(x_aprox, donde, x[fa, ca])
+            candidatos = candidatos[np.arange(len(candidatos)) > primero[filas]]
+
+    # avanza un minuto a todas las replicas
+    def procesar_paso_temporal(self) -> None:
+        m = self.tiempo_actual % 1440
+        horario = not (c.MINUTOS_OPEN <= m < c.MINUTOS_CLOSE)
+        tormenta = self._en_tormenta(m)
+        tormenta_antes = self._en_tormenta((m - c.DT) % 1440)
+
+        if not horario:
+            self._generar_llegadas(m)
+
+        empieza = tormenta & ~tormenta_antes  # inicio de tormenta: todos los aviones en aproximacion vuelven
+        if empieza.any():
+            ancho = self._ancho()
+            est = self.estado[:, :ancho]
+            afectados = empieza[:, None] & ((est == c.EN_FILA) | (est == c.DESACELERANDO) | (est == c.REINSERCION))
+            self._set_desviado(afectados)
+            self.minutos_bloqueo[:, :ancho][afectados] = np.broadcast_to(self._minutos_hasta_fin_tormenta(m)[:, None],
+                                                              afectados.shape)[afectados]
+            self.estadisticas['desvios_tormenta'] += afectados.sum(axis=1)
+
+        if self.n.any():
+            self._avanzar(m, horario, tormenta)
+        self._avanzar_reloj()
+
+    # las operaciones se hacen sobre las primeras columnas (las que tienen algun avion), no sobre toda la capacidad
+    def _avanzar(self, m: int, horario: bool, tormenta: np.ndarray) -> None:
+        ancho = self._ancho()  # las filas ya estan ordenadas: el paso anterior termina ordenando y las llegadas van al final
+        if self.enable_metering:
+            self._aplicar_metering(ancho)
+
+        x, v, est = self.x[:, :ancho], self.v[:, :ancho], self.estado[:, :ancho]
+        t_spawn, metering, bloqueo = self.t_spawn[:, :ancho], self.metering[:, :ancho], self.minutos_bloqueo[:, :ancho]
+        R, C = x.shape
+        ocupado = est != VACIO
+
+        desviado = est == c.DESVIADO
+        aterriza = ocupado & ~desviado & (x <= v / 60 * c.DT)
+        aproxima = ocupado & ~desviado & ~aterriza
+        venia_reinsertando = aproxima & (est == c.REINSERCION)
+        est[venia_reinsertando] = c.EN_FILA
+
+        # aterrizajes: cierre por horario o tormenta de la replica, go-around por viento o aterrizaje confirmado
+        aterrizado = np.zeros((R, C), dtype=bool)
+        if aterriza.any():
+            est[aterriza] = c.INTENTO_ATERRIZAR
+            cerrada = np.full(R, horario) | tormenta
+            por_cierre = aterriza & cerrada[:, None]
+            if por_cierre.any():
+                self._set_desviado(por_cierre)
+                hasta_apertura = np.full(R, (360 - m) % 1440) if horario else self._minutos_hasta_fin_tormenta(m)
+                bloqueo[por_cierre] = np.broadcast_to(hasta_apertura[:, None], (R, C))[por_cierre]
+                clave = 'desvios_cierre' if horario else 'desvios_tormenta'
+                self.estadisticas[clave] += por_cierre.sum(axis=1)
+            intentan = aterriza & ~por_cierre
+            goaround = np.zeros((R, C), dtype=bool)
+            if self.viento_activo and intentan.any():
+                goaround[intentan] = self.flujos["goarounds"].random(int(intentan.sum())) < self.p_goaround
+                self._set_desviado(goaround)
+                self.estadisticas['desvios_viento'] += goaround.sum(axis=1)
+            aterrizado = intentan & ~goaround
+            est[aterrizado] = c.ATERRIZAJE_CONFIRMADO
+            self.estadisticas['aterrizados'] += aterrizado.sum(axis=1)
+            self._suma_tiempos_aterrizaje += np.where(aterrizado, self.tiempo_actual - t_spawn, 0).sum(axis=1)
+
+        # movimiento: los que se aproximan avanzan y los desviados retroceden
+        x_inicio = x.copy()
+        rango_antes = u.indice_rango_vec(x)
+        paso_mn = v / 60 * c.DT
+        x[aproxima] -= paso_mn[aproxima]
+        x[desviado] += paso_mn[desviado]
+
+        k = u.indice_rango_vec(x)
+        vmin, vmax = u.VMIN_RANGOS[k], u.VMAX_RANGOS[k]
+        cambio = aproxima & (k != rango_antes)
+        con_metering = cambio & metering
+        v[con_metering] = np.clip(v[con_metering], vmin[con_metering], vmax[con_metering])
+        sorteo = cambio & ~metering
+        if sorteo.any():
+            v[sorteo] = self.flujos["velocidades"].uniform(vmin[sorteo], vmax[sorteo])
+
+        # separacion contra el lider: el anterior mas cercano que sigue en la aproximacion o acaba de aterrizar, nunca
+        # un desviado (una pasada como en MotorVectorizado._resolver_lideres)
+        self._resolver_lideres(np.nonzero(aproxima | aterrizado), aproxima, vmin, vmax, ancho)
+        self.estadisticas['reincerciones_exitosas'] += (venia_reinsertando & (est == c.EN_FILA)).sum(axis=1)
+
+        # desviados (los de antes de este paso): bloqueo y reinsercion en el gap entre los vecinos en la aproximacion
+        bloqueados = desviado & (bloqueo > 0)
+        bloqueo[bloqueados] = np.maximum(0, bloqueo[bloqueados] - c.DT)
+        candidatos = np.flatnonzero(desviado & ~bloqueados)
+        if candidatos.size:
+            self._reinsertar(candidatos, aproxima & (est != c.DESVIADO), x_inicio)
+
+        # desviados que salen de las 100 mn se van a montevideo
+        salen = (est == c.DESVIADO) & (x > 100.0)
+        por_replica = salen.sum(axis=1)
+        self.estadisticas['desviados'] += por_replica
+        self.estadisticas['desvios_a_montevideo'] += por_replica
+
+        libres = aterrizado | salen  # liberar lugares y compactar: las llegadas se ubican a partir de la columna n
+        if libres.any():
+            x[libres] = np.inf
+            est[libres] = VACIO
+            self.n -= libres.sum(axis=1)
+        self._ordenar(ancho)  # reubica a los que se pasaron o se reinsertaron y deja los lugares libres al final
+
+    # incrementa el reloj y hace los cambios de dia (tormentas nuevas, sta de metering reiniciada)
+    def _avanzar_reloj(self, destino: Optional[int] = None) -> None:
+        dia_antes = self.tiempo_actual // 1440
+        self.tiempo_actual = self.tiempo_actual + c.DT if destino is None else destino
+        for _ in range(max(0, self.tiempo_actual // 1440 - dia_antes)):
+            self.dias_completados += 1
+            self._programar_tormentas_del_dia()
+            self._last_sta_meter[:] = np.nan
+
+    # de noche y sin aviones en ninguna replica, adelanta el reloj hasta la apertura
+    def _saltar_periodo_inactivo(self, tiempo_limite: int) -> bool:
+        m = self.tiempo_actual % 1440
+        if self.n.any() or (c.MINUTOS_OPEN <= m < c.MINUTOS_CLOSE):
+            return False
+        destino = min(self.tiempo_actual + (360 - m) % 1440, tiempo_limite)
+        if destino <= self.tiempo_actual:
+            return False
+        self._avanzar_reloj(destino)
+        return True
+
+    # corre todas las replicas hasta el final del horizonte y devuelve las estadisticas de cada una
+    def ejecutar(self, dias_simulacion: int) -> List[dict]:
+        tiempo_total = dias_simulacion * 1440
+        while self.tiempo_actual < tiempo_total:
+            if self.saltar_periodos_inactivos and self._saltar_periodo_inactivo(tiempo_total):
+                continue
+            self.procesar_paso_temporal()
+        return self.obtener_estadisticas(dias_simulacion)
+
+    # estadisticas de cada replica con las mismas claves que Simulacion.estadisticas
+    def obtener_estadisticas(self, dias_completados: Optional[int] = None) -> List[dict]:
+        aterrizados = self.estadisticas['aterrizados']
+        with np.errstate(invalid="ignore", divide="ignore"):
+            promedio = np.where(aterrizados > 0, self._suma_tiempos_aterrizaje / np.maximum(aterrizados, 1), 0)
+        resultado = []
+        for r in range(self.R):
+            stats = {clave: int(valores[r]) for clave, valores in self.estadisticas.items()}
+            stats['tiempo_promedio_aterrizaje'] = float(promedio[r])
+            stats['dias_completados'] = self.dias_completados if dias_completados is None else dias_completados
+            resultado.append(stats)
+        return resultado
+
+
+# corre un bloque de replicas en un MotorReplicas (nivel modulo para poder usarla en un pool de procesos)
+def _simular_bloque(num_replicas: int, dias_simulacion: int, semilla: np.random.SeedSequence, config: dict) -> List[dict]:
+    return MotorReplicas(num_replicas, semilla=semilla, **config).ejecutar(dias_simulacion)
+
+
+# corre num_simulaciones replicas en bloques de a tamano_bloque y devuelve la lista de estadisticas de cada replica.
+# el bloque b usa la semilla derivada (semilla, b): el resultado depende del tamano de bloque pero no de la
+# cantidad de workers (el tamano por defecto es fijo, los workers solo se reparten los bloques)
+def simular_replicas(num_simulaciones: int, dias_simulacion: int, semilla: Optional[int] = None,
+                     tamano_bloque: int = TAMANO_BLOQUE, num_workers: Optional[int] = 1, **config) -> List[dict]:
+    if semilla is None:  # la maestra sale del estado global (respeta np.random.seed)
+        semilla = int(np.random.randint(0, 2**31 - 1))
+    tamanos = [min(tamano_bloque, num_simulaciones - inicio) for inicio in range(0, num_simulaciones, tamano_bloque)]
+    semillas = [np.random.SeedSequence(semilla, spawn_key=(b,)) for b in range(len(tamanos))]
+
+    if num_workers == 1:
+        bloques = list(map(_simular_bloque, tamanos, [dias_simulacion] * len(tamanos), semillas, [config] * len(tamanos)))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            bloques = list(pool.map(_simular_bloque, tamanos, [dias_simulacion] * len(tamanos), semillas,
+                                    [config] * len(tamanos)))
+    return [stats for bloque in bloques for stats in bloque]
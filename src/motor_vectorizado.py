@@ -0,0 +1,279 @@
+from typing import List, Optional, Tuple
+import numpy as np
+import utilidades as u
+import const as c
+
+
+# motor alternativo: guarda todos los aviones activos en arreglos numpy (estructura de arreglos)
+# y avanza a todos juntos en cada paso con operaciones vectorizadas.
+# no es un modo de rendimiento: con los pocos aviones activos del problema (menos de ~100) el costo fijo de cada
+# llamada de numpy pesa mas que el recorrido en python, y el motor "objetos" es varias veces mas rapido
+# (ver comparacion_motores en benchmarks.py). sirve como implementacion independiente para contrastar resultados
+# los desviados comparten los arreglos pero siguen el modelo de dos flujos de Simulacion: no son lideres de nadie
+# y la reinsercion busca su gap solo entre los aviones en aproximacion
+class MotorVectorizado:
+
+    def __init__(self, capacidad: int = 64, rng: Optional[np.random.Generator] = None,
+                 rng_goarounds: Optional[np.random.Generator] = None) -> None:
+        self.rng = rng if rng is not None else np.random             # generador de la simulacion (o el estado global)
+        self.rng_goarounds = rng_goarounds if rng_goarounds is not None else self.rng  # sorteos de go-around (flujo aparte)
+        self.n = 0                                                   # cantidad de aviones activos
+        self.id = np.zeros(capacidad, dtype=np.int64)
+        self.t_spawn = np.zeros(capacidad, dtype=np.int64)
+        self.x = np.zeros(capacidad, dtype=float)
+        self.v = np.zeros(capacidad, dtype=float)
+        self.estado = np.zeros(capacidad, dtype=np.int8)             # codigos c.EN_FILA, c.DESVIADO, ...
+        self.tiempo_estimado = np.zeros(capacidad, dtype=float)
+        self.minutos_bloqueo = np.zeros(capacidad, dtype=np.int64)
+        self.sta_meter = np.full(capacidad, np.nan)                  # nan = sin sta asignada
+        self.metering = np.zeros(capacidad, dtype=bool)
+        self.motivo_desvio = np.full(capacidad, -1, dtype=np.int8)   # indice en c.MOTIVOS_DESVIO, -1 = nunca desviado
+
+    _COLUMNAS = ("id", "t_spawn", "x", "v", "estado", "tiempo_estimado", "minutos_bloqueo", "sta_meter", "metering", "motivo_desvio")
+
+    # duplica la capacidad de los arreglos cuando se llenan
+    def _crecer(self) -> None:
+        for nombre in self._COLUMNAS:
+            viejo = getattr(self, nombre)
+            nuevo = np.empty(2 * len(viejo), dtype=viejo.dtype)
+            nuevo[:self.n] = viejo[:self.n]
+            setattr(self, nombre, nuevo)
+
+    # agrega un avion nuevo en las 100 mn
+    def agregar(self, id: int, t_spawn: int, v: float, sta_meter: Optional[float] = None, x: float = 100.0) -> None:
+        if self.n == len(self.x):
+            self._crecer()
+        i = self.n
+        self.id[i] = id
+        self.t_spawn[i] = t_spawn
+        self.x[i] = x
+        self.v[i] = v
+        self.estado[i] = c.EN_FILA
+        self.tiempo_estimado[i] = np.nan
+        self.minutos_bloqueo[i] = 0
+        self.sta_meter[i] = np.nan if sta_meter is None else sta_meter
+        self.metering[i] = sta_meter is not None
+        self.motivo_desvio[i] = -1
+        self.n += 1
+
+    # deja solo los aviones marcados en mantener, en el mismo orden
+    def _compactar(self, mantener: np.ndarray) -> None:
+        k = int(mantener.sum())
+        for nombre in self._COLUMNAS:
+            arr = getattr(self, nombre)
+            arr[:k] = arr[:self.n][mantener]
+        self.n = k
+
+    # ordena los aviones por distancia al aeropuerto (mas cerca primero), igual que ordenar_aviones_por_distancia
+    def _ordenar(self) -> None:
+        x = self.x[:self.n]
+        if not (x[1:] < x[:-1]).any():  # ya estaba ordenado
+            return
+        orden = np.argsort(x, kind="stable")
+        for nombre in self._COLUMNAS:
+            arr = getattr(self, nombre)
+            arr[:self.n] = arr[:self.n][orden]
+
+    # desvia a todos los aviones en aproximacion por inicio de tormenta, devuelve cuantos desvio
+    def desviar_por_tormenta(self, minutos_bloqueo: int) -> int:
+        est = self.estado[:self.n]
+        afectados = (est == c.EN_FILA) | (est == c.DESACELERANDO) | (est == c.REINSERCION)
+        self._set_desviado(afectados, "tormenta")
+        self.minutos_bloqueo[:self.n][afectados] = minutos_bloqueo
+        return int(afectados.sum())
+
+    # equivalente vectorizado de Plane.set_desviado
+    def _set_desviado(self, mascara: np.ndarray, motivo: str) -> None:
+        self.estado[:self.n][mascara] = c.DESVIADO
+        self.v[:self.n][mascara] = 200
+        self.tiempo_estimado[:self.n][mascara] = -1
+        self.motivo_desvio[:self.n][mascara] = c.MOTIVOS_DESVIO.index(motivo)
+
+    # equivalente vectorizado de Plane.apply_metering
+    def _aplicar_metering(self, ahora: int) -> None:
+        n = self.n
+        x, v, est = self.x[:n], self.v[:n], self.estado[:n]
+        activos = self.metering[:n] & ~np.isnan(self.sta_meter[:n]) & (est != c.DESVIADO) & (x > c.METER_POINT_MN)
+        if not activos.any():
+            return
+
+        k = u.indice_rango_vec(x)
+        vmin, vmax = u.VMIN_RANGOS[k], u.VMAX_RANGOS[k]
+        v_eta = np.where(v > 0, v, vmax)
+        eat = ahora + 60.0 * (x - c.METER_POINT_MN) / v_eta
+        error_min = self.sta_meter[:n] - eat                 # >0: tarde, <0: temprano
+        deadband_min = c.METER_DEADBAND_SEC / 60.0
+
+        temprano = activos & (error_min < -deadband_min)     # va temprano -> bajar v
+        tarde = activos & (error_min > deadband_min)         # va tarde -> subir v
+
+        v_baja = v - c.METER_SPEED_STEP
+        v_baja_ok = np.clip(v_baja, vmin, vmax)
+        v_sube_ok = np.clip(v + c.METER_SPEED_STEP, vmin, vmax)
+        est[temprano & (v_baja_ok < v_baja + 1e-9)] = c.DESACELERANDO   # bajó realmente
+        v[temprano] = v_baja_ok[temprano]
+        v[tarde] = v_sube_ok[tarde]
+
+    # separacion de una pasada sobre los lideres posibles (indices en orden de distancia): el lider de cada uno es el
+    # anterior de la lista, asi que el gap es np.diff de las posiciones. el que esta a menos de 4 min baja a 20 nudos
+    # menos que su lider, y en una cadena de esos todos dependen de la raiz (el primero anterior que no esta cerca):
+    # v = v_raiz - 20 * (cantidad de cercanos desde la raiz), con un acumulado. el primero que no llega a vmin se
+    # desvia y deja de ser lider, y solo entonces se resuelve de nuevo: una pasada mas por desvio por congestion
+    def _resolver_lideres(self, lideres: np.ndarray, aproxima: np.ndarray, vmin: np.ndarray, vmax: np.ndarray) -> None:
+        v, est = self.v, self.estado
+        v_libera = np.full(len(lideres), np.nan)              # velocidad sorteada para los que dejan de desacelerar
+        while True:
+            x_l, v_l = self.x[lideres], v[lideres]
+            gap = np.full(len(lideres), -np.inf)               # el primero no tiene lider
+            gap[1:] = x_l[1:] - x_l[:-1]
+            delante = gap > 0
+            aproxima_l = aproxima[lideres]
+            cerca = aproxima_l & delante & (gap * 60 < 4 * v_l)
+            libera = aproxima_l & (est[lideres] == c.DESACELERANDO) & ~cerca & (~delante | (gap * 60 > 5 * v_l))
+            nuevos = libera & np.isnan(v_libera)               # solo se sortea para los que liberan
+            if nuevos.any():
+                i = lideres[nuevos]
+                v_libera[nuevos] = self.rng.uniform(vmin[i], vmax[i])
+            if not cerca.any():
+                break
+            raiz = np.maximum.accumulate(np.where(cerca, 0, np.arange(len(lideres))))
+            cercanos = np.cumsum(cerca)
+            v_nueva = np.where(libera, v_libera, v_l)[raiz] - 20 * (cercanos - cercanos[raiz])
+            falla = cerca & (v_nueva < vmin[lideres])
+            if not falla.any():
+                v[lideres[cerca]] = v_nueva[cerca]
+                est[lideres[cerca]] = c.DESACELERANDO
+                break
+            f = int(np.argmax(falla))                          # los anteriores a f ya quedaron resueltos
+            v[lideres[f]] = 200
+            est[lideres[f]] = c.DESVIADO
+            quedan = np.arange(len(lideres)) != f
+            lideres, v_libera = lideres[quedan], v_libera[quedan]
+        v[lideres[libera]] = v_libera[libera]
+
+    # reinsercion de los desviados candidatos (indices en orden de distancia, como el flujo de desvio de Simulacion).
+    # cada uno busca sus vecinos en la aproximacion ya movida (x_aprox ordenado) desde su posicion antes de retroceder;
+    # el que se reinserta pasa a la aproximacion y los siguientes ya lo ven en su gap. cada ronda evalua a todos los
+    # pendientes juntos y acepta solo al primero que se reinserta (los anteriores quedan como estan)
+    def _reinsertar(self, candidatos: np.ndarray, x_aprox: np.ndarray, x_inicio: np.ndarray) -> None:
+        x, v, est = self.x, self.v, self.estado
+        while candidatos.size and x_aprox.size:
+            j = np.searchsorted(x_aprox, x_inicio[candidatos], side="left")
+            x_lider = x_aprox[np.maximum(j - 1, 0)]
+            x_atras = np.where(j < len(x_aprox), x_aprox[np.minimum(j, len(x_aprox) - 1)], 100.0)  # o el gap hasta las 100 mn
+            gap = x_atras - x_lider
+            punto_medio = x_lider + gap / 2.0
+            x_cand = x[candidatos]
+            reinserta = ((j > 0) & (gap >= v[candidatos] / 60.0 * 10.0) &
+                         (x_lider < x_cand) & (x_cand <= punto_medio) & (punto_medio > 5.0))
+            if not reinserta.any():
+                return
+            f = int(np.argmax(reinserta))
+            i = candidatos[f]
+            x[i] = punto_medio[f]
+            est[i] = c.REINSERCION
+            vmin, vmax = u.velocidad_permitida(x[i])
+            v[i] = self.rng.uniform(vmin, vmax)
+            x_aprox = np.insert(x_aprox, np.searchsorted(x_aprox, x[i], side="right"), x[i])
+            candidatos = candidatos[f + 1:]
+
+    # avanza un paso temporal a todos los aviones, retorna los eventos del paso para que la simulacion actualice estadisticas
+    def avanzar(self, ahora: int, motivo_cierre: Optional[str], minutos_hasta_apertura: int,
+                enable_metering: bool = False, viento_activo: bool = False, p_goaround: float = 0.0) -> dict:
+        eventos = {
+            'aterrizados': [],          # lista de (id, t_spawn, t_landing)
+            'desvios_viento': 0,
+            'desvios_tormenta': 0,
+            'desvios_cierre': 0,
+            'salidas_montevideo': 0,
+            'salidas': [],              # lista de (t_spawn, motivo_desvio) de los que se fueron a montevideo
+            'reincerciones_exitosas': 0
+        }
+        if self.n == 0:
+            return eventos
+
+        self._ordenar()
+        if enable_metering:
+            self._aplicar_metering(ahora)
+
+        n = self.n
+        x, v, est = self.x[:n], self.v[:n], self.estado[:n]
+
+        desviado = est == c.DESVIADO
+        aterriza = ~desviado & (x <= v / 60 * c.DT)           # con este step llega al aeropuerto
+        aproxima = ~desviado & ~aterriza
+        venia_reinsertando = aproxima & (est == c.REINSERCION)
+        est[venia_reinsertando] = c.EN_FILA
+
+        # resolucion de aterrizajes: cierre, go-around por viento o aterrizaje confirmado
+        aterrizado = np.zeros(n, dtype=bool)
+        if aterriza.any():
+            est[aterriza] = c.INTENTO_ATERRIZAR
+            self.tiempo_estimado[:n][aterriza] = 0
+            if motivo_cierre is not None:  # no puede aterrizar: escape forzado y conteo por motivo
+                motivo = "tormenta" if motivo_cierre == "tormenta" else "cierre"
+                self._set_desviado(aterriza, motivo)
+                self.minutos_bloqueo[:n][aterriza] = minutos_hasta_apertura
+                clave = f"desvios_{motivo}"
+                eventos[clave] += int(aterriza.sum())
+            else:
+                goaround = np.zeros(n, dtype=bool)
+                if viento_activo:
+                    goaround[aterriza] = self.rng_goarounds.random(int(aterriza.sum())) < p_goaround
+                    self._set_desviado(goaround, "viento")
+                    eventos['desvios_viento'] += int(goaround.sum())
+                aterrizado = aterriza & ~goaround
+                est[aterrizado] = c.ATERRIZAJE_CONFIRMADO
+                eventos['aterrizados'] = list(zip(self.id[:n][aterrizado].tolist(),
+                                                  self.t_spawn[:n][aterrizado].tolist(),
+                                                  [ahora] * int(aterrizado.sum())))
+
+        # movimiento: los que se aproximan avanzan y los desviados retroceden
+        x_inicio = x.copy()
+        rango_antes = u.indice_rango_vec(x)
+        paso_mn = v / 60 * c.DT
+        x[aproxima] -= paso_mn[aproxima]
+        x[desviado] += paso_mn[desviado]
+
+        k = u.indice_rango_vec(x)
+        vmin, vmax = u.VMIN_RANGOS[k], u.VMAX_RANGOS[k]
+        cambio = aproxima & (k != rango_antes)                 # entra en un nuevo rango
+        con_metering = cambio & self.metering[:n]
+        v[con_metering] = np.clip(v[con_metering], vmin[con_metering], vmax[con_metering])
+        sorteo = cambio & ~self.metering[:n]
+        v[sorteo] = self.rng.uniform(vmin[sorteo], vmax[sorteo])
+
+        # chequeo de separacion contra el lider: el avion anterior mas cercano que sigue en el flujo de aproximacion
+        # (ya avanzo en este paso o acaba de aterrizar). los desviados, de antes o de este paso, no son lideres
+        self._resolver_lideres(np.flatnonzero(aproxima | aterrizado), aproxima, vmin, vmax)
+        desviados_ahora = aproxima & (est == c.DESVIADO)
+        self.tiempo_estimado[:n][desviados_ahora] = -1
+        self.motivo_desvio[:n][desviados_ahora] = c.MOTIVOS_DESVIO.index("congestion")
+        sigue = aproxima & ~desviados_ahora
+        self.tiempo_estimado[:n][sigue] = u.tiempo_estimado_arribo_vec(x[sigue], v[sigue])
+        eventos['reincerciones_exitosas'] = int((venia_reinsertando & (est == c.EN_FILA)).sum())
+
+        # desviados (los de antes de este paso): bloqueo y reinsercion en el gap entre los vecinos en la aproximacion
+        bloqueo = self.minutos_bloqueo[:n]
+        bloqueados = desviado & (bloqueo > 0)
+        bloqueo[bloqueados] = np.maximum(0, bloqueo[bloqueados] - c.DT)
+        candidatos = np.flatnonzero(desviado & ~bloqueados)
+        if candidatos.size:
+            self._reinsertar(candidatos, np.sort(x[sigue]), x_inicio)
+
+        # desviados que salen de las 100 mn se van a montevideo
+        salen = (est == c.DESVIADO) & (x > 100.0)
+        eventos['salidas_montevideo'] = int(salen.sum())
+        if eventos['salidas_montevideo']:
+            motivos = np.maximum(self.motivo_desvio[:n][salen], 0)
+            eventos['salidas'] = [(t, c.MOTIVOS_DESVIO[m]) for t, m in zip(self.t_spawn[:n][salen].tolist(), motivos.tolist())]
+
+        if aterrizado.any() or salen.any():
+            self._compactar(~(aterrizado | salen))
+        return eventos
+
+    # devuelve los aviones activos como tuplas (id, x, v, status) para inspeccion
+    def obtener_aviones(self) -> List[Tuple[int, float, float, str]]:
+        n = self.n
+        return [(int(i), float(x), float(v), c.ESTADOS[e])
+                for i, x, v, e in zip(self.id[:n], self.x[:n], self.v[:n], self.estado[:n])]
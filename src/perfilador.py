@@ -0,0 +1,92 @@
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+import tracemalloc
+
+try:
+    import resource  # no existe en windows
+except ImportError:
+    resource = None
+
+# fases de procesar_paso_temporal en el orden en que ocurren
+FASES = (
+    "llegadas",     # generar_nuevo_avion
+    "tormenta",     # desvio masivo al empezar una tormenta
+    "ordenamiento", # ordenar_aviones_por_distancia
+    "metering",     # Plane.apply_metering (por avion)
+    "movimiento",   # Plane.avanzar / retroceder (por avion), o MotorVectorizado.avanzar
+    "aterrizajes",  # resolucion de aterrizajes, go-arounds y salidas a montevideo (por avion)
+    "desvios",      # retroceso, reinsercion y salida a montevideo de los aviones desviados (por avion)
+    "remocion",     # sacar de la cola los aviones que salieron
+    "reloj",        # avance del reloj y cambios de dia
+)
+
+
+# memoria pico del proceso en mb (0 si la plataforma no lo informa)
+def memoria_pico_mb() -> float:
+    if tracemalloc.is_tracing(): # si alguien ya esta trazando, el pico de tracemalloc es mas preciso
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    if resource is None:
+        return 0.0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 2**20 if sys.platform == "darwin" else pico / 2**10  # macos informa bytes, linux kilobytes
+
+
+# acumula tiempo de pared y cantidad de llamadas por fase del paso temporal.
+# uso: t = perfil.marcar("fase", t) cierra la fase que empezo en t y devuelve el instante actual
+class PerfilFases:
+
+    def __init__(self) -> None:
+        self.segundos: Dict[str, float] = dict.fromkeys(FASES, 0.0)
+        self.llamadas: Dict[str, int] = dict.fromkeys(FASES, 0)
+        self.pasos = 0
+        self.max_aviones_activos = 0
+
+    # registra el inicio de un paso con n aviones activos y devuelve el instante actual
+    def inicio_paso(self, n_aviones: int) -> float:
+        self.pasos += 1
+        if n_aviones > self.max_aviones_activos:
+            self.max_aviones_activos = n_aviones
+        return time.perf_counter()
+
+    # suma el tiempo desde t0 a la fase y devuelve el instante actual (inicio de la fase siguiente)
+    def marcar(self, fase: str, t0: float) -> float:
+        ahora = time.perf_counter()
+        self.segundos[fase] += ahora - t0
+        self.llamadas[fase] += 1
+        return ahora
+
+    # resumen serializable: por fase segundos, llamadas y fraccion del total, mas picos
+    def resumen(self) -> dict:
+        total = sum(self.segundos.values())
+        return {
+            "fases": {fase: {"segundos": self.segundos[fase],
+                             "llamadas": self.llamadas[fase],
+                             "fraccion": self.segundos[fase] / total if total > 0 else 0.0}
+                      for fase in FASES},
+            "segundos_total": total,
+            "pasos": self.pasos,
+            "max_aviones_activos": self.max_aviones_activos,
+            "memoria_pico_mb": memoria_pico_mb(),
+        }
+
+
+# combina resumenes de varias replicas: suma tiempos, llamadas y pasos; toma el maximo de los picos
+def combinar_resumenes(resumenes: Iterable[dict]) -> Optional[dict]:
+    resumenes: List[dict] = [r for r in resumenes if r is not None]
+    if not resumenes:
+        return None
+    total = sum(r["segundos_total"] for r in resumenes)
+    fases = {}
+    for fase in FASES:
+        segundos = sum(r["fases"][fase]["segundos"] for r in resumenes)
+        fases[fase] = {"segundos": segundos,
+                       "llamadas": sum(r["fases"][fase]["llamadas"] for r in resumenes),
+                       "fraccion": segundos / total if total > 0 else 0.0}
+    return {
+        "fases": fases,
+        "segundos_total": total,
+        "pasos": sum(r["pasos"] for r in resumenes),
+        "max_aviones_activos": max(r["max_aviones_activos"] for r in resumenes),
+        "memoria_pico_mb": max(r["memoria_pico_mb"] for r in resumenes),
+    }
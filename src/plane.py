@@ -1,21 +1,55 @@
-from dataclasses import dataclass
-from typing import Literal, Optional, Tuple
+from typing import Literal, List, Optional, Tuple
 import utilidades as u
 import const as c
 
 Status = Literal["en_fila", "desacelerando", "reinsercion", "desviado", "aterrizaje_confirmado", "intento_aterrizar"]
-@dataclass
+_CODIGO_ESTADO = {nombre: codigo for codigo, nombre in enumerate(c.ESTADOS)}
+
+# avion compacto: __slots__ (sin __dict__ por instancia) y estado guardado como codigo entero (const.EN_FILA, ...).
+# status sigue disponible como string para viz.py y los tests
 class Plane:
-    id: int                                 # Id identificador
-    t_spawn: int                            # Minuto en el que aparecio
-    x: float = 100.0                        # Distancia al AEP en mn
-    v: float = 0.0                          # Velocidad del avion en nudos
-    status: Status = "en_fila"              # Estado del avion
-    tiempo_estimado: Optional[int] = None   # Estimacion simple de arribo en min
-    minutos_bloqueo:int = 0
-    t_landing: Optional[int] = None         # Minuto en el que aterrizo (si aterrizo)
-    sta_meter: Optional[float] = None
-    metering: bool = False
+    __slots__ = ("id", "t_spawn", "x", "v", "codigo_estado", "tiempo_estimado",
+                 "minutos_bloqueo", "t_landing", "sta_meter", "metering", "motivo_desvio", "aleatorio")
+
+    def __init__(self, id: int, t_spawn: int, x: float = 100.0, v: float = 0.0, status: Status = "en_fila",
+                 tiempo_estimado: Optional[int] = None, minutos_bloqueo: int = 0, t_landing: Optional[int] = None,
+                 sta_meter: Optional[float] = None, metering: bool = False) -> None:
+        self.reiniciar(id, t_spawn, x, v, status, tiempo_estimado, minutos_bloqueo, t_landing, sta_meter, metering)
+
+    # (re)inicializa todos los atributos, lo usa el pool para reciclar aviones que salieron del sistema
+    def reiniciar(self, id: int, t_spawn: int, x: float = 100.0, v: float = 0.0, status: Status = "en_fila",
+                  tiempo_estimado: Optional[int] = None, minutos_bloqueo: int = 0, t_landing: Optional[int] = None,
+                  sta_meter: Optional[float] = None, metering: bool = False) -> None:
+        self.id = id                                 # Id identificador
+        self.t_spawn = t_spawn                       # Minuto en el que aparecio
+        self.x = x                                   # Distancia al AEP en mn
+        self.v = v                                   # Velocidad del avion en nudos
+        self.status = status                         # Estado del avion (se guarda como codigo entero)
+        self.tiempo_estimado = tiempo_estimado       # Estimacion simple de arribo en min
+        self.minutos_bloqueo = minutos_bloqueo
+        self.t_landing = t_landing                   # Minuto en el que aterrizo (si aterrizo)
+        self.sta_meter = sta_meter
+        self.metering = metering
+        self.motivo_desvio = None                    # ultimo motivo de desvio (const.MOTIVOS_DESVIO)
+        self.aleatorio = None                        # BufferAleatorio de la simulacion (None = estado global de numpy)
+
+    # estado del avion como string
+    @property
+    def status(self) -> Status:
+        return c.ESTADOS[self.codigo_estado]
+
+    @status.setter
+    def status(self, valor: Status) -> None:
+        try:
+            self.codigo_estado = _CODIGO_ESTADO[valor]
+        except KeyError:
+            raise ValueError(f"estado desconocido: {valor!r}") from None
+
+    def __repr__(self) -> str:
+        return (f"Plane(id={self.id!r}, t_spawn={self.t_spawn!r}, x={self.x!r}, v={self.v!r}, "
+                f"status={self.status!r}, tiempo_estimado={self.tiempo_estimado!r}, "
+                f"minutos_bloqueo={self.minutos_bloqueo!r}, t_landing={self.t_landing!r}, "
+                f"sta_meter={self.sta_meter!r}, metering={self.metering!r}, motivo_desvio={self.motivo_desvio!r})")
 
     # velocidad maxima dada el rango en el que esta
     def max_speed(self) -> float:
@@ -45,22 +79,22 @@ class Plane:
 
     # setea velocidad aleatoria al avion respetando los limites del rango
     def set_speed(self) -> None:
+        if self.aleatorio is not None:
+            self.v = self.aleatorio.uniforme(self.min_speed(), self.max_speed())
+            return
         self.v = u.random_uniform(self.min_speed(),self.max_speed())
         return 
     
     # setea la maxima velocidad permitida en el rango al avion
     def set_max_speed(self) -> None:
         self.v = self.max_speed()
-        if self.status == "desacelerando": # si estaba desacelerando, vuelve al estado normal
-            self.status = "en_fila"
+        if self.codigo_estado == c.DESACELERANDO: # si estaba desacelerando, vuelve al estado normal
+            self.codigo_estado = c.EN_FILA
         return
 
     # devuleve el rango actual del avion en forma tupla (DistMin, DistMax)
     def rango_actual(self) -> Tuple[float, float]:
-        for dmin, dmax, _ in c.rangos:
-            if dmin <= self.x < dmax:
-                return (dmin, dmax)
-        return (c.rangos[-1][0], c.rangos[-1][1]) # fallback para cuando esta en rango (0, 5) 
+        return u.limites_rango(self.x) # por debajo de 0 usa el rango (0, 5)
 
     # verifica si el avion self esta a menos de 4 minutos de other
     def distancia_menor_4(self, other) -> bool:
@@ -88,39 +122,28 @@ class Plane:
         
         return tiempo_para_alcanzar > 5
 
-    # actualizacion de la estimacion de llegada
+    # actualizacion de la estimacion de llegada (tramos completos a vmax desde la tabla precalculada + tramo actual a v)
     def time_to_arrive(self) -> None:
-        lista_rangos = c.LISTA_RANGOS
-        rango_anterior = 0
-        tiempo_estimado = 0.0
-        for rango_actual in lista_rangos:
-            if self.x <= rango_actual:
-                tiempo_estimado += u.tiempo_min_para_mn(self.v,rango_actual-rango_anterior)
-                break
-            # calculo el tiempo que tardo en completar un rango entero, como es no inclucibe el maximo de los rangos uso el rango anterior para calcular la velocidad max
-            velocidad_de_ese_rango = u.velocidad_permitida(rango_anterior)[1]
-            tiempo_estimado += u.tiempo_min_para_mn(velocidad_de_ese_rango,rango_actual)
-            rango_anterior = rango_actual
-        self.tiempo_estimado = tiempo_estimado
+        self.tiempo_estimado = u.tiempo_estimado_arribo(self.x, self.v)
 
     # hace avanzar al avion, calcula nuevo rango y se fija si hay que desacelerar 
     def avanzar(self,other,third) -> None:
         
-        if self.status == "aterrizaje_confirmado": # si ya aterizo no hago nada
+        if self.codigo_estado == c.ATERRIZAJE_CONFIRMADO: # si ya aterizo no hago nada
             return
 
-        if self.x <= self.v/60 * c.DT and self.status != "desviado": # si con este step llega al aeropuerto termina
-            self.status = "intento_aterrizar"
+        if self.x <= self.v/60 * c.DT and self.codigo_estado != c.DESVIADO: # si con este step llega al aeropuerto termina
+            self.codigo_estado = c.INTENTO_ATERRIZAR
             self.tiempo_estimado = 0
             return
         
         
-        if self.status == "desviado": # si esta desviado retrocede en vez de avanzar y se fija si hay un gap de 10 min
+        if self.codigo_estado == c.DESVIADO: # si esta desviado retrocede en vez de avanzar y se fija si hay un gap de 10 min
             self.retroceder(other,third)
             return
 
-        if self.status == "reinsercion": # si estaba reinsertando, vuelve a la fila
-            self.status = "en_fila"
+        if self.codigo_estado == c.REINSERCION: # si estaba reinsertando, vuelve a la fila
+            self.codigo_estado = c.EN_FILA
         
         rango_antes = self.rango_actual() # rango antes de avanzar
         self.x -= self.v/60 * c.DT # nueva posicion
@@ -132,23 +155,23 @@ class Plane:
             else:
                 self.set_speed()
             
+        # other es el lider en el flujo de aproximacion de la simulacion: nunca es un avion desviado
         if (other is not None and 
-            other.status != "desviado" and 
             other.x < self.x and 
             self.distancia_menor_4(other)): # si esta a menos de 4 minutos de other, desacelera
             self.set_desacelerando(other)
             return
 
-        elif (self.status == "desacelerando" and 
+        elif (self.codigo_estado == c.DESACELERANDO and 
             (other is None or 
             other.x >= self.x or 
-            other.status == "desviado" or 
             self.distancia_mayor_5(other))):   # verificasi puede dejar de desacelerar y volver a velocidad máxima
             self.set_speed()
 
         self.time_to_arrive()       
     
-    # hace retroceder al avion desviado y evalua reinsercion
+    # hace retroceder al avion desviado y evalua reinsercion en el gap entre other (el avion en aproximacion
+    # inmediatamente adelante) y third (el de atras)
     def retroceder(self, other, third) -> None:
 
         self.x += (self.v / 60.0) * c.DT # nueva posición (se suma distancia porque se esta alejando del aeropuerto)
@@ -163,7 +186,7 @@ class Plane:
                 punto_medio = other.x + distancia_gap / 2.0
                 if other.x < self.x <= punto_medio and punto_medio > 5.0: # reinsertar si estoy antes del punto medio en el espacio entre los otros dos aviones
                     self.x = punto_medio
-                    self.status = "reinsercion"
+                    self.codigo_estado = c.REINSERCION
                     self.set_speed()
             return
 
@@ -173,7 +196,7 @@ class Plane:
                 punto_medio = other.x + distancia_gap / 2.0
                 if other.x < self.x <= punto_medio and punto_medio > 5.0:
                     self.x = punto_medio
-                    self.status = "reinsercion"
+                    self.codigo_estado = c.REINSERCION
                     self.set_speed()
     
     # setea el avion como desacelerando
@@ -189,20 +212,21 @@ class Plane:
             self.set_desviado()
         else:
             self.v = nueva_velocidad
-            self.status = "desacelerando"
+            self.codigo_estado = c.DESACELERANDO
             self.time_to_arrive()
     
-    #  funcion para desviar al avion
-    def set_desviado(self) -> None:
-        self.status = "desviado"
+    #  funcion para desviar al avion (por defecto por congestion, la simulacion indica viento/tormenta/cierre)
+    def set_desviado(self, motivo: str = "congestion") -> None:
+        self.codigo_estado = c.DESVIADO
         self.v = 200
         self.tiempo_estimado = -1 # -1 porque no se puede calcular cuanto va a tardar
+        self.motivo_desvio = motivo
     
     # aplica micro-ajuste de velocidad vs STA si el protocolo nuevo (ejercicio 7) está activo.
     def apply_metering(self, now_min: int):
         if not self.metering or self.sta_meter is None:
             return
-        if self.status in {"desviado", "aterrizado"}:
+        if self.codigo_estado in (c.DESVIADO, c.ATERRIZAJE_CONFIRMADO):
             return
         if self.x <= c.METER_POINT_MN:
             return
@@ -215,10 +239,29 @@ class Plane:
             new_v = self.v - c.METER_SPEED_STEP
             self.v = u.clamp(new_v, self.min_speed(), self.max_speed())
             if self.v < new_v + 1e-9:                        # bajó realmente
-                self.status = "desacelerando"
+                self.codigo_estado = c.DESACELERANDO
         elif error_min > deadband_min:                       # va tarde -> subir v
             new_v = self.v + c.METER_SPEED_STEP
             self.v = u.clamp(new_v, self.min_speed(), self.max_speed())
 
 
+# pool de objetos Plane: los aviones que salieron del sistema se devuelven con liberar y obtener los reutiliza
+class PoolAviones:
+
+    def __init__(self) -> None:
+        self._libres: List[Plane] = []
+
+    # devuelve un avion inicializado con los valores dados, reciclado si hay alguno libre
+    def obtener(self, id: int, t_spawn: int, **kwargs) -> Plane:
+        if self._libres:
+            avion = self._libres.pop()
+            avion.reiniciar(id, t_spawn, **kwargs)
+            return avion
+        return Plane(id, t_spawn, **kwargs)
+
+    # devuelve al pool un avion que ya no se usa
+    def liberar(self, avion: Plane) -> None:
+        self._libres.append(avion)
 
+    def __len__(self) -> int:
+        return len(self._libres)
@@ -1,9 +1,29 @@
 from dataclasses import dataclass
+import os
 from typing import Literal, Optional, List
 import numpy as np
 import utilidades as u
 import const as c
-from plane import Plane
+from plane import Plane, PoolAviones
+from motor_vectorizado import MotorVectorizado
+from cola_aviones import ColaAviones
+from estadisticas_online import AcumuladorOnline
+from perfilador import PerfilFases, combinar_resumenes
+from trayectorias import CIERRES, CONTADORES
+
+MOTORES = ("objetos", "vectorizado")
+
+# flujos aleatorios de la simulacion, uno por proposito y con clave fija: dos simulaciones con la misma semilla
+# consumen las mismas llegadas, velocidades iniciales, tormentas y go-arounds aunque difieran en otros
+# parametros (ej. metering), lo que permite comparaciones pareadas con numeros aleatorios comunes
+FLUJOS = ("llegadas", "velocidades_iniciales", "velocidades", "tormentas", "goarounds")
+
+# un generador por flujo, derivado de la semilla (int o SeedSequence) agregando el indice del flujo a su spawn_key
+def crear_flujos(semilla) -> dict:
+    if not isinstance(semilla, np.random.SeedSequence):
+        semilla = np.random.SeedSequence(semilla)
+    return {nombre: np.random.default_rng(np.random.SeedSequence(semilla.entropy, spawn_key=tuple(semilla.spawn_key) + (k,)))
+            for k, nombre in enumerate(FLUJOS)}
 
 @dataclass
 # clase principal para manejar la simulacion de monte carlo por dias
@@ -11,7 +31,8 @@ class Simulacion:
     lambda_param: float  # probabilidad de arribo por minuto
     dias_simulacion: int    # cantidad de dias a simular
 
-    aviones: List[Plane] = None  # lista de aviones en el sistema
+    aviones: ColaAviones = None  # aviones en aproximacion, ordenados por distancia (mas cerca primero)
+    aviones_en_desvio: ColaAviones = None  # aviones desviados que siguen dentro de las 100 mn, ordenados por distancia
     tiempo_actual: int = 350       # tiempo actual de la simulacion en minutos
     aviones_aterrizados: List[Plane] = None  # aviones que ya aterrizaron
     aviones_desviados: List[Plane] = None    # aviones que se fueron a montevideo
@@ -27,11 +48,56 @@ class Simulacion:
 
     enable_metering: bool = False
     _last_sta_meter: Optional[float] = None
+
+    motor: str = "objetos"                         # "objetos" (un Plane por avion, el mas rapido) o "vectorizado" (arreglos numpy, para contrastar)
+    _motor: Optional[MotorVectorizado] = None
+    _registros_aterrizaje: List[tuple] = None      # (id, t_spawn, t_landing) de los aterrizados (motor vectorizado o reciclando)
+    saltar_periodos_inactivos: bool = True         # adelantar el reloj de noche cuando no queda ningun avion
+    reciclar_aviones: bool = False                 # no guardar los Plane que salen: quedan registros compactos y el objeto vuelve al pool
+    _pool: Optional[PoolAviones] = None
+    modo_streaming: bool = False                   # memoria constante: tiempos y desvios van a acumuladores online, no se guardan listas
+    _acum_aterrizaje: Optional[AcumuladorOnline] = None
+    _acum_desvios: dict = None                     # motivo de desvio -> AcumuladorOnline del tiempo en el sistema hasta salir
+
+    semilla: Optional[int] = None                  # semilla de los generadores propios (None = se toma del estado global de numpy)
+    flujos: Optional[dict] = None                  # nombre de flujo (FLUJOS) -> np.random.Generator
+    _velocidades_iniciales: Optional[u.BufferAleatorio] = None  # velocidad al aparecer en las 100 mn
+    _velocidades: Optional[u.BufferAleatorio] = None   # sorteos de velocidad pre-sorteados en bloque
+    _goarounds: Optional[u.BufferAleatorio] = None     # sorteos de go-around pre-sorteados en bloque
+    _llegadas_dia: Optional[np.ndarray] = None         # llegadas por minuto del horario operativo del dia
+    _llegadas_clave: Optional[tuple] = None            # (dia, lambda) con los que se sortearon _llegadas_dia
+
+    perfilar: bool = False                         # medir tiempo y llamadas por fase de procesar_paso_temporal (ver obtener_perfil)
+    _perfil: Optional[PerfilFases] = None
+    grabador: Optional[object] = None              # trayectorias.GrabadorTrayectorias: graba los aviones al final de cada paso
     
     # inicializa las listas vacias al crear la simulacion
     def __post_init__(self) -> None:
+        if self.motor not in MOTORES:
+            raise ValueError(f"motor desconocido: {self.motor!r} (opciones: {', '.join(MOTORES)})")
+        if self.flujos is None:
+            if self.semilla is None: # la semilla sale del estado global, asi np.random.seed sigue haciendo reproducible la corrida
+                self.semilla = int(np.random.randint(0, 2**31 - 1))
+            self.flujos = crear_flujos(self.semilla)
+        if self.perfilar and self._perfil is None:
+            self._perfil = PerfilFases()
+        if self._velocidades is None:
+            self._velocidades_iniciales = u.BufferAleatorio(self.flujos["velocidades_iniciales"])
+            self._velocidades = u.BufferAleatorio(self.flujos["velocidades"])
+            self._goarounds = u.BufferAleatorio(self.flujos["goarounds"])
+        if self.motor == "vectorizado" and self._motor is None:
+            self._motor = self._crear_motor()
+        if self._registros_aterrizaje is None:
+            self._registros_aterrizaje = []
+        if self._pool is None:
+            self._pool = PoolAviones()
+        if self.modo_streaming:
+            self.reciclar_aviones = True
+            self._iniciar_acumuladores()
         if self.aviones is None:
-            self.aviones = []
+            self.aviones = ColaAviones()
+        if self.aviones_en_desvio is None:
+            self.aviones_en_desvio = ColaAviones()
         if self.aviones_aterrizados is None:
             self.aviones_aterrizados = []
         if self.aviones_desviados is None:
@@ -72,10 +138,10 @@ class Simulacion:
             return
         
         prob = self.storm_prob
-        has_storm = np.random.binomial(1, prob)
+        has_storm = self.flujos["tormentas"].binomial(1, prob)
         if has_storm == 1:
             max_ini = max(0, 1440 - self.storm_duracion_min)
-            self.storm_inicio_min = int(np.random.uniform(0, max_ini + 1))
+            self.storm_inicio_min = int(self.flujos["tormentas"].uniform(0, max_ini + 1))
         else:
             self.storm_inicio_min = None
 
@@ -101,22 +167,47 @@ class Simulacion:
         if not self.esta_aeropuerto_abierto() and self._motivo_cierre_actual(m) != "tormenta":
             return False
 
-        k = int(np.random.poisson(self.lambda_param)) # k llegadas en este minuto (poisson)
+        k = self._llegadas_del_minuto(m) # k llegadas en este minuto (poisson)
+        if self._motor is not None:
+            for _ in range(k):
+                vmin, vmax = u.velocidad_permitida(100.0)
+                self._motor.agregar(id=self.estadisticas['total_aviones'],
+                                    t_spawn=self.tiempo_actual,
+                                    v=self._velocidades_iniciales.uniforme(vmin, vmax),
+                                    sta_meter=self._calcular_sta_meter(100.0))
+                self.estadisticas['total_aviones'] += 1
+            return (k > 0)
+
         for _ in range(k):
-            nuevo_avion = Plane(
+            nuevo_avion = self._pool.obtener(
                 id=self.estadisticas['total_aviones'],
                 t_spawn=self.tiempo_actual,
                 status="en_fila"
             )
+            nuevo_avion.aleatorio = self._velocidades_iniciales
             nuevo_avion.set_speed()
+            nuevo_avion.aleatorio = self._velocidades # los cambios de velocidad posteriores salen de otro flujo
 
             self._asignar_sta_meter(nuevo_avion)
 
-            self.aviones.append(nuevo_avion)
+            self._cola().agregar(nuevo_avion)
             self.estadisticas['total_aviones'] += 1
 
         return (k > 0)
     
+    # llegadas poisson del minuto m: las de todo el horario operativo del dia se sortean juntas en una sola llamada
+    # (se vuelven a sortear si cambia el dia o lambda_param)
+    def _llegadas_del_minuto(self, m: int) -> int:
+        clave = (self.tiempo_actual // 1440, self.lambda_param)
+        if self._llegadas_clave != clave:
+            self._llegadas_dia = self.flujos["llegadas"].poisson(self.lambda_param, size=c.MINUTOS_CLOSE - c.MINUTOS_OPEN)
+            self._llegadas_clave = clave
+        return int(self._llegadas_dia[m - c.MINUTOS_OPEN])
+
+    # motor vectorizado que sortea con los flujos de la simulacion
+    def _crear_motor(self, capacidad: int = 64) -> MotorVectorizado:
+        return MotorVectorizado(capacidad=capacidad, rng=self.flujos["velocidades"], rng_goarounds=self.flujos["goarounds"])
+
     # cierra el día actual y prepara el siguiente (tormenta nueva, contadores de día, etc.)
     def _al_cambiar_de_dia(self) -> None:
         self.estadisticas['dias_completados'] = self.estadisticas.get('dias_completados', 0) + 1
@@ -128,9 +219,27 @@ class Simulacion:
 
         self._last_sta_meter = None
 
-    # ordena los aviones por distancia al aeropuerto (mas cerca primero)
+    # reparte los aviones entre el flujo de aproximacion y el de desvio segun su estado, cada uno ordenado por distancia
+    def _repartir_aviones(self, aviones) -> None:
+        aviones = sorted(aviones, key=lambda avion: avion.x)
+        self.aviones = ColaAviones(avion for avion in aviones if avion.codigo_estado != c.DESVIADO)
+        self.aviones_en_desvio = ColaAviones(avion for avion in aviones if avion.codigo_estado == c.DESVIADO)
+
+    # devuelve self.aviones como ColaAviones (si se asigno una lista comun, la reparte entre aproximacion y desvio)
+    def _cola(self) -> ColaAviones:
+        if not isinstance(self.aviones, ColaAviones) or not isinstance(self.aviones_en_desvio, ColaAviones):
+            self._repartir_aviones([*self.aviones, *(self.aviones_en_desvio or [])])
+        return self.aviones
+
+    # todos los aviones activos: primero los que se aproximan y despues los desviados
+    def aviones_en_sistema(self) -> List[Plane]:
+        return [*self.aviones, *self.aviones_en_desvio]
+
+    # ordena los aviones en aproximacion por distancia al aeropuerto (mas cerca primero), para una cola armada de
+    # afuera; procesar_paso_temporal no la usa: solo reubica los que se pasaron en el paso.
+    # el flujo de desvio no se desordena: todos retroceden a la misma velocidad
     def ordenar_aviones_por_distancia(self) -> None:
-        self.aviones.sort(key=lambda avion: avion.x, reverse=False)
+        self._cola().reordenar()
 
     # retorna la cantidad de minutos hasta que se reabra el aeropuerto
     def _minutos_hasta_apertura(self) -> int:
@@ -150,68 +259,211 @@ class Simulacion:
         return 0 
 
     # procesa un paso temporal de la simulacion
+    # con perfilar=True cada fase suma su tiempo en self._perfil (apagado solo cuesta un chequeo de None por fase)
     def procesar_paso_temporal(self) -> None:
+        if self._motor is not None:
+            self._procesar_paso_vectorizado()
+            return
+
+        perfil = self._perfil
+        if perfil is not None:
+            t = perfil.inicio_paso(self.cantidad_aviones_activos())
+        aproximacion = self._cola()
+        desvio = self.aviones_en_desvio
         m_actual = self.tiempo_actual % 1440
         motivo_ahora = self._motivo_cierre_actual(m_actual)
         motivo_antes = self._motivo_cierre_actual((m_actual - c.DT) % 1440)
         self.generar_nuevo_avion()
+        if perfil is not None:
+            t = perfil.marcar("llegadas", t)
         if motivo_ahora == "tormenta" and motivo_antes != "tormenta": # veo si hay tormenta y hago que todos los aviones vuelvan
             minutos_bloqueo = self._minutos_hasta_apertura()
-            for avion in self.aviones:
-                if avion.status in ("en_fila", "desacelerando", "reinsercion"):
-                    avion.set_desviado()
-                    avion.minutos_bloqueo = minutos_bloqueo  # bloquear reinserción hasta que abra
-                    self.estadisticas["desvios_tormenta"] += 1
-        
-        self.ordenar_aviones_por_distancia() # ordenar aviones por distancia
+            afectados = [avion for avion in aproximacion if avion.codigo_estado in (c.EN_FILA, c.DESACELERANDO, c.REINSERCION)]
+            for avion in afectados:
+                avion.set_desviado("tormenta")
+                avion.minutos_bloqueo = minutos_bloqueo  # bloquear reinserción hasta que abra
+                self.estadisticas["desvios_tormenta"] += 1
+            aproximacion.remover(afectados)
+            for avion in afectados:
+                desvio.agregar(avion)
+            if perfil is not None:
+                t = perfil.marcar("tormenta", t)
         
         aviones_a_remover = []
-        for i, avion in enumerate(self.aviones):
-            # determinar aviones adyacentes: como los aviones estan ordenados por distancia (mas cerca primero), 
-            # el avion de adelante es el que tiene indice menor (i-1), el avion de atras es el que tiene indice mayor (i+1)
-            avion_adelante = self.aviones[i-1] if i > 0 else None
-            avion_atras = self.aviones[i+1] if i < len(self.aviones)-1 else None
+        desviados_ahora = []  # pasan al flujo de desvio al final del paso (empiezan a retroceder en el siguiente)
+        desordenados = []     # los que quedaron mas cerca que alguno de adelante (lo pasaron): se reubican al final del paso
+        x_en_orden = -float("inf")  # distancia del ultimo avion que sigue en la aproximacion y quedo en orden
+        avion_adelante = None # lider: el ultimo avion de la aproximacion que sigue aproximandose (los desviados en este paso salen del flujo)
+        for i, avion in enumerate(aproximacion):
+            avion_atras = aproximacion[i+1] if i < len(aproximacion)-1 else None
 
             if self.enable_metering:
                 avion.apply_metering(self.tiempo_actual)
+                if perfil is not None:
+                    t = perfil.marcar("metering", t)
             
-            status_antes = avion.status
+            estado_antes = avion.codigo_estado
             avion.avanzar(avion_adelante, avion_atras) # hacer avanzar el avion
+            if perfil is not None:
+                t = perfil.marcar("movimiento", t)
             
-            if status_antes == "reinsercion" and avion.status == "en_fila": # verificar si hubo una reinsercion exitosa
+            if estado_antes == c.REINSERCION and avion.codigo_estado == c.EN_FILA: # verificar si hubo una reinsercion exitosa
                 self.estadisticas['reincerciones_exitosas'] += 1
 
-            if avion.status == "intento_aterrizar": # verificar si aterrizo
+            if avion.codigo_estado == c.INTENTO_ATERRIZAR: # verificar si aterrizo
                 m = self.tiempo_actual % 1440
                 motivo_cierre = self._motivo_cierre_actual(m)
                 if motivo_cierre is not None: # no puede aterrizar: forzá escape y contá por motivo
-                    avion.set_desviado()
+                    avion.set_desviado("tormenta" if motivo_cierre == "tormenta" else "cierre")
                     avion.minutos_bloqueo = self._minutos_hasta_apertura()
 
                     if motivo_cierre == "tormenta":
                         self.estadisticas["desvios_tormenta"] += 1
                     else:  # "horario"
                         self.estadisticas["desvios_cierre"] += 1
+                    desviados_ahora.append(avion)
 
-                elif self.viento_activo and np.random.binomial(1, self.p_goaround) == 1:
-                    avion.set_desviado()
+                elif self.viento_activo and self._goarounds.bernoulli(self.p_goaround):
+                    avion.set_desviado("viento")
                     self.estadisticas["desvios_viento"] += 1
+                    desviados_ahora.append(avion)
                 else:
                     aviones_a_remover.append(avion)
-                    self.aviones_aterrizados.append(avion)
                     self.estadisticas['aterrizados'] += 1
-                    avion.status = "aterrizaje_confirmado"
+                    avion.codigo_estado = c.ATERRIZAJE_CONFIRMADO
                     avion.t_landing = self.tiempo_actual  # registrar el tiempo de aterrizaje
-                    
-            elif avion.x > 100.0 and avion.status == "desviado": # verificar si se desvio a montevideo (sale de las 100mn)
+                    if self.modo_streaming:
+                        self._acum_aterrizaje.agregar(avion.t_landing - avion.t_spawn)
+                    elif self.reciclar_aviones:
+                        self._registros_aterrizaje.append((avion.id, avion.t_spawn, avion.t_landing))
+                    else:
+                        self.aviones_aterrizados.append(avion)
+                    avion_adelante = avion
+
+            elif avion.codigo_estado == c.DESVIADO: # desviado por congestion
+                desviados_ahora.append(avion)
+            else:
+                avion_adelante = avion
+                if avion.x < x_en_orden:
+                    desordenados.append(avion)
+                else:
+                    x_en_orden = avion.x
+            if perfil is not None:
+                t = perfil.marcar("aterrizajes", t)
+        
+        # remover de una pasada los que aterrizaron, se desviaron o quedaron fuera de orden; el resto sigue ordenado y
+        # los desordenados se reubican por busqueda binaria (antes de buscar gaps para reinsertar), sin ordenar la cola
+        aproximacion.remover(aviones_a_remover + desviados_ahora + desordenados)
+        for avion in desordenados:
+            aproximacion.agregar(avion)
+        if perfil is not None:
+            t = perfil.marcar("ordenamiento", t)
+
+        salen_del_desvio = []
+        for avion in desvio:
+            # la reinsercion se evalua contra los vecinos en la aproximacion (ya movida en este paso), no contra otros
+            # desviados; con bloqueo (tormenta, cierre) solo retrocede y no hace falta buscarlos
+            if avion.minutos_bloqueo > 0:
+                avion.retroceder(None, None)
+            else:
+                avion.retroceder(*aproximacion.vecinos(avion.x))
+
+            if avion.codigo_estado == c.REINSERCION: # vuelve a la aproximacion; los desviados siguientes ya lo ven en su gap
+                salen_del_desvio.append(avion)
+                aproximacion.agregar(avion)
+            elif avion.x > 100.0: # verificar si se desvio a montevideo (sale de las 100mn)
+                salen_del_desvio.append(avion)
                 aviones_a_remover.append(avion)
-                self.aviones_desviados.append(avion)
+                if self.modo_streaming:
+                    self._acum_desvios[avion.motivo_desvio or "congestion"].agregar(self.tiempo_actual - avion.t_spawn)
+                elif not self.reciclar_aviones:
+                    self.aviones_desviados.append(avion)
                 self.estadisticas['desviados'] += 1
                 self.estadisticas['desvios_a_montevideo'] += 1
-        
-        for avion in aviones_a_remover: # remover aviones que ya no estan en el sistema
-            self.aviones.remove(avion)
+            if perfil is not None:
+                t = perfil.marcar("desvios", t)
+
+        desvio.remover(salen_del_desvio)
+        for avion in desviados_ahora:
+            desvio.agregar(avion)
+        if self.reciclar_aviones:
+            for avion in aviones_a_remover:
+                self._pool.liberar(avion)
+        if perfil is not None:
+            t = perfil.marcar("remocion", t)
 
+        self._avanzar_reloj()
+        if perfil is not None:
+            perfil.marcar("reloj", t)
+        if self.grabador is not None:
+            self._grabar_paso()
+
+    # mismo paso temporal que procesar_paso_temporal pero delegando el movimiento de los aviones al motor vectorizado
+    def _procesar_paso_vectorizado(self) -> None:
+        perfil = self._perfil
+        if perfil is not None:
+            t = perfil.inicio_paso(self._motor.n)
+        m_actual = self.tiempo_actual % 1440
+        motivo_ahora = self._motivo_cierre_actual(m_actual)
+        motivo_antes = self._motivo_cierre_actual((m_actual - c.DT) % 1440)
+        self.generar_nuevo_avion()
+        if perfil is not None:
+            t = perfil.marcar("llegadas", t)
+        if motivo_ahora == "tormenta" and motivo_antes != "tormenta": # todos los aviones en aproximacion vuelven
+            self.estadisticas["desvios_tormenta"] += self._motor.desviar_por_tormenta(self._minutos_hasta_apertura())
+            if perfil is not None:
+                t = perfil.marcar("tormenta", t)
+
+        eventos = self._motor.avanzar(self.tiempo_actual,
+                                      motivo_cierre=motivo_ahora,
+                                      minutos_hasta_apertura=self._minutos_hasta_apertura(),
+                                      enable_metering=self.enable_metering,
+                                      viento_activo=self.viento_activo,
+                                      p_goaround=self.p_goaround)
+        if perfil is not None:
+            t = perfil.marcar("movimiento", t)
+
+        if self.modo_streaming:
+            self._acum_aterrizaje.agregar_muchos([t_landing - t_spawn for _, t_spawn, t_landing in eventos['aterrizados']])
+            for t_spawn, motivo in eventos['salidas']:
+                self._acum_desvios[motivo].agregar(self.tiempo_actual - t_spawn)
+        else:
+            self._registros_aterrizaje.extend(eventos['aterrizados'])
+        self.estadisticas['aterrizados'] += len(eventos['aterrizados'])
+        for clave in ('desvios_viento', 'desvios_tormenta', 'desvios_cierre', 'reincerciones_exitosas'):
+            self.estadisticas[clave] += eventos[clave]
+        self.estadisticas['desviados'] += eventos['salidas_montevideo']
+        self.estadisticas['desvios_a_montevideo'] += eventos['salidas_montevideo']
+        if perfil is not None:
+            t = perfil.marcar("aterrizajes", t)
+
+        self._avanzar_reloj()
+        if perfil is not None:
+            perfil.marcar("reloj", t)
+        if self.grabador is not None:
+            self._grabar_paso()
+
+    # pasa al grabador los aviones activos y los contadores al final del paso (ya con el reloj avanzado)
+    def _grabar_paso(self) -> None:
+        if self._motor is not None:
+            n = self._motor.n
+            columnas = {col: getattr(self._motor, col)[:n] for col in ("id", "x", "v", "estado", "tiempo_estimado", "sta_meter")}
+        else:
+            aviones = self.aviones_en_sistema()
+            columnas = {
+                "id": [avion.id for avion in aviones],
+                "x": [avion.x for avion in aviones],
+                "v": [avion.v for avion in aviones],
+                "estado": [avion.codigo_estado for avion in aviones],
+                "tiempo_estimado": [np.nan if avion.tiempo_estimado is None else avion.tiempo_estimado for avion in aviones],
+                "sta_meter": [np.nan if avion.sta_meter is None else avion.sta_meter for avion in aviones],
+            }
+        contadores = {clave: self.estadisticas[clave] for clave in CONTADORES if clave != "cierre"}
+        contadores["cierre"] = CIERRES.index(self._motivo_cierre_actual(self.tiempo_actual % 1440))
+        self.grabador.registrar(self.tiempo_actual, columnas, contadores)
+
+    # incrementa el tiempo y dispara el cambio de dia si corresponde
+    def _avanzar_reloj(self) -> None:
         prev_day_idx = int(self.tiempo_actual // 1440)
         
         self.tiempo_actual += c.DT # incrementar tiempo
@@ -222,30 +474,69 @@ class Simulacion:
         for _ in range(days_crossed):
             self._al_cambiar_de_dia()
 
-    # ejecuta la simulacion completa desde el inicio hasta el final
-    def ejecutar_simulacion_completa(self) -> None:
+    # si el aeropuerto esta cerrado por horario y no queda ningun avion, ningun paso hasta la apertura cambia nada:
+    # adelanta tiempo_actual directo a la apertura (sin pasarse de tiempo_limite) disparando los cambios de dia que cruce.
+    # devuelve True si salto
+    def _saltar_periodo_inactivo(self, tiempo_limite: int) -> bool:
+        if self.cantidad_aviones_activos() > 0:
+            return False
+        if self._motivo_cierre_actual(self.tiempo_actual % 1440) != "horario":
+            return False
+
+        destino = min(self.tiempo_actual + self._minutos_hasta_apertura(), tiempo_limite)
+        if destino <= self.tiempo_actual:
+            return False
+
+        prev_day_idx = int(self.tiempo_actual // 1440)
+        self.tiempo_actual = destino
+        for _ in range(max(0, int(destino // 1440) - prev_day_idx)):
+            self._al_cambiar_de_dia()
+        return True
+
+    # ejecuta la simulacion completa desde el inicio (o desde donde quedo, si se restauro un checkpoint) hasta el final.
+    # con ruta_checkpoint guarda el estado completo cada checkpoint_cada_dias dias, para poder reanudar si se corta
+    def ejecutar_simulacion_completa(self, ruta_checkpoint: Optional[str] = None, checkpoint_cada_dias: int = 1) -> None:
         print(f"iniciando simulacion con lambda={self.lambda_param}")
         print(f"dias a simular: {self.dias_simulacion}")
         
         tiempo_total_minutos = self.dias_simulacion * 1440
         
         while self.tiempo_actual < tiempo_total_minutos:
+            if self.saltar_periodos_inactivos and self._saltar_periodo_inactivo(tiempo_total_minutos):
+                continue
             self.procesar_paso_temporal()
             
             if self.tiempo_actual % 1440 == 0 and self.tiempo_actual > 0: # mostrar progreso cada dia
                 dia_completado = self.tiempo_actual // 1440
-                print(f"dia {dia_completado} completado, aviones activos: {len(self.aviones)}")
+                print(f"dia {dia_completado} completado, aviones activos: {self.cantidad_aviones_activos()}")
+                if ruta_checkpoint is not None and dia_completado % checkpoint_cada_dias == 0:
+                    self.guardar_checkpoint(ruta_checkpoint)
         
         self.calcular_estadisticas_finales() # calcular estadisticas finales
 
+    # guarda el estado completo de la simulacion en un checkpoint binario (ver checkpoint.py)
+    def guardar_checkpoint(self, ruta: str) -> None:
+        import checkpoint
+        checkpoint.guardar_checkpoint(self, ruta)
+
+    # continuaciones independientes del estado actual, una por cada dict de cambios (ver checkpoint.bifurcar);
+    # con numeros_comunes=True comparten el estado aleatorio
+    def bifurcar(self, *variantes: dict, numeros_comunes: bool = False) -> List["Simulacion"]:
+        import checkpoint
+        return checkpoint.bifurcar(self, list(variantes) or None, numeros_comunes=numeros_comunes)
+
+    # retorna la cantidad de aviones en el sistema, sin importar el motor
+    def cantidad_aviones_activos(self) -> int:
+        if self._motor is not None:
+            return self._motor.n
+        return len(self.aviones) + len(self.aviones_en_desvio)
+
     # calcula las estadisticas finales de la simulacion
     def calcular_estadisticas_finales(self) -> None:
-        if self.estadisticas['aterrizados'] > 0:
-            tiempos_aterrizaje = []
-            for avion in self.aviones_aterrizados:
-                tiempo_vuelo = avion.tiempo_total_vuelo() # usar el tiempo real de vuelo (t_landing - t_spawn) en lugar de tiempo_estimado
-                if tiempo_vuelo is not None:
-                    tiempos_aterrizaje.append(tiempo_vuelo)
+        if self.modo_streaming: # la media ya se fue acumulando en cada aterrizaje
+            self.estadisticas['tiempo_promedio_aterrizaje'] = self._acum_aterrizaje.media if self._acum_aterrizaje.n else 0
+        elif self.estadisticas['aterrizados'] > 0:
+            tiempos_aterrizaje = self.obtener_tiempos_aterrizaje() # usar el tiempo real de vuelo (t_landing - t_spawn) en lugar de tiempo_estimado
             
             if tiempos_aterrizaje:  # verificar que hay tiempos válidos
                 self.estadisticas['tiempo_promedio_aterrizaje'] = np.mean(tiempos_aterrizaje)
@@ -259,9 +550,37 @@ class Simulacion:
     # retorna un diccionario con las estadisticas de la simulacion
     def obtener_estadisticas(self) -> dict:
         return self.estadisticas.copy()
+
+    # retorna el perfil por fase (segundos, llamadas, fraccion), pasos, pico de aviones activos y memoria pico
+    def obtener_perfil(self) -> dict:
+        if self._perfil is None:
+            raise RuntimeError("obtener_perfil requiere perfilar=True")
+        return self._perfil.resumen()
     
+    # los aterrizajes quedan como registros (id, t_spawn, t_landing) en vez de objetos Plane
+    def _usa_registros(self) -> bool:
+        if self.modo_streaming:
+            raise RuntimeError("en modo_streaming no se guardan los aterrizajes individuales, usar obtener_resumen_streaming()")
+        return self._motor is not None or self.reciclar_aviones
+
+    # crea los acumuladores online del modo streaming
+    def _iniciar_acumuladores(self) -> None:
+        self._acum_aterrizaje = AcumuladorOnline()
+        self._acum_desvios = {motivo: AcumuladorOnline() for motivo in c.MOTIVOS_DESVIO}
+
+    # retorna el resumen de los acumuladores online (cantidad, media, varianza, min/max e histograma)
+    def obtener_resumen_streaming(self) -> dict:
+        if not self.modo_streaming:
+            raise RuntimeError("obtener_resumen_streaming requiere modo_streaming=True")
+        return {
+            'tiempo_aterrizaje': self._acum_aterrizaje.resumen(),
+            'desvios_por_motivo': {motivo: acum.resumen() for motivo, acum in self._acum_desvios.items()}
+        }
+
     # retorna una lista con los tiempos totales de vuelo de todos los aviones que aterrizaron
     def obtener_tiempos_aterrizaje(self) -> List[int]:
+        if self._usa_registros():
+            return [t_landing - t_spawn for _, t_spawn, t_landing in self._registros_aterrizaje]
         tiempos = []
         for avion in self.aviones_aterrizados:
             tiempo_vuelo = avion.tiempo_total_vuelo()
@@ -271,6 +590,9 @@ class Simulacion:
     
     # retorna una lista de diccionarios con detalles de cada aterrizaje
     def obtener_detalles_aterrizajes(self) -> List[dict]:
+        if self._usa_registros():
+            return [{'id': id, 't_spawn': t_spawn, 't_landing': t_landing, 'tiempo_total_vuelo': t_landing - t_spawn}
+                    for id, t_spawn, t_landing in self._registros_aterrizaje]
         detalles = []
         for avion in self.aviones_aterrizados:
             tiempo_vuelo = avion.tiempo_total_vuelo()
@@ -285,9 +607,18 @@ class Simulacion:
 
     # reinicia la simulacion a su estado inicial
     def reiniciar_simulacion(self) -> None:
-        self.aviones = []
+        self.aviones = ColaAviones()
+        self.aviones_en_desvio = ColaAviones()
         self.aviones_aterrizados = []
         self.aviones_desviados = []
+        self._registros_aterrizaje = []
+        if self.modo_streaming:
+            self._iniciar_acumuladores()
+        self._llegadas_clave = None
+        if self.perfilar:
+            self._perfil = PerfilFases()
+        if self._motor is not None:
+            self._motor = self._crear_motor()
         self.tiempo_actual = 0
         self.dia_actual = 1
         self.estadisticas = {
@@ -307,12 +638,16 @@ class Simulacion:
     def _asignar_sta_meter(self, avion: Plane):
         if not self.enable_metering:
             return
-        if avion.x <= c.METER_POINT_MN:
-            avion.metering = False
-            avion.sta_meter = None
-            return
+        sta = self._calcular_sta_meter(avion.x)
+        avion.sta_meter = sta
+        avion.metering  = sta is not None
+
+    # calcula la sta al meter point para un avion en x (None si no aplica metering) y la registra como ultima
+    def _calcular_sta_meter(self, x: float) -> Optional[float]:
+        if not self.enable_metering or x <= c.METER_POINT_MN:
+            return None
 
-        tmin = u.tiempo_min_vmax_a_punto(avion.x, c.METER_POINT_MN)
+        tmin = u.tiempo_min_vmax_a_punto(x, c.METER_POINT_MN)
         sta_cand = self.tiempo_actual + tmin
 
         if self._last_sta_meter is None:
@@ -320,11 +655,58 @@ class Simulacion:
         else:
             sta = max(sta_cand, self._last_sta_meter + c.METER_TARGET_SPACING_MIN)
 
-        avion.sta_meter = sta
-        avion.metering  = True
         self._last_sta_meter = sta
+        return sta
+
+# claves de estadisticas que se agregan entre replicas
+CLAVES_REPLICA = (
+    'total_aviones',
+    'aterrizados',
+    'desviados',
+    'tiempo_promedio_aterrizaje',
+    'desvios_a_montevideo',
+    'desvios_viento',
+    'desvios_tormenta',
+    'desvios_cierre',
+    'reincerciones_exitosas'
+)
+
+# semilla independiente de la replica i derivada de la semilla maestra (no depende de cuantos workers se usen)
+def _semilla_replica(semilla: int, i: int) -> np.random.SeedSequence:
+    return np.random.SeedSequence(semilla, spawn_key=(i,))
+
+# corre una replica con la configuracion dada y devuelve sus estadisticas (nivel modulo para poder usarla en un pool de procesos)
+def _ejecutar_replica(config: dict, semilla: Optional[np.random.SeedSequence] = None) -> dict:
+    sim = Simulacion(**config, semilla=semilla)
+    sim.ejecutar_simulacion_completa()
+    stats = sim.obtener_estadisticas()
+    resultado = {key: stats[key] for key in CLAVES_REPLICA}
+    if sim.perfilar:
+        resultado['perfil'] = sim.obtener_perfil()
+    return resultado
+
+# calcula promedio y error estandar de cada estadistica a partir de las estadisticas de cada replica
+def _agregar_estadisticas(estadisticas_replicas: List[dict]) -> dict:
+    estadisticas_promedio = {}
+    for key in CLAVES_REPLICA:
+        valores = [stats[key] for stats in estadisticas_replicas]
+        estadisticas_promedio[key] = {
+            'promedio': np.mean(valores),
+            'error_estandar': np.std(valores) / np.sqrt(len(valores)),
+            'valores': valores
+        }
+    if any('perfil' in stats for stats in estadisticas_replicas): # replicas perfiladas: tiempos sumados entre replicas
+        estadisticas_promedio['perfil'] = combinar_resumenes(stats.get('perfil') for stats in estadisticas_replicas)
+    return estadisticas_promedio
 
 # ejecuta multiples simulaciones y retorna estadisticas promedio
+# motor="replicas" avanza las replicas juntas en motores de matrices de hasta 512 replicas: con unas pocas decenas
+# cuesta lo mismo que correrlas una por una, con cientos es varias veces mas rapido (ver benchmarks.py)
+# con num_workers > 1 (o None = todos los nucleos) las replicas se reparten en un pool de procesos;
+# cada replica usa su propio stream derivado de la semilla maestra (sin semilla, la maestra sale del estado global),
+# asi el resultado no depende de la cantidad de workers.
+# con cache (un directorio, requiere semilla) las replicas ya calculadas del mismo escenario se leen de disco
+# y solo se calculan y agregan las que falten (ver cache_replicas.py)
 def ejecutar_multiples_simulaciones(lambda_param: float,
                                     dias_simulacion: int,
                                     num_simulaciones: int = 10,
@@ -333,70 +715,363 @@ def ejecutar_multiples_simulaciones(lambda_param: float,
                                     storm_activa: bool = False,
                                     storm_prob: float = 0.0,
                                     storm_duracion_min: int = 30,
-                                    enable_metering:bool = False) -> dict:
+                                    enable_metering:bool = False,
+                                    motor: str = "objetos",
+                                    num_workers: Optional[int] = 1,
+                                    semilla: Optional[int] = None,
+                                    perfilar: bool = False,
+                                    cache: Optional[str] = None) -> dict:
     print(f"ejecutando {num_simulaciones} simulaciones con lambda={lambda_param}")
-    
-    estadisticas_totales = {
-        'total_aviones': [],
-        'aterrizados': [],
-        'desviados': [],
-        'tiempo_promedio_aterrizaje': [],
-        'desvios_a_montevideo': [],
-        'desvios_viento': [],
-        'desvios_tormenta': [],
-        'desvios_cierre': [],
-        'reincerciones_exitosas': []
-    }
-    
-    for i in range(num_simulaciones):
-        print(f"simulacion {i+1}/{num_simulaciones}")
-        sim = Simulacion(
-            lambda_param=lambda_param,
-            dias_simulacion=dias_simulacion,
-            viento_activo=viento_activo,
-            p_goaround=p_goaround,
-            storm_activa=storm_activa,
-            storm_prob=storm_prob,
-            storm_duracion_min=storm_duracion_min,
-            enable_metering=enable_metering
-        )
-        sim.ejecutar_simulacion_completa()
-        
-        stats = sim.obtener_estadisticas()
-        for key in estadisticas_totales:
-            estadisticas_totales[key].append(stats[key])
-    
-    estadisticas_promedio = {} # calcular promedios y errores
-    for key, valores in estadisticas_totales.items():
-        estadisticas_promedio[key] = {
-            'promedio': np.mean(valores),
-            'error_estandar': np.std(valores) / np.sqrt(len(valores)),
-            'valores': valores
+    if cache is not None:
+        if semilla is None:
+            raise ValueError("cache requiere una semilla: sin ella las replicas no se pueden reproducir")
+        if motor == "replicas" or perfilar:
+            raise ValueError("cache no esta disponible con motor='replicas' (sus replicas dependen del tamano de bloque) ni con perfilar")
+
+    if motor == "replicas": # todas las replicas juntas en matrices (replica x avion), ver motor_replicas.py
+        if perfilar:
+            raise ValueError("perfilar no esta disponible con motor='replicas'")
+        from motor_replicas import simular_replicas
+        estadisticas_replicas = simular_replicas(num_simulaciones, dias_simulacion, semilla=semilla,
+                                                 num_workers=num_workers, lambda_param=lambda_param,
+                                                 viento_activo=viento_activo, p_goaround=p_goaround,
+                                                 storm_activa=storm_activa, storm_prob=storm_prob,
+                                                 storm_duracion_min=storm_duracion_min, enable_metering=enable_metering)
+        return _agregar_estadisticas(estadisticas_replicas)
+
+    config = dict(
+        lambda_param=lambda_param,
+        dias_simulacion=dias_simulacion,
+        viento_activo=viento_activo,
+        p_goaround=p_goaround,
+        storm_activa=storm_activa,
+        storm_prob=storm_prob,
+        storm_duracion_min=storm_duracion_min,
+        enable_metering=enable_metering,
+        motor=motor,
+        perfilar=perfilar
+    )
+
+    if cache is not None:
+        return _agregar_estadisticas(_replicas_con_cache(cache, config, semilla, num_simulaciones, num_workers))
+
+    if semilla is None: # sin semilla explicita, la maestra sale del estado global (respeta np.random.seed)
+        semilla = int(np.random.randint(0, 2**31 - 1))
+    semillas = [_semilla_replica(semilla, i) for i in range(num_simulaciones)]
+
+    if num_workers == 1:
+        estadisticas_replicas = []
+        for i in range(num_simulaciones):
+            print(f"simulacion {i+1}/{num_simulaciones}")
+            estadisticas_replicas.append(_ejecutar_replica(config, semillas[i]))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            estadisticas_replicas = list(pool.map(_ejecutar_replica, [config] * num_simulaciones, semillas))
+
+    return _agregar_estadisticas(estadisticas_replicas)
+
+# corre una replica por cada (config, semilla), secuencial o repartidas en un unico pool de procesos
+def _ejecutar_replicas(configs: List[dict], semillas: list, num_workers: Optional[int]) -> List[dict]:
+    if num_workers == 1:
+        return list(map(_ejecutar_replica, configs, semillas))
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+        tamano_lote = max(1, len(configs) // (4 * (num_workers or os.cpu_count() or 1)))
+        return list(pool.map(_ejecutar_replica, configs, semillas, chunksize=tamano_lote))
+
+# primeras num_simulaciones replicas del escenario: las guardadas en el cache y las que falten, que se calculan
+# (con las mismas semillas derivadas que una corrida sin cache) y se agregan al cache
+def _replicas_con_cache(ruta: str, config: dict, semilla: int, num_simulaciones: int,
+                        num_workers: Optional[int]) -> List[dict]:
+    from cache_replicas import CacheReplicas
+    almacen = CacheReplicas(ruta)
+    clave = {k: v for k, v in config.items() if k != 'perfilar'}
+    guardadas = almacen.cantidad(clave, semilla)
+    faltantes = range(guardadas, num_simulaciones)
+    print(f"cache: {min(guardadas, num_simulaciones)} replicas guardadas, {len(faltantes)} a calcular")
+    if len(faltantes):
+        nuevas = _ejecutar_replicas([config] * len(faltantes), [_semilla_replica(semilla, i) for i in faltantes], num_workers)
+        almacen.agregar(clave, semilla, nuevas)
+    return almacen.replicas(clave, semilla, num_simulaciones)
+
+# corre replicas en lotes hasta que el error estandar de cada estadistica en error_objetivo quede por debajo
+# de su objetivo (ej. {'tiempo_promedio_aterrizaje': 0.5, 'desviados': 1.0}), o hasta que se agote
+# presupuesto_segundos de tiempo de pared, o se llegue a max_simulaciones. el tamano del lote siguiente se estima
+# con n * (error / objetivo)^2. la replica i siempre usa la misma semilla derivada, asi el resultado no depende
+# del tamano de los lotes ni de la cantidad de workers (el pool de procesos se reutiliza entre lotes)
+def ejecutar_simulaciones_adaptativas(error_objetivo: dict,
+                                      presupuesto_segundos: Optional[float] = None,
+                                      min_simulaciones: int = 4,
+                                      max_simulaciones: int = 1000,
+                                      tamano_lote: Optional[int] = None,
+                                      num_workers: Optional[int] = 1,
+                                      semilla: Optional[int] = None,
+                                      **config) -> dict:
+    import time
+    desconocidas = set(error_objetivo) - set(CLAVES_REPLICA)
+    if desconocidas:
+        raise ValueError(f"estadisticas desconocidas en error_objetivo: {sorted(desconocidas)}")
+    if min_simulaciones < 2: # con una sola replica el error estandar da 0 y cualquier objetivo pareceria cumplido
+        raise ValueError("min_simulaciones debe ser al menos 2 para estimar el error estandar")
+    if max_simulaciones < min_simulaciones:
+        raise ValueError("max_simulaciones no puede ser menor que min_simulaciones")
+    if config.get('motor') == "replicas":
+        raise ValueError("ejecutar_simulaciones_adaptativas no esta disponible con motor='replicas' "
+                         "(corre replica por replica; usar motor='objetos' o 'vectorizado')")
+    if semilla is None:
+        semilla = int(np.random.randint(0, 2**31 - 1))
+    if tamano_lote is None:
+        tamano_lote = 4 if num_workers == 1 else 2 * (num_workers or os.cpu_count() or 1)
+
+    pool = None
+    if num_workers != 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=num_workers)
+
+    inicio = time.perf_counter()
+    estadisticas_replicas = []
+    lote = max(min_simulaciones, tamano_lote)
+    try:
+        while True:
+            lote = min(lote, max_simulaciones - len(estadisticas_replicas))
+            configs = [config] * lote
+            semillas = [_semilla_replica(semilla, i) for i in range(len(estadisticas_replicas), len(estadisticas_replicas) + lote)]
+            if pool is None:
+                estadisticas_replicas.extend(map(_ejecutar_replica, configs, semillas))
+            else:
+                estadisticas_replicas.extend(pool.map(_ejecutar_replica, configs, semillas))
+
+            n = len(estadisticas_replicas)
+            errores = {key: float(np.std([stats[key] for stats in estadisticas_replicas]) / np.sqrt(n))
+                       for key in error_objetivo}
+            print(f"{n} simulaciones: " + ", ".join(f"{key} ee={errores[key]:.4g}" for key in error_objetivo))
+
+            if all(errores[key] <= error_objetivo[key] for key in error_objetivo):
+                motivo_fin = "precision"
+                break
+            if n >= max_simulaciones:
+                motivo_fin = "maximo"
+                break
+            if presupuesto_segundos is not None and time.perf_counter() - inicio >= presupuesto_segundos:
+                motivo_fin = "presupuesto"
+                break
+
+            necesarias = max(n * (errores[key] / error_objetivo[key]) ** 2 if error_objetivo[key] > 0 else 2 * n
+                             for key in error_objetivo)
+            lote = int(np.clip(np.ceil(necesarias) - n, tamano_lote, max(tamano_lote, n))) # a lo sumo duplica
+            if presupuesto_segundos is not None: # no arrancar un lote que seguro no entra en lo que queda del presupuesto
+                segundos_por_replica = (time.perf_counter() - inicio) / n
+                restante = presupuesto_segundos - (time.perf_counter() - inicio)
+                paralelismo = 1 if pool is None else (num_workers or os.cpu_count() or 1)
+                lote = max(1, min(lote, int(restante * paralelismo / segundos_por_replica)))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    resultado = _agregar_estadisticas(estadisticas_replicas)
+    resultado['num_simulaciones'] = len(estadisticas_replicas)
+    resultado['motivo_fin'] = motivo_fin
+    resultado['segundos'] = time.perf_counter() - inicio
+    resultado['precision'] = {key: {'error_estandar': errores[key],
+                                    'objetivo': error_objetivo[key],
+                                    'alcanzado': errores[key] <= error_objetivo[key]}
+                              for key in error_objetivo}
+    return resultado
+
+# arma la lista de escenarios con el producto cartesiano de los valores dados por parametro
+# ej: grilla_escenarios(lambda_param=[0.05, 0.1], enable_metering=[False, True]) -> 4 escenarios
+def grilla_escenarios(**valores_por_parametro) -> List[dict]:
+    import itertools
+    nombres = list(valores_por_parametro)
+    return [dict(zip(nombres, combinacion))
+            for combinacion in itertools.product(*(valores_por_parametro[n] for n in nombres))]
+
+# barrido de parametros: corre todas las (escenario, replica) en un unico pool de procesos y devuelve una tabla columnar
+# (dict de listas) con una fila por escenario y promedio/error estandar de cada estadistica.
+# la replica i de cada escenario usa la misma semilla derivada, asi cada fila coincide con
+# ejecutar_multiples_simulaciones(**escenario, semilla=semilla) y los escenarios comparten numeros aleatorios
+def barrido_parametros(escenarios: List[dict],
+                       num_simulaciones=10,
+                       num_workers: Optional[int] = None,
+                       semilla: Optional[int] = None,
+                       **config_base) -> dict:
+    if isinstance(num_simulaciones, int):
+        num_simulaciones = [num_simulaciones] * len(escenarios)
+    if len(num_simulaciones) != len(escenarios):
+        raise ValueError("num_simulaciones debe ser un entero o una lista con un valor por escenario")
+    if semilla is None:
+        semilla = int(np.random.randint(0, 2**31 - 1))
+
+    configs = [{**config_base, **escenario} for escenario in escenarios]
+    trabajos = [(s, i) for s, n in enumerate(num_simulaciones) for i in range(n)]
+    print(f"barrido de {len(escenarios)} escenarios, {len(trabajos)} simulaciones en total")
+
+    resultados = _ejecutar_replicas([configs[s] for s, _ in trabajos],
+                                    [_semilla_replica(semilla, i) for _, i in trabajos], num_workers)
+
+    por_escenario = [[] for _ in escenarios]
+    for (s, _), stats in zip(trabajos, resultados):
+        por_escenario[s].append(stats)
+
+    parametros = []  # columnas de parametros en orden de aparicion
+    for config in configs:
+        parametros.extend(p for p in config if p not in parametros)
+
+    tabla = {p: [config.get(p) for config in configs] for p in parametros}
+    tabla['num_simulaciones'] = list(num_simulaciones)
+    agregados = [_agregar_estadisticas(stats) for stats in por_escenario]
+    for key in CLAVES_REPLICA:
+        tabla[f'{key}_promedio'] = [float(a[key]['promedio']) for a in agregados]
+        tabla[f'{key}_error_estandar'] = [float(a[key]['error_estandar']) for a in agregados]
+    return tabla
+
+# cuanto se reduce la varianza al parear (inf si la diferencia pareada no varia, nan si ninguna varia)
+def _cociente_varianzas(varianza_independiente: float, varianza_pareada: float) -> float:
+    if varianza_pareada > 0:
+        return float(varianza_independiente / varianza_pareada)
+    return float('inf') if varianza_independiente > 0 else float('nan')
+
+# experimento pareado con numeros aleatorios comunes: la replica i de la base y de la variante usan la misma semilla,
+# asi consumen las mismas llegadas, velocidades iniciales, tormentas y go-arounds (ver FLUJOS) y la diferencia
+# por replica solo refleja el efecto del cambio. por defecto compara sin y con metering.
+# devuelve por estadistica la diferencia media (variante - base), su error estandar pareado y el que
+# tendria la misma diferencia con corridas independientes (reduccion_varianza = cociente de varianzas)
+def comparacion_pareada(num_simulaciones: int = 10,
+                        base: Optional[dict] = None,
+                        variante: Optional[dict] = None,
+                        num_workers: Optional[int] = 1,
+                        semilla: Optional[int] = None,
+                        **config) -> dict:
+    base = {"enable_metering": False} if base is None else base
+    variante = {"enable_metering": True} if variante is None else variante
+    if semilla is None:
+        semilla = int(np.random.randint(0, 2**31 - 1))
+    print(f"comparacion pareada con {num_simulaciones} pares de simulaciones: {base} vs {variante}")
+
+    configs = [{**config, **base}, {**config, **variante}] * num_simulaciones
+    semillas = [_semilla_replica(semilla, i) for i in range(num_simulaciones) for _ in range(2)]
+    resultados = _ejecutar_replicas(configs, semillas, num_workers)
+    stats_base, stats_variante = resultados[0::2], resultados[1::2]
+
+    comparacion = {'num_simulaciones': num_simulaciones, 'semilla': semilla}
+    for key in CLAVES_REPLICA:
+        valores_base = np.array([stats[key] for stats in stats_base], dtype=float)
+        valores_variante = np.array([stats[key] for stats in stats_variante], dtype=float)
+        diferencias = valores_variante - valores_base
+        varianza_pareada = np.var(diferencias, ddof=1) if num_simulaciones > 1 else float('nan')
+        varianza_independiente = (np.var(valores_base, ddof=1) + np.var(valores_variante, ddof=1)
+                                  if num_simulaciones > 1 else float('nan'))
+        comparacion[key] = {
+            'promedio_base': float(valores_base.mean()),
+            'promedio_variante': float(valores_variante.mean()),
+            'diferencia_promedio': float(diferencias.mean()),
+            'error_estandar': float(np.sqrt(varianza_pareada / num_simulaciones)),
+            'error_estandar_independiente': float(np.sqrt(varianza_independiente / num_simulaciones)),
+            'reduccion_varianza': _cociente_varianzas(varianza_independiente, varianza_pareada),
+            'diferencias': diferencias.tolist()
         }
-    
-    return estadisticas_promedio
+    return comparacion
 
-# estima p{x=5} en 1 hora con x~poisson(lambda_param*60)
-def estimar_probabilidad_5_aviones_en_1_hora(lambda_param: float, num_simulaciones: int = 1000) -> dict:
-    print(f"estimando probabilidad de 5 aviones en 1 hora con lambda={lambda_param}")
+# pmf poisson teorica de 0..k_max para cada media mu (ultimo eje = k), en escala log para que no se anule con mu grande
+def _pmf_poisson(mu: np.ndarray, k_max: int) -> np.ndarray:
+    j = np.arange(1, k_max + 1)
+    with np.errstate(divide='ignore'):
+        log_pasos = np.log(mu)[..., None] - np.log(j) # log(mu / j): p(j) = p(j-1) * mu / j
+    log_pmf = np.concatenate([np.zeros(mu.shape + (1,)), np.cumsum(log_pasos, axis=-1)], axis=-1) - mu[..., None]
+    return np.exp(log_pmf)
 
-    lambda_60 = lambda_param * 60.0 # tasa por hora
+# estima la distribucion del conteo de arribos X~poisson(lambda*ventana) para cada combinacion de lambdas (por minuto)
+# y ventanas (en minutos) a la vez: P(X=k), P(X>=k) simuladas y teoricas para cada k pedido, con forma
+# (lambda, ventana, k). los conteos se sortean como una sola operacion broadcast por lote y se acumulan en un
+# histograma por (lambda, ventana) con bins 0..k_max y uno final para X > k_max, asi la memoria no crece con
+# num_simulaciones. histograma=True devuelve tambien el histograma simulado (frecuencias) y el teorico;
+# muestras=True devuelve ademas los conteos crudos (lambda, ventana, num_simulaciones)
+def estimar_conteos_poisson(lambdas,
+                            ventanas=60,
+                            k=5,
+                            num_simulaciones: int = 1000,
+                            k_max: Optional[int] = None,
+                            histograma: bool = False,
+                            muestras: bool = False,
+                            semilla: Optional[int] = None,
+                            tamano_lote: int = 1 << 22) -> dict:
+    lambdas = np.atleast_1d(np.asarray(lambdas, dtype=float))
+    ventanas = np.atleast_1d(np.asarray(ventanas, dtype=float))
+    ks = np.atleast_1d(np.asarray(k, dtype=np.int64))
+    if (lambdas < 0).any() or (ventanas < 0).any() or (ks < 0).any():
+        raise ValueError("lambdas, ventanas y k tienen que ser no negativos")
+    if lambdas.ndim != 1 or ventanas.ndim != 1 or ks.ndim != 1:
+        raise ValueError("lambdas, ventanas y k tienen que ser escalares o listas")
+    if semilla is None: # sin semilla explicita sale del estado global (respeta np.random.seed)
+        semilla = int(np.random.randint(0, 2**31 - 1))
+    rng = np.random.default_rng(semilla)
 
-    conteos_por_hora = np.random.poisson(lam=lambda_60, size=num_simulaciones) # simulación vectorizada: num_simulaciones horas
+    media = lambdas[:, None] * ventanas[None, :] # (lambda, ventana)
+    if k_max is None: # cubre k y practicamente toda la masa de la distribucion
+        mu_max = float(media.max())
+        k_max = int(np.ceil(mu_max + 8 * np.sqrt(mu_max))) + 10
+    k_max = max(int(k_max), int(ks.max()))
 
-    probabilidad_simulada = float(np.mean(conteos_por_hora == 5)) # prob simulada de exactamente 5
+    celdas = media.size
+    desplazamiento = np.arange(celdas).reshape(media.shape + (1,)) * (k_max + 2) # cada (lambda, ventana) con sus propios bins
+    frecuencias = np.zeros(celdas * (k_max + 2), dtype=np.int64)
+    conteos = np.empty(media.shape + (num_simulaciones,), dtype=np.int64) if muestras else None
+    por_lote = max(1, tamano_lote // max(1, celdas))
+    for inicio in range(0, num_simulaciones, por_lote):
+        fin = min(inicio + por_lote, num_simulaciones)
+        lote = rng.poisson(media[..., None], size=media.shape + (fin - inicio,))
+        frecuencias += np.bincount((desplazamiento + np.minimum(lote, k_max + 1)).ravel(), minlength=frecuencias.size)
+        if muestras:
+            conteos[..., inicio:fin] = lote
+    frecuencias = frecuencias.reshape(media.shape + (k_max + 2,))
 
-    import math
-    probabilidad_teorica = (lambda_60**5 * np.exp(-lambda_60)) / math.factorial(5) # prob teórica poisson
+    pmf_simulada = frecuencias / max(num_simulaciones, 1)
+    al_menos_simulada = np.cumsum(pmf_simulada[..., ::-1], axis=-1)[..., ::-1] # P(X>=j) sumando la cola
+    pmf_teorica = _pmf_poisson(media, k_max)
+    pmf_teorica = np.concatenate([pmf_teorica, np.clip(1 - pmf_teorica.sum(axis=-1, keepdims=True), 0, None)], axis=-1)
+    al_menos_teorica = np.clip(np.cumsum(pmf_teorica[..., ::-1], axis=-1)[..., ::-1], 0, 1)
+
+    probabilidad_simulada = pmf_simulada[..., ks]
+    resultado = {
+        'lambdas': lambdas,
+        'ventanas': ventanas,
+        'k': ks,
+        'media': media,
+        'num_simulaciones': num_simulaciones,
+        'probabilidad_simulada': probabilidad_simulada,
+        'probabilidad_teorica': pmf_teorica[..., ks],
+        'error_estandar': np.sqrt(probabilidad_simulada * (1 - probabilidad_simulada) / max(num_simulaciones, 1)),
+        'probabilidad_al_menos_simulada': al_menos_simulada[..., ks],
+        'probabilidad_al_menos_teorica': al_menos_teorica[..., ks],
+    }
+    if histograma: # bins 0..k_max y el ultimo para X > k_max
+        resultado['histograma'] = frecuencias
+        resultado['histograma_teorico'] = pmf_teorica
+    if muestras:
+        resultado['conteos'] = conteos
+    return resultado
+
+# estima p{x=5} en 1 hora con x~poisson(lambda_param*60) (caso particular de estimar_conteos_poisson).
+# con incluir_conteos=False no se devuelve la lista de conteos de cada hora simulada
+def estimar_probabilidad_5_aviones_en_1_hora(lambda_param: float, num_simulaciones: int = 1000,
+                                             incluir_conteos: bool = True) -> dict:
+    print(f"estimando probabilidad de 5 aviones en 1 hora con lambda={lambda_param}")
+
+    estimacion = estimar_conteos_poisson(lambda_param, 60, 5, num_simulaciones, muestras=incluir_conteos)
+    probabilidad_simulada = float(estimacion['probabilidad_simulada'][0, 0, 0])
+    probabilidad_teorica = float(estimacion['probabilidad_teorica'][0, 0, 0])
 
     if probabilidad_teorica > 0: # error relativo (cuida división por cero por si lambda_60=0)
         error_relativo = abs(probabilidad_simulada - probabilidad_teorica) / probabilidad_teorica
     else:
         error_relativo = 0.0 if probabilidad_simulada == 0.0 else float('inf')
 
-    return {
+    resultado = {
         'probabilidad_simulada': probabilidad_simulada,
         'probabilidad_teorica': probabilidad_teorica,
         'error_relativo': error_relativo,
-        'conteos_por_hora': conteos_por_hora.tolist(),
-    }
\ No newline at end of file
+    }
+    if incluir_conteos:
+        resultado['conteos_por_hora'] = estimacion['conteos'][0, 0].tolist()
+    return resultado
@@ -0,0 +1,187 @@
+"""
+simulacion corriendo en un hilo aparte, para que los pasos de simulacion no se hagan dentro del callback de dibujo
+
+el hilo trabajador es el unico que toca la Simulacion: avanza a la velocidad pedida y publica instantaneas
+inmutables en una cola de tamaño 1 (si la interfaz no consumio la anterior, se reemplaza). la interfaz solo
+lee la instantanea mas nueva y manda mensajes de control (pausa, velocidad, reinicio, detener)
+
+ojo: con el motor por defecto ("objetos") cada paso es un bucle de python sobre los Plane, asi que el hilo
+tiene el GIL casi todo el tiempo y compite con los callbacks de matplotlib; el hilo desacopla el ritmo de
+la simulacion del de los cuadros, pero no suma paralelismo. se eligio igual un hilo y no un proceso porque
+la Simulacion y los controles quedan en memoria compartida y las instantaneas no hay que serializarlas
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from sim_core import Simulacion
+
+
+# columnas (id, x, v, estado) de los aviones activos de la simulacion, como copias de solo lectura
+def columnas_aviones(sim: Simulacion) -> Dict[str, np.ndarray]:
+    motor = sim._motor
+    if motor is not None:
+        n = motor.n
+        columnas = {'id': motor.id[:n].copy(), 'x': motor.x[:n].copy(), 'v': motor.v[:n].copy(),
+                    'estado': motor.estado[:n].copy()}
+    else:
+        aviones = sim.aviones_en_sistema()
+        n = len(aviones)
+        columnas = {'id': np.fromiter((a.id for a in aviones), dtype=np.int64, count=n),
+                    'x': np.fromiter((a.x for a in aviones), dtype=float, count=n),
+                    'v': np.fromiter((a.v for a in aviones), dtype=float, count=n),
+                    'estado': np.fromiter((a.codigo_estado for a in aviones), dtype=np.int8, count=n)}
+    for arreglo in columnas.values():
+        arreglo.setflags(write=False)
+    return columnas
+
+
+@dataclass(frozen=True)
+# estado de la simulacion al final de un paso, tal como lo ve la interfaz
+class Instantanea:
+    numero: int                                     # cuenta de instantaneas publicadas
+    reinicio: int                                   # reinicios aplicados a la simulacion al publicarla
+    tiempo_actual: int
+    columnas: Dict[str, np.ndarray]                 # aviones activos
+    anteriores: Optional[Dict[str, np.ndarray]]     # aviones antes del ultimo paso (para interpolar), None si no hay
+    estadisticas: dict
+    motivo_cierre: Optional[str]
+    storm_inicio_min: Optional[int]
+    terminada: bool                                 # la simulacion llego al ultimo dia
+    publicada: float                                # time.perf_counter() al publicarla
+
+
+# hilo que corre la simulacion a velocidad_multiplier pasos cada intervalo_base segundos
+class TrabajadorSimulacion(threading.Thread):
+
+    def __init__(self, sim: Simulacion, intervalo_base: float = 0.5, max_pasos_por_publicacion: int = 240) -> None:
+        super().__init__(daemon=True)
+        self.sim = sim
+        self.intervalo_base = intervalo_base
+        self.max_pasos_por_publicacion = max_pasos_por_publicacion  # tope de pasos entre instantaneas (si no alcanza, se descarta el atraso)
+        self.velocidad_multiplier = 1.0
+        self.control = queue.Queue()            # mensajes (tipo, valor) de la interfaz
+        self.salida = queue.Queue(maxsize=1)    # solo la instantanea mas nueva
+        self._pausada = False
+        self._numero = 0
+        self._reinicios = 0             # reinicios aplicados por el hilo trabajador
+        self._reinicios_pedidos = 0     # reinicios pedidos por la interfaz
+        self._publicar(None)
+
+    # fin de la simulacion
+    def _terminada(self) -> bool:
+        return self.sim.tiempo_actual >= self.sim.dias_simulacion * 1440
+
+    # arma una instantanea del estado actual (solo desde el hilo dueño de la simulacion)
+    def _crear_instantanea(self, anteriores: Optional[Dict[str, np.ndarray]]) -> Instantanea:
+        self._numero += 1
+        return Instantanea(numero=self._numero,
+                           reinicio=self._reinicios,
+                           tiempo_actual=self.sim.tiempo_actual,
+                           columnas=columnas_aviones(self.sim),
+                           anteriores=anteriores,
+                           estadisticas=self.sim.obtener_estadisticas(),
+                           motivo_cierre=self.sim._motivo_cierre_actual(self.sim.tiempo_actual % 1440),
+                           storm_inicio_min=self.sim.storm_inicio_min,
+                           terminada=self._terminada(),
+                           publicada=time.perf_counter())
+
+    # publica reemplazando la instantanea que la interfaz todavia no leyo
+    def _publicar(self, anteriores: Optional[Dict[str, np.ndarray]]) -> None:
+        instantanea = self._crear_instantanea(anteriores)
+        while True:
+            try:
+                self.salida.put_nowait(instantanea)
+                return
+            except queue.Full:
+                try:
+                    self.salida.get_nowait()
+                except queue.Empty:
+                    pass
+
+    # la instantanea mas nueva publicada desde la ultima llamada (None si no hay ninguna nueva). despues de
+    # reiniciar se descartan las que el trabajador publico antes de atender el reinicio (son de la corrida vieja)
+    def ultima_instantanea(self) -> Optional[Instantanea]:
+        instantanea = None
+        while True:
+            try:
+                nueva = self.salida.get_nowait()
+            except queue.Empty:
+                return instantanea
+            if nueva.reinicio >= self._reinicios_pedidos:
+                instantanea = nueva
+
+    # mensajes de control (se pueden llamar desde cualquier hilo)
+    def pausar(self, pausada: bool) -> None:
+        self.control.put(("pausa", pausada))
+
+    def cambiar_velocidad(self, velocidad: float) -> None:
+        self.control.put(("velocidad", velocidad))
+
+    def reiniciar(self) -> None:
+        self._reinicios_pedidos += 1
+        self.control.put(("reiniciar", None))
+        self.ultima_instantanea()  # vacia la cola: lo que haya es de la corrida vieja
+
+    def detener(self) -> None:
+        self.control.put(("detener", None))
+
+    # atiende un mensaje de control, devuelve False si hay que terminar el hilo
+    def _atender(self, tipo: str, valor) -> bool:
+        if tipo == "detener":
+            return False
+        if tipo == "pausa":
+            self._pausada = valor
+        elif tipo == "velocidad":
+            self.velocidad_multiplier = valor
+        elif tipo == "reiniciar":
+            self.sim.reiniciar_simulacion()
+            self._reinicios += 1
+            self._publicar(None)
+        return True
+
+    def run(self) -> None:
+        ultimo = time.perf_counter()
+        acumulado = 0.0
+        while True:
+            esperar = self._pausada or self._terminada() # sin nada que simular se bloquea hasta el proximo mensaje
+            try:
+                tipo, valor = self.control.get() if esperar else self.control.get_nowait()
+            except queue.Empty:
+                tipo = None
+            if tipo is not None:
+                if not self._atender(tipo, valor):
+                    return
+                if esperar: # al reanudar no se recupera el tiempo en pausa
+                    ultimo = time.perf_counter()
+                    acumulado = 0.0
+                continue
+
+            ahora = time.perf_counter()
+            acumulado += ahora - ultimo
+            ultimo = ahora
+            intervalo = self.intervalo_base / self.velocidad_multiplier
+            pasos = int(acumulado // intervalo)
+            if pasos == 0:
+                time.sleep(min(intervalo - acumulado, 1 / 240))
+                continue
+            acumulado -= pasos * intervalo
+            if pasos > self.max_pasos_por_publicacion: # la simulacion no da abasto: se muestra lo que se llego a simular
+                pasos = self.max_pasos_por_publicacion
+                acumulado = 0.0
+
+            anteriores = None
+            for k in range(pasos):
+                if self._terminada():
+                    break
+                if k == pasos - 1: # solo el ultimo paso antes de publicar se usa para interpolar
+                    anteriores = columnas_aviones(self.sim)
+                self.sim.procesar_paso_temporal()
+            if self._terminada(): # las estadisticas finales viajan en la ultima instantanea
+                self.sim.calcular_estadisticas_finales()
+            self._publicar(anteriores)
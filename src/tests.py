@@ -8,15 +8,32 @@ import unittest
 import numpy as np
 import sys
 import os
+import io
+import contextlib
+import importlib.util
 from typing import Any
 
 # agregar el directorio src al path para poder importar los modulos
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from plane import Plane
-from sim_core import Simulacion, ejecutar_multiples_simulaciones, estimar_probabilidad_5_aviones_en_1_hora
+from plane import Plane, PoolAviones
+from sim_core import Simulacion, ejecutar_multiples_simulaciones, estimar_probabilidad_5_aviones_en_1_hora, CLAVES_REPLICA
+from sim_core import barrido_parametros, grilla_escenarios, comparacion_pareada, ejecutar_simulaciones_adaptativas
+from sim_core import estimar_conteos_poisson
+from motor_vectorizado import MotorVectorizado
+from motor_replicas import MotorReplicas, simular_replicas
+from cola_aviones import ColaAviones
+from estadisticas_online import AcumuladorOnline
+from perfilador import FASES
 import const as c
 import utilidades as u
+import benchmarks
+import checkpoint
+from trayectorias import GrabadorTrayectorias, LectorTrayectorias, grabar_simulacion
+import exportar_video
+from simulacion_en_hilo import TrabajadorSimulacion
+import experimentos
+from cache_replicas import CacheReplicas, clave_escenario
 
 
 class TestPlane(unittest.TestCase):
@@ -245,6 +262,60 @@ class TestPlane(unittest.TestCase):
         self.assertEqual(avion_desviado.status, "desviado")
         self.assertEqual(avion_desviado.minutos_bloqueo, 4)  # se redujo en 1 minuto
 
+class TestPlaneCompacto(unittest.TestCase):
+    """tests para la representacion compacta de plane y el pool de reciclado"""
+    
+    def test_slots_sin_dict(self):
+        """test: plane usa __slots__ y no tiene __dict__ por instancia"""
+        avion = Plane(id=1, t_spawn=0)
+        self.assertFalse(hasattr(avion, '__dict__'))
+        with self.assertRaises(AttributeError):
+            avion.atributo_nuevo = 1
+            
+    def test_status_como_codigo_entero(self):
+        """test: status se guarda como codigo entero y se sigue leyendo como string"""
+        avion = Plane(id=1, t_spawn=0, status="desviado")
+        self.assertEqual(avion.codigo_estado, c.DESVIADO)
+        self.assertEqual(avion.status, "desviado")
+        
+        avion.status = "en_fila"
+        self.assertEqual(avion.codigo_estado, c.EN_FILA)
+        
+        with self.assertRaises(ValueError):
+            avion.status = "volando"
+            
+    def test_pool_recicla_aviones(self):
+        """test: el pool reutiliza los aviones liberados con valores reiniciados"""
+        pool = PoolAviones()
+        avion = pool.obtener(id=1, t_spawn=10, status="en_fila")
+        avion.x = 3.0
+        avion.status = "aterrizaje_confirmado"
+        avion.t_landing = 40
+        pool.liberar(avion)
+        
+        reciclado = pool.obtener(id=2, t_spawn=50)
+        
+        self.assertIs(reciclado, avion)
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(reciclado.id, 2)
+        self.assertEqual(reciclado.x, 100.0)
+        self.assertEqual(reciclado.status, "en_fila")
+        self.assertIsNone(reciclado.t_landing)
+        
+    def test_simulacion_reciclando_aviones(self):
+        """test: reciclando, los aterrizados quedan como registros compactos y no como Plane"""
+        sim = Simulacion(lambda_param=0.1, dias_simulacion=1, reciclar_aviones=True)
+        sim.tiempo_actual = 720
+        avion = Plane(id=1, t_spawn=700, x=0.5, v=300)
+        sim.aviones = [avion]
+        
+        sim.procesar_paso_temporal()
+        
+        self.assertEqual(sim.estadisticas['aterrizados'], 1)
+        self.assertEqual(len(sim.aviones_aterrizados), 0)
+        self.assertEqual(sim.obtener_tiempos_aterrizaje(), [20])
+        self.assertEqual(sim.obtener_detalles_aterrizajes()[0]['id'], 1)
+
 class TestSimulacion(unittest.TestCase):
     """tests para la clase simulacion - comportamiento del sistema completo"""
     
@@ -347,6 +418,21 @@ class TestSimulacion(unittest.TestCase):
         self.assertEqual(sim.aviones[0].x, 10.0)
         self.assertEqual(sim.aviones[1].x, 30.0)
         self.assertEqual(sim.aviones[2].x, 80.0)
+
+    def test_paso_reubica_solo_los_que_se_pasaron(self):
+        """test: el paso reubica al avion que paso al de adelante sin reordenar toda la cola"""
+        sim = Simulacion(lambda_param=0.0, dias_simulacion=1)
+        lento = Plane(id=1, t_spawn=0, x=60.0, v=300.0)
+        rapido = Plane(id=2, t_spawn=0, x=61.0, v=500.0)
+        ultimo = Plane(id=3, t_spawn=0, x=90.0, v=300.0)
+        sim.aviones = [lento, rapido, ultimo]
+        cola = sim._cola()
+        cola.sort = cola.reordenar = lambda *args, **kwargs: self.fail("no debe reordenar la cola entera")
+
+        sim.procesar_paso_temporal()
+
+        self.assertIs(sim.aviones, cola)
+        self.assertEqual([a.id for a in cola], [2, 1, 3])
         
     def test_obtener_hora_actual(self):
         """test: conversion correcta de tiempo a formato hora"""
@@ -654,6 +740,69 @@ class TestEstadisticas(unittest.TestCase):
         detalles = sim.obtener_detalles_aterrizajes()
         self.assertEqual(len(detalles), 0)
 
+class TestModoStreaming(unittest.TestCase):
+    """tests para el modo streaming con acumuladores online"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        
+    def test_acumulador_online(self):
+        """test: media, varianza, extremos e histograma coinciden con el calculo directo"""
+        valores = [12.0, 30.0, 25.0, 47.0, 33.0, 8.0]
+        uno_a_uno = AcumuladorOnline(0, 60, 6)
+        for valor in valores:
+            uno_a_uno.agregar(valor)
+        por_lote = AcumuladorOnline(0, 60, 6)
+        por_lote.agregar_muchos(valores[:2])
+        por_lote.agregar_muchos(valores[2:])
+        
+        for acum in (uno_a_uno, por_lote):
+            self.assertEqual(acum.n, 6)
+            self.assertAlmostEqual(acum.media, np.mean(valores))
+            self.assertAlmostEqual(acum.varianza(), np.var(valores, ddof=1))
+            self.assertEqual(acum.minimo, 8.0)
+            self.assertEqual(acum.maximo, 47.0)
+            self.assertEqual(acum.histograma.tolist(), [1, 1, 1, 2, 1, 0])
+            
+    def test_streaming_no_guarda_aviones(self):
+        """test: en modo streaming no se guardan aterrizados ni desviados y el promedio coincide"""
+        np.random.seed(5)
+        normal = Simulacion(lambda_param=0.2, dias_simulacion=1)
+        normal.ejecutar_simulacion_completa()
+        np.random.seed(5)
+        streaming = Simulacion(lambda_param=0.2, dias_simulacion=1, modo_streaming=True)
+        streaming.ejecutar_simulacion_completa()
+        
+        self.assertEqual(len(streaming.aviones_aterrizados), 0)
+        self.assertEqual(len(streaming.aviones_desviados), 0)
+        self.assertEqual(normal.estadisticas['aterrizados'], streaming.estadisticas['aterrizados'])
+        self.assertAlmostEqual(normal.estadisticas['tiempo_promedio_aterrizaje'],
+                               streaming.estadisticas['tiempo_promedio_aterrizaje'])
+        
+        resumen = streaming.obtener_resumen_streaming()
+        self.assertEqual(resumen['tiempo_aterrizaje']['cantidad'], streaming.estadisticas['aterrizados'])
+        total_desvios = sum(r['cantidad'] for r in resumen['desvios_por_motivo'].values())
+        self.assertEqual(total_desvios, streaming.estadisticas['desvios_a_montevideo'])
+        
+        with self.assertRaises(RuntimeError):
+            streaming.obtener_tiempos_aterrizaje()
+            
+    def test_motivo_de_desvio_al_salir(self):
+        """test: un avion desviado por viento se cuenta con ese motivo al salir de las 100 mn"""
+        sim = Simulacion(lambda_param=0.0, dias_simulacion=1, modo_streaming=True)
+        sim.tiempo_actual = 720
+        avion = Plane(id=1, t_spawn=600, x=99.0, v=200)
+        avion.set_desviado("viento")
+        sim.aviones = [avion]
+        
+        sim.procesar_paso_temporal()
+        
+        resumen = sim.obtener_resumen_streaming()['desvios_por_motivo']
+        self.assertEqual(resumen['viento']['cantidad'], 1)
+        self.assertEqual(resumen['viento']['media'], 120)
+        self.assertEqual(resumen['congestion']['cantidad'], 0)
+
 class TestFuncionesAuxiliares(unittest.TestCase):
     """tests para funciones auxiliares y de utilidad"""
     
@@ -695,6 +844,41 @@ class TestFuncionesAuxiliares(unittest.TestCase):
         tiempo = u.tiempo_min_para_mn(300, 30)
         self.assertEqual(tiempo, 6.0)
         
+    def test_tablas_de_rangos_compiladas(self):
+        """test: las tablas compiladas respetan const.rangos"""
+        self.assertEqual(c.BORDES_RANGOS, (0, 5, 15, 50, 100))
+        self.assertEqual(u.limites_rango(30.0), (15, 50))
+        self.assertEqual(u.limites_rango(-1.0), (0, 5))  # fallback por debajo de 0
+        self.assertIsNone(u.velocidad_permitida(-1.0))
+        
+        x = np.array([0.0, 2.0, 5.0, 10.0, 50.0, 75.0, 100.0, 150.0])
+        vmin, vmax = u.velocidad_permitida_vec(x)
+        for xi, vmin_i, vmax_i in zip(x, vmin, vmax):
+            self.assertEqual((vmin_i, vmax_i), u.velocidad_permitida(xi))
+            
+    def test_tiempo_min_vmax_tabla_acumulada(self):
+        """test: tiempo minimo a vmax usando la tabla acumulada"""
+        # 100 -> 15 mn: 35 mn a 250 kt (8.4 min) + 50 mn a 300 kt (10 min)
+        self.assertAlmostEqual(u.tiempo_min_vmax_a_punto(100.0, 15.0), 18.4)
+        self.assertAlmostEqual(u.minutos_vmax_al_umbral(100.0), 23.4)
+        self.assertEqual(u.tiempo_min_vmax_a_punto(10.0, 15.0), 0.0)
+        
+        x = np.array([3.0, 12.0, 40.0, 90.0, 120.0])
+        np.testing.assert_allclose(u.minutos_vmax_al_umbral_vec(x), [u.minutos_vmax_al_umbral(xi) for xi in x])
+        
+    def test_tiempo_estimado_arribo_escalar_y_vectorizado(self):
+        """test: la estimacion de arribo coincide con Plane.time_to_arrive en ambas versiones"""
+        x = np.array([2.0, 10.0, 30.0, 75.0, 120.0])
+        v = np.array([130.0, 180.0, 220.0, 280.0, 400.0])
+        esperado = []
+        for xi, vi in zip(x, v):
+            avion = Plane(id=1, t_spawn=0, x=xi, v=vi)
+            avion.time_to_arrive()
+            esperado.append(avion.tiempo_estimado)
+            self.assertEqual(u.tiempo_estimado_arribo(xi, vi), avion.tiempo_estimado)
+        
+        np.testing.assert_allclose(u.tiempo_estimado_arribo_vec(x, v), esperado)
+        
     def test_knots_to_mn_per_min(self):
         """test: conversion de nudos a mn/min"""
         # 60 nudos = 1 mn/min
@@ -735,6 +919,45 @@ class TestSimulacionesMultiples(unittest.TestCase):
             self.assertIsInstance(value['valores'], list)
             self.assertEqual(len(value['valores']), 3)
             
+    def test_multiples_simulaciones_paralelo_reproducible(self):
+        """test: con semilla, el resultado no depende de la cantidad de workers"""
+        serial = ejecutar_multiples_simulaciones(lambda_param=0.1, dias_simulacion=1,
+                                                 num_simulaciones=4, semilla=123)
+        paralelo = ejecutar_multiples_simulaciones(lambda_param=0.1, dias_simulacion=1,
+                                                   num_simulaciones=4, semilla=123, num_workers=2)
+        
+        for key in serial:
+            self.assertEqual(serial[key]['valores'], paralelo[key]['valores'])
+            self.assertEqual(serial[key]['promedio'], paralelo[key]['promedio'])
+            
+    def test_sin_semilla_no_depende_de_workers(self):
+        """test: sin semilla, despues de np.random.seed el resultado tampoco depende de la cantidad de workers"""
+        resultados = []
+        for num_workers in (1, 2):
+            np.random.seed(11)
+            resultados.append(ejecutar_multiples_simulaciones(lambda_param=0.1, dias_simulacion=1,
+                                                              num_simulaciones=3, num_workers=num_workers))
+        
+        for key in resultados[0]:
+            self.assertEqual(resultados[0][key]['valores'], resultados[1][key]['valores'])
+            
+    def test_barrido_parametros_tabla_columnar(self):
+        """test: el barrido devuelve una fila por escenario que coincide con la corrida individual"""
+        escenarios = grilla_escenarios(lambda_param=[0.05, 0.1], enable_metering=[False, True])
+        self.assertEqual(len(escenarios), 4)
+        
+        tabla = barrido_parametros(escenarios, num_simulaciones=2, dias_simulacion=1,
+                                   semilla=7, num_workers=1)
+        
+        self.assertEqual(tabla['lambda_param'], [0.05, 0.05, 0.1, 0.1])
+        self.assertEqual(tabla['num_simulaciones'], [2, 2, 2, 2])
+        self.assertEqual(len(tabla['aterrizados_promedio']), 4)
+        self.assertEqual(len(tabla['desviados_error_estandar']), 4)
+        
+        individual = ejecutar_multiples_simulaciones(lambda_param=0.1, dias_simulacion=1, num_simulaciones=2,
+                                                     enable_metering=True, semilla=7)
+        self.assertEqual(tabla['aterrizados_promedio'][3], individual['aterrizados']['promedio'])
+            
     def test_estimar_probabilidad_5_aviones(self):
         """test: estimacion de probabilidad de 5 aviones en 1 hora"""
         lambda_param = 1.0 / 60.0  # 1 avion por hora
@@ -753,6 +976,143 @@ class TestSimulacionesMultiples(unittest.TestCase):
         self.assertIsInstance(resultado['conteos_por_hora'], list)
         self.assertEqual(len(resultado['conteos_por_hora']), 100)
 
+class TestFlujosAproximacionDesvio(unittest.TestCase):
+    """tests para los flujos separados de aviones en aproximacion y desviados"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        self.sim = Simulacion(lambda_param=0.0, dias_simulacion=1)
+        self.sim.tiempo_actual = 720
+        
+    def test_asignar_lista_reparte_por_estado(self):
+        """test: una lista asignada a aviones se reparte entre aproximacion y desvio al procesar"""
+        bloqueado = Plane(id=1, t_spawn=0, x=60.0, v=200, status="desviado", minutos_bloqueo=10)
+        self.sim.aviones = [bloqueado, Plane(id=2, t_spawn=0, x=40.0, v=250)]
+        self.assertEqual(self.sim.cantidad_aviones_activos(), 2)
+        self.sim.procesar_paso_temporal()
+        
+        self.assertEqual([a.id for a in self.sim.aviones], [2])
+        self.assertEqual([a.id for a in self.sim.aviones_en_desvio], [1])
+        self.assertEqual([a.id for a in self.sim.aviones_en_sistema()], [2, 1])
+        
+    def test_reinsercion_en_gap_de_la_aproximacion(self):
+        """test: el gap para reinsertar se mide entre aviones en aproximacion, salteando a los desviados"""
+        lider = Plane(id=1, t_spawn=0, x=20.0, v=200)
+        seguidor = Plane(id=2, t_spawn=0, x=80.0, v=250)
+        desviado = Plane(id=3, t_spawn=0, x=30.0, v=200, status="desviado")
+        otro_desviado = Plane(id=4, t_spawn=0, x=35.0, v=200, status="desviado")  # en una sola lista quedaba entre los dos
+        self.sim.aviones = [lider, desviado, otro_desviado, seguidor]
+        
+        self.sim.procesar_paso_temporal()
+        
+        punto_medio = (lider.x + seguidor.x) / 2
+        self.assertEqual(desviado.status, "reinsercion")
+        self.assertAlmostEqual(desviado.x, punto_medio)
+        self.assertEqual([a.id for a in self.sim.aviones], [1, 3, 2])
+        # el gap que quedaba ya lo ocupa el reinsertado: el segundo desviado no entra en el mismo paso
+        self.assertEqual(otro_desviado.status, "desviado")
+        self.assertEqual([a.id for a in self.sim.aviones_en_desvio], [4])
+        
+        self.sim.procesar_paso_temporal()
+        self.assertEqual(self.sim.estadisticas['reincerciones_exitosas'], 1)
+        
+    def test_desviado_en_el_paso_deja_de_ser_lider(self):
+        """test: el de atras de un avion que se desvia en este paso se compara con el siguiente de la aproximacion"""
+        self.sim.viento_activo = True
+        self.sim.p_goaround = 1.0  # todo intento de aterrizaje termina en go-around
+        adelante = Plane(id=1, t_spawn=0, x=0.5, v=300)     # intenta aterrizar y se desvia
+        atras = Plane(id=2, t_spawn=0, x=4.0, v=150)
+        self.sim.aviones = [adelante, atras]
+        
+        self.sim.procesar_paso_temporal()
+        
+        self.assertEqual(adelante.status, "desviado")
+        self.assertNotEqual(atras.status, "desacelerando")
+        self.assertEqual([a.id for a in self.sim.aviones], [2])
+        self.assertEqual([a.id for a in self.sim.aviones_en_desvio], [1])
+        
+    def test_tormenta_y_checkpoint(self):
+        """test: la tormenta pasa toda la aproximacion al flujo de desvio y el checkpoint conserva ambos flujos"""
+        sim = Simulacion(lambda_param=0.2, dias_simulacion=1, storm_activa=True, storm_prob=1.0, storm_duracion_min=60,
+                         semilla=3)
+        sim.storm_inicio_min = 800  # tormenta a media tarde, con trafico en aproximacion
+        while sim.tiempo_actual < sim.storm_inicio_min:
+            sim.procesar_paso_temporal()
+        en_aproximacion = len(sim.aviones)
+        sim.procesar_paso_temporal()
+        
+        self.assertGreater(en_aproximacion, 0)
+        self.assertTrue(all(a.status == "desviado" for a in sim.aviones_en_desvio))
+        self.assertTrue(all(a.status != "desviado" for a in sim.aviones))
+        self.assertGreaterEqual(len(sim.aviones_en_desvio), en_aproximacion)
+        
+        copia, = sim.bifurcar({})
+        self.assertEqual([a.id for a in copia.aviones], [a.id for a in sim.aviones])
+        self.assertEqual([a.id for a in copia.aviones_en_desvio], [a.id for a in sim.aviones_en_desvio])
+
+    def test_motor_vectorizado_usa_los_dos_flujos(self):
+        """test: el motor vectorizado reinserta en el gap de la aproximacion igual que el de objetos"""
+        sim = Simulacion(lambda_param=0.0, dias_simulacion=1, motor="vectorizado")
+        sim.tiempo_actual = 720
+        motor = sim._motor
+        for i, (x, v) in enumerate(((20.0, 200), (30.0, 200), (35.0, 200), (80.0, 250))):
+            motor.agregar(id=i + 1, t_spawn=0, v=v, x=x)
+        motor.estado[1:3] = c.DESVIADO
+
+        sim.procesar_paso_temporal()
+
+        estados = dict(zip(motor.id[:motor.n].tolist(), motor.estado[:motor.n].tolist()))
+        x = dict(zip(motor.id[:motor.n].tolist(), motor.x[:motor.n].tolist()))
+        self.assertEqual(estados[2], c.REINSERCION)
+        self.assertAlmostEqual(x[2], (x[1] + x[4]) / 2)
+        self.assertEqual(estados[3], c.DESVIADO)  # el gap ya lo ocupa el reinsertado
+
+    def test_motor_vectorizado_desviado_no_es_lider(self):
+        """test: en el motor vectorizado un desviado en el paso no frena al de atras"""
+        motor = MotorVectorizado()
+        motor.agregar(id=0, t_spawn=0, v=300, x=0.5)   # intenta aterrizar y hace go-around
+        motor.agregar(id=1, t_spawn=0, v=150, x=4.0)
+
+        motor.avanzar(720, motivo_cierre=None, minutos_hasta_apertura=0, viento_activo=True, p_goaround=1.0)
+
+        self.assertEqual(motor.estado[0], c.DESVIADO)
+        self.assertNotEqual(motor.estado[1], c.DESACELERANDO)
+
+    def test_motor_replicas_usa_los_dos_flujos(self):
+        """test: el motor de replicas reinserta por fila en el gap de la aproximacion, salteando a los desviados"""
+        motor = MotorReplicas(2, lambda_param=0.0)
+        motor.tiempo_actual = 720
+        filas = {0: ((20.0, 200, c.EN_FILA), (30.0, 200, c.DESVIADO), (35.0, 200, c.DESVIADO), (80.0, 250, c.EN_FILA)),
+                 1: ((30.0, 200, c.DESVIADO), (50.0, 250, c.EN_FILA))}  # sin nadie adelante no hay gap
+        for r, aviones in filas.items():
+            for j, (x, v, estado) in enumerate(aviones):
+                motor.x[r, j], motor.v[r, j], motor.estado[r, j] = x, v, estado
+            motor.n[r] = len(aviones)
+
+        motor.procesar_paso_temporal()
+
+        # cada fila termina el paso ordenada por distancia: el reinsertado (punto medio) queda detras del desviado
+        self.assertEqual(motor.estado[0, :4].tolist(), [c.EN_FILA, c.DESVIADO, c.REINSERCION, c.EN_FILA])
+        self.assertAlmostEqual(motor.x[0, 2], (motor.x[0, 0] + motor.x[0, 3]) / 2)
+        self.assertEqual(motor.estado[1, 0], c.DESVIADO)
+
+    def test_motores_coinciden_con_tormentas(self):
+        """test: con muchas tormentas los tres motores simulan el mismo sistema (promedios compatibles)"""
+        config = dict(lambda_param=0.2, dias_simulacion=1, storm_activa=True, storm_prob=1.0, storm_duracion_min=60,
+                      semilla=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultados = {motor: ejecutar_multiples_simulaciones(num_simulaciones=n, motor=motor, **config)
+                          for motor, n in (("objetos", 100), ("vectorizado", 30), ("replicas", 200))}
+
+        referencia = resultados["objetos"]
+        for motor in ("vectorizado", "replicas"):
+            for clave in ('aterrizados', 'desviados', 'reincerciones_exitosas', 'tiempo_promedio_aterrizaje'):
+                a, b = referencia[clave], resultados[motor][clave]
+                z = (a['promedio'] - b['promedio']) / np.hypot(a['error_estandar'], b['error_estandar'])
+                self.assertLess(abs(z), 4, f"{motor} {clave}: z={z:.2f}")
+
+
 class TestIntegracion(unittest.TestCase):
     """tests de integracion que combinan multiples componentes"""
     
@@ -856,6 +1216,1041 @@ class TestIntegracion(unittest.TestCase):
             self.assertIsNotNone(tiempo_vuelo)
             self.assertEqual(tiempo_vuelo, avion.t_landing - avion.t_spawn)
 
+class TestColaAviones(unittest.TestCase):
+    """tests para la cola de aviones ordenada por distancia"""
+    
+    def test_agregar_mantiene_orden(self):
+        """test: agregar pone al final los spawns y ubica por busqueda binaria al resto"""
+        cola = ColaAviones()
+        cola.agregar(Plane(id=1, t_spawn=0, x=30.0))
+        cola.agregar(Plane(id=2, t_spawn=0, x=100.0))
+        cola.agregar(Plane(id=3, t_spawn=0, x=10.0))
+        cola.agregar(Plane(id=4, t_spawn=0, x=50.0))
+        
+        self.assertEqual([a.id for a in cola], [3, 1, 4, 2])
+        
+    def test_reordenar_reubica_desordenados(self):
+        """test: reordenar reubica los aviones que se movieron fuera de lugar"""
+        aviones = [Plane(id=i, t_spawn=0, x=10.0 * (i + 1)) for i in range(5)]
+        cola = ColaAviones(aviones)
+        aviones[0].x = 35.0  # se desvio y retrocedio
+        aviones[4].x = 5.0   # reinsercion adelante de todos
+        
+        cola.reordenar()
+        
+        self.assertEqual([a.id for a in cola], [4, 1, 2, 0, 3])
+        
+    def test_reordenar_es_estable(self):
+        """test: aviones a la misma distancia conservan su orden relativo"""
+        cola = ColaAviones([Plane(id=1, t_spawn=0, x=20.0), Plane(id=2, t_spawn=0, x=30.0),
+                            Plane(id=3, t_spawn=0, x=20.0)])
+        cola.reordenar()
+        self.assertEqual([a.id for a in cola], [1, 3, 2])
+
+    def test_reordenar_muchos_desplazados(self):
+        """test: si todos los aviones cambian de lugar en un paso, reordenar los ordena sobre la misma lista"""
+        aviones = [Plane(id=i, t_spawn=0, x=float(i)) for i in range(50)]
+        cola = ColaAviones(aviones)
+        for avion in aviones:
+            avion.x = 100.0 - avion.x
+        antes = id(cola)
+
+        cola.reordenar()
+
+        self.assertEqual(id(cola), antes)
+        self.assertEqual([a.id for a in cola], list(range(49, -1, -1)))
+
+    def test_vecinos(self):
+        """test: vecinos devuelve el avion inmediatamente adelante y el de atras de una posicion"""
+        cola = ColaAviones([Plane(id=i, t_spawn=0, x=x) for i, x in enumerate((10.0, 30.0, 60.0))])
+        adelante, atras = cola.vecinos(40.0)
+        self.assertEqual((adelante.id, atras.id), (1, 2))
+        self.assertEqual(cola.vecinos(5.0)[0], None)
+        self.assertEqual(cola.vecinos(70.0)[1], None)
+        self.assertEqual(cola.vecinos(30.0)[1].id, 1)  # a la misma distancia cuenta como el de atras
+        
+    def test_remover_en_una_pasada(self):
+        """test: remover saca todos los aviones indicados y mantiene el orden del resto"""
+        aviones = [Plane(id=i, t_spawn=0, x=float(i)) for i in range(6)]
+        cola = ColaAviones(aviones)
+        
+        cola.remover([aviones[1], aviones[4]])
+        
+        self.assertEqual([a.id for a in cola], [0, 2, 3, 5])
+        self.assertIsInstance(cola, ColaAviones)
+
+class TestSaltoPeriodosInactivos(unittest.TestCase):
+    """tests para el adelanto del reloj en periodos cerrados sin aviones"""
+    
+    def test_salta_hasta_la_apertura(self):
+        """test: sin aviones y cerrado por horario, salta directo a las 06:00"""
+        sim = Simulacion(lambda_param=0.1, dias_simulacion=2)
+        sim.tiempo_actual = 1440 + 60  # 01:00 del dia 2
+        
+        self.assertTrue(sim._saltar_periodo_inactivo(2 * 1440))
+        self.assertEqual(sim.tiempo_actual, 1440 + 360)
+        
+    def test_no_salta_con_aviones_o_abierto(self):
+        """test: no salta si hay aviones en el sistema o si el aeropuerto esta abierto"""
+        sim = Simulacion(lambda_param=0.1, dias_simulacion=1)
+        sim.tiempo_actual = 720
+        self.assertFalse(sim._saltar_periodo_inactivo(1440))
+        
+        sim.tiempo_actual = 60
+        sim.aviones = [Plane(id=1, t_spawn=0, x=50.0, v=200, status="desviado")]
+        self.assertFalse(sim._saltar_periodo_inactivo(1440))
+        self.assertEqual(sim.tiempo_actual, 60)
+        
+    def test_mismo_resultado_con_y_sin_salto(self):
+        """test: el salto no cambia las estadisticas de la simulacion"""
+        resultados = []
+        for saltar in (False, True):
+            np.random.seed(3)
+            sim = Simulacion(lambda_param=0.1, dias_simulacion=3, storm_activa=True, storm_prob=0.7,
+                             saltar_periodos_inactivos=saltar)
+            sim.ejecutar_simulacion_completa()
+            resultados.append((sim.estadisticas, sim.tiempo_actual, sim.dia_actual))
+        
+        self.assertEqual(resultados[0], resultados[1])
+
+class TestMotorVectorizado(unittest.TestCase):
+    """tests para el motor vectorizado (estructura de arreglos)"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        
+    def test_motor_invalido(self):
+        """test: un motor desconocido lanza error"""
+        with self.assertRaises(ValueError):
+            Simulacion(lambda_param=0.1, dias_simulacion=1, motor="gpu")
+            
+    def test_mismas_claves_de_estadisticas(self):
+        """test: el motor vectorizado produce las mismas claves de estadisticas"""
+        sim_obj = Simulacion(lambda_param=0.1, dias_simulacion=1)
+        sim_vec = Simulacion(lambda_param=0.1, dias_simulacion=1, motor="vectorizado")
+        sim_obj.ejecutar_simulacion_completa()
+        sim_vec.ejecutar_simulacion_completa()
+        
+        self.assertEqual(set(sim_obj.estadisticas), set(sim_vec.estadisticas))
+        stats = sim_vec.estadisticas
+        self.assertGreater(stats['aterrizados'], 0)
+        self.assertLessEqual(stats['aterrizados'] + stats['desviados'], stats['total_aviones'])
+        self.assertEqual(len(sim_vec.obtener_tiempos_aterrizaje()), stats['aterrizados'])
+        
+    def test_aterrizaje_vectorizado(self):
+        """test: un avion cerca de la pista aterriza y se registra su tiempo de vuelo"""
+        sim = Simulacion(lambda_param=0.0, dias_simulacion=1, motor="vectorizado")
+        sim.tiempo_actual = 720
+        sim._motor.agregar(id=7, t_spawn=700, v=300, x=0.5)
+        
+        sim.procesar_paso_temporal()
+        
+        self.assertEqual(sim.cantidad_aviones_activos(), 0)
+        self.assertEqual(sim.estadisticas['aterrizados'], 1)
+        self.assertEqual(sim.obtener_detalles_aterrizajes()[0]['tiempo_total_vuelo'], 20)
+        
+    def test_desaceleracion_detras_de_otro(self):
+        """test: el avion de atras desacelera a 20 nudos menos que el de adelante"""
+        motor = MotorVectorizado()
+        motor.agregar(id=0, t_spawn=0, v=220, x=30.0)
+        motor.agregar(id=1, t_spawn=0, v=250, x=32.0)
+        
+        motor.avanzar(720, motivo_cierre=None, minutos_hasta_apertura=0)
+        
+        self.assertEqual(motor.estado[1], c.DESACELERANDO)
+        self.assertEqual(motor.v[1], 200)
+        
+    def test_cadena_de_lideres_igual_que_objetos(self):
+        """test: la pasada unica resuelve cadenas y desvios en cascada igual que el recorrido avion por avion"""
+        aviones = [(30.0, 245), (31.0, 250), (32.0, 250), (33.5, 250), (36.0, 245), (45.0, 210), (48.0, 230)]
+        motor = MotorVectorizado()
+        sim = Simulacion(lambda_param=0.0, dias_simulacion=1)
+        sim.tiempo_actual = 720
+        for i, (x, v) in enumerate(aviones):
+            motor.agregar(id=i, t_spawn=0, v=v, x=x)
+            sim.aviones.agregar(Plane(id=i, t_spawn=0, x=x, v=v))
+        
+        motor.avanzar(720, motivo_cierre=None, minutos_hasta_apertura=0)
+        sim.procesar_paso_temporal()
+        
+        esperado = {avion.id: (avion.v, avion.status) for avion in sim.aviones_en_sistema()}
+        obtenido = {i: (v, status) for i, _, v, status in motor.obtener_aviones()}
+        self.assertEqual(obtenido, esperado)
+        self.assertIn("desviado", [status for _, status in obtenido.values()])
+        self.assertIn("desacelerando", [status for _, status in obtenido.values()])
+        
+    def test_tormenta_desvia_a_todos(self):
+        """test: el inicio de tormenta desvia a todos los aviones en aproximacion"""
+        motor = MotorVectorizado()
+        for i in range(3):
+            motor.agregar(id=i, t_spawn=0, v=250, x=20.0 + 20 * i)
+        
+        desviados = motor.desviar_por_tormenta(minutos_bloqueo=30)
+        
+        self.assertEqual(desviados, 3)
+        self.assertTrue(np.all(motor.estado[:3] == c.DESVIADO))
+        self.assertTrue(np.all(motor.minutos_bloqueo[:3] == 30))
+        
+    def test_salida_a_montevideo(self):
+        """test: un desviado que pasa las 100 mn sale del sistema"""
+        motor = MotorVectorizado()
+        motor.agregar(id=0, t_spawn=0, v=200, x=99.0)
+        motor.desviar_por_tormenta(minutos_bloqueo=10)
+        
+        eventos = motor.avanzar(720, motivo_cierre=None, minutos_hasta_apertura=0)
+        
+        self.assertEqual(eventos['salidas_montevideo'], 1)
+        self.assertEqual(motor.n, 0)
+        
+    def test_multiples_simulaciones_vectorizado(self):
+        """test: ejecutar_multiples_simulaciones acepta el motor vectorizado"""
+        stats = ejecutar_multiples_simulaciones(lambda_param=0.1, dias_simulacion=1,
+                                                num_simulaciones=2, motor="vectorizado")
+        self.assertEqual(len(stats['aterrizados']['valores']), 2)
+
+class TestGeneradorPropio(unittest.TestCase):
+    """tests para el generador aleatorio propio de cada simulacion"""
+    
+    def test_misma_semilla_mismo_resultado(self):
+        """test: dos simulaciones con la misma semilla dan las mismas estadisticas"""
+        resultados = []
+        for _ in range(2):
+            np.random.seed(99)  # el estado global no debe influir si hay semilla
+            sim = Simulacion(lambda_param=0.1, dias_simulacion=2, storm_activa=True, viento_activo=True, semilla=123)
+            sim.ejecutar_simulacion_completa()
+            resultados.append(sim.estadisticas)
+            np.random.seed(7)
+        
+        self.assertEqual(resultados[0], resultados[1])
+        
+    def test_sin_semilla_respeta_estado_global(self):
+        """test: sin semilla explicita, np.random.seed sigue haciendo reproducible la corrida"""
+        semillas = []
+        for _ in range(2):
+            np.random.seed(42)
+            semillas.append(Simulacion(lambda_param=0.1, dias_simulacion=1).semilla)
+        
+        self.assertEqual(semillas[0], semillas[1])
+        
+    def test_llegadas_del_dia_se_resortean_al_cambiar_lambda(self):
+        """test: si cambia lambda_param se vuelven a sortear las llegadas del dia"""
+        sim = Simulacion(lambda_param=0.0, dias_simulacion=1, semilla=1)
+        sim.tiempo_actual = 720
+        self.assertEqual(sim._llegadas_del_minuto(720), 0)
+        
+        sim.lambda_param = 1.0
+        self.assertTrue(sim.generar_nuevo_avion())
+        
+    def test_buffer_aleatorio(self):
+        """test: el buffer entrega valores en rango y se rellena al agotarse"""
+        buffer = u.BufferAleatorio(np.random.default_rng(0), tamano_bloque=8)
+        valores = [buffer.uniforme(200, 300) for _ in range(20)]
+        
+        self.assertTrue(all(200 <= v < 300 for v in valores))
+        self.assertEqual(len(set(valores)), 20)
+        self.assertTrue(buffer.bernoulli(1.0))
+        self.assertFalse(buffer.bernoulli(0.0))
+
+class TestBenchmarks(unittest.TestCase):
+    """tests para las utilidades de benchmarks (no miden rendimiento real)"""
+    
+    def test_ajuste_de_exponente(self):
+        """test: el ajuste log-log recupera el exponente de una ley de potencia"""
+        n = np.arange(1, 50)
+        self.assertAlmostEqual(benchmarks.ajustar_exponente(n, 3e-6 * n**2), 2.0, places=6)
+        self.assertTrue(np.isnan(benchmarks.ajustar_exponente([5], [1.0])))
+        
+    def test_medir_corrida(self):
+        """test: la medicion de una corrida reporta minutos y aviones por segundo"""
+        medicion = benchmarks.medir_corrida(lambda_param=0.1, dias_simulacion=1)
+        
+        self.assertEqual(medicion['minutos_simulados'], 1440 - 350)
+        self.assertGreater(medicion['pasos_por_segundo'], 0)
+        self.assertGreater(medicion['aviones'], 0)
+        
+    def test_pasos_procesados_sin_minutos_salteados(self):
+        """test: el ritmo cuenta los pasos procesados, no los minutos que se saltean de noche sin aviones"""
+        con_salto = benchmarks.medir_corrida(lambda_param=0.05, dias_simulacion=2)
+        sin_salto = benchmarks.medir_corrida(lambda_param=0.05, dias_simulacion=2, saltar_periodos_inactivos=False)
+        
+        self.assertEqual(sin_salto['pasos_procesados'], sin_salto['minutos_simulados'])
+        self.assertEqual(con_salto['minutos_simulados'], sin_salto['minutos_simulados'])
+        self.assertLess(con_salto['pasos_procesados'], con_salto['minutos_simulados'])
+        
+    def test_comparar_con_baseline(self):
+        """test: solo se marcan como regresion las caidas mayores a la tolerancia"""
+        def resultado(pasos_por_segundo):
+            return {'corridas': [{'motor': 'objetos', 'variante': 'base', 'dias_simulacion': 1, 'lambda_param': 0.1,
+                                  'pasos_por_segundo': pasos_por_segundo, 'aviones_por_segundo': 100.0}]}
+        
+        self.assertEqual(benchmarks.comparar_con_baseline(resultado(900.0), resultado(1000.0), tolerancia=0.2), [])
+        regresiones = benchmarks.comparar_con_baseline(resultado(500.0), resultado(1000.0), tolerancia=0.2)
+        self.assertEqual(len(regresiones), 1)
+        self.assertEqual(regresiones[0]['metrica'], 'pasos_por_segundo')
+        
+    def test_comparar_motores(self):
+        """test: la comparacion de motores da el cociente vectorizado / objetos de cada escenario medido con ambos"""
+        def corrida(motor, lambda_param, pasos_por_segundo):
+            return {'motor': motor, 'variante': 'base', 'dias_simulacion': 1, 'lambda_param': lambda_param,
+                    'pasos_por_segundo': pasos_por_segundo}
+        
+        comparacion = benchmarks.comparar_motores([corrida('objetos', 0.1, 1000.0), corrida('vectorizado', 0.1, 250.0),
+                                                   corrida('objetos', 0.2, 800.0)])
+        
+        self.assertEqual(comparacion, [{'variante': 'base', 'dias_simulacion': 1, 'lambda_param': 0.1, 'aceleracion': 0.25}])
+
+class TestPerfilador(unittest.TestCase):
+    """tests para el modo de perfilado por fases"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        
+    def test_perfil_por_fase(self):
+        """test: con perfilar=True se registran tiempos y llamadas de cada fase"""
+        sim = Simulacion(lambda_param=0.2, dias_simulacion=1, enable_metering=True, perfilar=True)
+        sim.ejecutar_simulacion_completa()
+        perfil = sim.obtener_perfil()
+        
+        self.assertEqual(set(perfil['fases']), set(FASES))
+        self.assertEqual(perfil['fases']['llegadas']['llamadas'], perfil['pasos'])
+        self.assertEqual(perfil['fases']['metering']['llamadas'], perfil['fases']['movimiento']['llamadas'])
+        self.assertGreater(perfil['max_aviones_activos'], 0)
+        self.assertAlmostEqual(sum(f['fraccion'] for f in perfil['fases'].values()), 1.0)
+        
+    def test_perfilar_no_cambia_resultados(self):
+        """test: perfilar no altera las estadisticas"""
+        resultados = []
+        for perfilar in (False, True):
+            sim = Simulacion(lambda_param=0.1, dias_simulacion=1, semilla=5, perfilar=perfilar)
+            sim.ejecutar_simulacion_completa()
+            resultados.append(sim.estadisticas)
+        self.assertEqual(resultados[0], resultados[1])
+        
+    def test_sin_perfilar(self):
+        """test: sin perfilar no hay perfil"""
+        sim = Simulacion(lambda_param=0.1, dias_simulacion=1)
+        self.assertIsNone(sim._perfil)
+        with self.assertRaises(RuntimeError):
+            sim.obtener_perfil()
+            
+    def test_perfil_en_multiples_simulaciones(self):
+        """test: ejecutar_multiples_simulaciones combina los perfiles de las replicas"""
+        stats = ejecutar_multiples_simulaciones(lambda_param=0.1, dias_simulacion=1, num_simulaciones=2,
+                                                motor="vectorizado", perfilar=True)
+        
+        perfil = stats['perfil']
+        self.assertEqual(perfil['fases']['movimiento']['llamadas'], perfil['pasos'])  # una llamada al motor por paso
+        self.assertGreater(perfil['pasos'], 1440 - 350)  # pasos de las dos replicas sumados
+        self.assertNotIn('perfil', ejecutar_multiples_simulaciones(lambda_param=0.1, dias_simulacion=1, num_simulaciones=1))
+
+class TestCheckpoint(unittest.TestCase):
+    """tests para checkpoints, reanudacion y bifurcacion de simulaciones"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        self.config = dict(lambda_param=0.2, dias_simulacion=2, semilla=11, enable_metering=True,
+                           viento_activo=True, storm_activa=True, storm_prob=0.8)
+        
+    def _hasta(self, sim, minuto):
+        while sim.tiempo_actual < minuto:
+            sim.procesar_paso_temporal()
+        return sim
+        
+    def test_reanudar_da_el_mismo_resultado(self):
+        """test: cortar, restaurar y seguir da exactamente lo mismo que correr de corrido"""
+        for motor in ("objetos", "vectorizado"):
+            completa = Simulacion(**self.config, motor=motor)
+            completa.ejecutar_simulacion_completa()
+            
+            cortada = self._hasta(Simulacion(**self.config, motor=motor), 1440 + 500)
+            reanudada = checkpoint.restaurar_instantanea(checkpoint.crear_instantanea(cortada))
+            reanudada.ejecutar_simulacion_completa()
+            
+            self.assertEqual(completa.estadisticas, reanudada.estadisticas)
+            self.assertEqual(completa.obtener_tiempos_aterrizaje(), reanudada.obtener_tiempos_aterrizaje())
+            
+    def test_checkpoint_en_disco(self):
+        """test: ejecutar_simulacion_completa guarda checkpoints diarios que se pueden reanudar"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "sim.ckpt")
+            sim = Simulacion(**self.config)
+            sim.ejecutar_simulacion_completa(ruta_checkpoint=ruta)
+            
+            restaurada = checkpoint.cargar_checkpoint(ruta)
+            self.assertEqual(restaurada.tiempo_actual, 2 * 1440)
+            self.assertEqual(restaurada.estadisticas['aterrizados'], sim.estadisticas['aterrizados'])
+            self.assertEqual(restaurada.storm_inicio_min, sim.storm_inicio_min)
+            self.assertEqual(restaurada._last_sta_meter, sim._last_sta_meter)
+            
+    def test_bifurcar(self):
+        """test: las bifurcaciones comparten el prefijo y siguen por separado con sus parametros"""
+        base = self._hasta(Simulacion(**self.config), 1440 + 360)
+        igual, sin_metering, independiente = base.bifurcar({}, {"enable_metering": False}, {"semilla": 5},
+                                                           numeros_comunes=True)
+        
+        self.assertFalse(sin_metering.enable_metering)
+        self.assertTrue(igual.enable_metering)
+        for sim in (base, igual, sin_metering, independiente):
+            sim.ejecutar_simulacion_completa()
+        self.assertEqual(base.estadisticas, igual.estadisticas)
+        self.assertNotEqual(base.estadisticas, independiente.estadisticas)
+        
+    def test_bifurcar_independientes_por_defecto(self):
+        """test: por defecto cada bifurcacion sigue con su propia semilla hija, reproducible desde la instantanea"""
+        base = self._hasta(Simulacion(**self.config), 1440 + 360)
+        primera, segunda = base.bifurcar({}, {})
+        otra_vez, = base.bifurcar({})
+        for sim in (base, primera, segunda, otra_vez):
+            sim.ejecutar_simulacion_completa()
+        
+        self.assertNotEqual(primera.estadisticas, segunda.estadisticas)
+        self.assertNotEqual(primera.estadisticas, base.estadisticas)
+        self.assertEqual(primera.estadisticas, otra_vez.estadisticas)
+        
+    def test_cambios_invalidos(self):
+        """test: no se puede cambiar el motor ni pasar parametros desconocidos"""
+        datos = checkpoint.crear_instantanea(Simulacion(**self.config))
+        with self.assertRaises(ValueError):
+            checkpoint.restaurar_instantanea(datos, motor="vectorizado")
+        with self.assertRaises(ValueError):
+            checkpoint.restaurar_instantanea(datos, velocidad=3)
+
+class TestComparacionPareada(unittest.TestCase):
+    """tests para los flujos aleatorios con clave y la comparacion pareada"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        
+    def test_flujos_comunes_entre_variantes(self):
+        """test: con la misma semilla, activar metering no cambia llegadas, tormentas ni velocidades iniciales"""
+        sims = []
+        for metering in (False, True):
+            sim = Simulacion(lambda_param=0.2, dias_simulacion=1, storm_activa=True, storm_prob=1.0,
+                             enable_metering=metering, semilla=8)
+            sim.ejecutar_simulacion_completa()
+            sims.append(sim)
+        
+        self.assertEqual(sims[0].storm_inicio_min, sims[1].storm_inicio_min)
+        self.assertEqual(sims[0].estadisticas['total_aviones'], sims[1].estadisticas['total_aviones'])
+        self.assertEqual(sims[0]._velocidades_iniciales._bloque, sims[1]._velocidades_iniciales._bloque)
+        
+    def test_comparacion_pareada(self):
+        """test: la comparacion reporta diferencia media y errores estandar por estadistica"""
+        resultado = comparacion_pareada(num_simulaciones=4, lambda_param=0.2, dias_simulacion=1,
+                                        viento_activo=True, semilla=3)
+        
+        self.assertEqual(resultado['num_simulaciones'], 4)
+        for key in ('aterrizados', 'desviados', 'tiempo_promedio_aterrizaje'):
+            datos = resultado[key]
+            self.assertEqual(len(datos['diferencias']), 4)
+            self.assertAlmostEqual(datos['diferencia_promedio'], datos['promedio_variante'] - datos['promedio_base'])
+            self.assertGreaterEqual(datos['error_estandar'], 0)
+        self.assertEqual(resultado['total_aviones']['diferencias'], [0.0] * 4)  # mismas llegadas en cada par
+        
+    def test_variantes_iguales_no_difieren(self):
+        """test: si base y variante son iguales todas las diferencias son cero"""
+        resultado = comparacion_pareada(num_simulaciones=2, base={}, variante={}, lambda_param=0.1,
+                                        dias_simulacion=1, semilla=1)
+        for key in ('aterrizados', 'desviados', 'tiempo_promedio_aterrizaje'):
+            self.assertEqual(resultado[key]['diferencias'], [0.0, 0.0])
+
+class TestSimulacionesAdaptativas(unittest.TestCase):
+    """tests para la cantidad adaptativa de replicas"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        
+    def test_frena_al_alcanzar_la_precision(self):
+        """test: con un objetivo holgado alcanza con el primer lote"""
+        resultado = ejecutar_simulaciones_adaptativas({'aterrizados': 1e6}, min_simulaciones=3, tamano_lote=3,
+                                                      lambda_param=0.1, dias_simulacion=1, semilla=2)
+        
+        self.assertEqual(resultado['motivo_fin'], 'precision')
+        self.assertEqual(resultado['num_simulaciones'], 3)
+        self.assertTrue(resultado['precision']['aterrizados']['alcanzado'])
+        
+    def test_maximo_y_reproducibilidad(self):
+        """test: con un objetivo imposible se detiene en el maximo y coincide con ejecutar_multiples_simulaciones"""
+        resultado = ejecutar_simulaciones_adaptativas({'tiempo_promedio_aterrizaje': 0.0}, max_simulaciones=6,
+                                                      tamano_lote=2, lambda_param=0.1, dias_simulacion=1, semilla=4)
+        fijo = ejecutar_multiples_simulaciones(lambda_param=0.1, dias_simulacion=1, num_simulaciones=6, semilla=4)
+        
+        self.assertEqual(resultado['motivo_fin'], 'maximo')
+        self.assertEqual(resultado['num_simulaciones'], 6)
+        self.assertFalse(resultado['precision']['tiempo_promedio_aterrizaje']['alcanzado'])
+        self.assertEqual(resultado['aterrizados']['valores'], fijo['aterrizados']['valores'])
+        
+    def test_presupuesto(self):
+        """test: sin presupuesto de tiempo restante se devuelve lo que haya despues del primer lote"""
+        resultado = ejecutar_simulaciones_adaptativas({'desviados': 0.0}, presupuesto_segundos=0.0,
+                                                      min_simulaciones=2, tamano_lote=2,
+                                                      lambda_param=0.1, dias_simulacion=1, semilla=1)
+        self.assertEqual(resultado['motivo_fin'], 'presupuesto')
+        self.assertEqual(resultado['num_simulaciones'], 2)
+        
+    def test_estadistica_desconocida(self):
+        """test: una estadistica que no existe lanza error"""
+        with self.assertRaises(ValueError):
+            ejecutar_simulaciones_adaptativas({'velocidad': 1.0}, lambda_param=0.1, dias_simulacion=1)
+
+    def test_parametros_invalidos(self):
+        """test: menos de 2 replicas o motor='replicas' se rechazan antes de simular"""
+        for kwargs in ({'min_simulaciones': 1}, {'min_simulaciones': 3, 'max_simulaciones': 2},
+                       {'motor': 'replicas'}):
+            with self.assertRaises(ValueError):
+                ejecutar_simulaciones_adaptativas({'aterrizados': 1.0}, lambda_param=0.1, dias_simulacion=1,
+                                                  semilla=1, **kwargs)
+
+class TestMotorReplicas(unittest.TestCase):
+    """tests para el motor que avanza muchas replicas juntas en matrices"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        
+    def test_conservacion_de_aviones(self):
+        """test: en cada replica todo avion generado aterrizo, se desvio o sigue en el sistema"""
+        motor = MotorReplicas(20, lambda_param=0.25, viento_activo=True, storm_activa=True, storm_prob=0.5,
+                              enable_metering=True, semilla=3)
+        stats = motor.ejecutar(dias_simulacion=2)
+        
+        self.assertEqual(len(stats), 20)
+        for r, s in enumerate(stats):
+            self.assertEqual(s['total_aviones'], s['aterrizados'] + s['desviados'] + motor.n[r])
+            self.assertEqual(int(np.sum(motor.estado[r] != -1)), motor.n[r])
+        self.assertTrue(np.all(motor.x[:, 1:] >= motor.x[:, :-1]))  # filas ordenadas, lugares libres al final
+        
+    def test_mismas_claves_que_simulacion(self):
+        """test: cada replica tiene las mismas estadisticas que Simulacion"""
+        sim = Simulacion(lambda_param=0.1, dias_simulacion=1)
+        stats = simular_replicas(3, dias_simulacion=1, lambda_param=0.1, semilla=1)
+        self.assertEqual(set(stats[0]), set(sim.estadisticas))
+        
+    def test_reproducible(self):
+        """test: con la misma semilla y tamano de bloque el resultado es identico"""
+        a = simular_replicas(6, dias_simulacion=1, lambda_param=0.15, viento_activo=True, semilla=4, tamano_bloque=3)
+        b = simular_replicas(6, dias_simulacion=1, lambda_param=0.15, viento_activo=True, semilla=4, tamano_bloque=3)
+        self.assertEqual(a, b)
+
+    def test_no_depende_de_workers(self):
+        """test: con la misma semilla el resultado no cambia con la cantidad de workers"""
+        for tamano in ({}, {'tamano_bloque': 3}):
+            uno = simular_replicas(8, dias_simulacion=1, lambda_param=0.15, semilla=5, num_workers=1, **tamano)
+            dos = simular_replicas(8, dias_simulacion=1, lambda_param=0.15, semilla=5, num_workers=2, **tamano)
+            self.assertEqual(uno, dos)
+
+    def test_cadena_de_lideres_por_fila(self):
+        """test: la pasada unica de separacion da en cada fila lo mismo que el motor vectorizado con esos aviones"""
+        filas = ([(30.0, 245), (31.0, 250), (32.0, 250), (33.5, 250), (36.0, 245), (45.0, 210), (48.0, 230)],
+                 [(20.0, 230), (21.0, 240), (40.0, 215)])
+        motor = MotorReplicas(len(filas), lambda_param=0.0)
+        motor.tiempo_actual = 720
+        for r, aviones in enumerate(filas):
+            for j, (x, v) in enumerate(aviones):
+                motor.x[r, j], motor.v[r, j], motor.estado[r, j] = x, v, c.EN_FILA
+            motor.n[r] = len(aviones)
+        
+        motor.procesar_paso_temporal()
+        
+        for r, aviones in enumerate(filas):
+            vectorizado = MotorVectorizado()
+            for i, (x, v) in enumerate(aviones):
+                vectorizado.agregar(id=i, t_spawn=0, v=v, x=x)
+            vectorizado.avanzar(720, motivo_cierre=None, minutos_hasta_apertura=0)
+            n = len(aviones)
+            self.assertEqual(sorted(zip(motor.x[r, :n].tolist(), motor.v[r, :n].tolist(), motor.estado[r, :n].tolist())),
+                             sorted(zip(vectorizado.x[:n].tolist(), vectorizado.v[:n].tolist(), vectorizado.estado[:n].tolist())))
+        self.assertIn(c.DESVIADO, motor.estado[0].tolist())
+        
+    def test_tormentas_por_replica(self):
+        """test: cada replica tiene su propia tormenta y se desvian aviones por tormenta"""
+        motor = MotorReplicas(30, lambda_param=0.2, storm_activa=True, storm_prob=1.0, storm_duracion_min=60, semilla=2)
+        self.assertGreater(len(set(motor.storm_inicio_min.tolist())), 1)
+        stats = motor.ejecutar(dias_simulacion=1)
+        self.assertGreater(sum(s['desvios_tormenta'] for s in stats), 0)
+        
+    def test_ejecutar_multiples_simulaciones_replicas(self):
+        """test: ejecutar_multiples_simulaciones acepta motor='replicas'"""
+        stats = ejecutar_multiples_simulaciones(lambda_param=0.1, dias_simulacion=1, num_simulaciones=5,
+                                                motor="replicas", semilla=1)
+        self.assertEqual(len(stats['aterrizados']['valores']), 5)
+        self.assertGreater(stats['aterrizados']['promedio'], 0)
+
+class TestTrayectorias(unittest.TestCase):
+    """tests para la grabacion columnar de trayectorias por paso"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        self.config = dict(lambda_param=0.2, dias_simulacion=1, semilla=5, enable_metering=True)
+        
+    def _grabar(self, directorio, motor, filas_por_bloque=1 << 16):
+        with GrabadorTrayectorias(directorio, filas_por_bloque=filas_por_bloque) as grabador:
+            sim = Simulacion(**self.config, motor=motor, grabador=grabador)
+            sim.ejecutar_simulacion_completa()
+        return sim, LectorTrayectorias(directorio)
+        
+    def test_paso_coincide_con_la_simulacion(self):
+        """test: el paso grabado en un minuto tiene los mismos aviones que la simulacion en ese minuto"""
+        import tempfile
+        for motor in ("objetos", "vectorizado"):
+            with tempfile.TemporaryDirectory() as directorio:
+                with GrabadorTrayectorias(directorio) as grabador:
+                    sim = Simulacion(**self.config, motor=motor, grabador=grabador)
+                    while sim.tiempo_actual < 700:
+                        sim.procesar_paso_temporal()
+                    esperados = sim._motor.obtener_aviones() if motor == "vectorizado" else \
+                        [(a.id, a.x, a.v, a.status) for a in sim.aviones_en_sistema()]
+                lector = LectorTrayectorias(directorio)
+                paso = lector.minuto(700)
+                self.assertEqual(paso['id'].tolist(), [e[0] for e in esperados])
+                np.testing.assert_allclose(paso['x'], [e[1] for e in esperados], rtol=1e-6)
+                self.assertEqual([c.ESTADOS[e] for e in paso['estado']], [e[3] for e in esperados])
+                self.assertEqual(lector.contadores(lector.indice_minuto(700))['aterrizados'], sim.estadisticas['aterrizados'])
+                
+    def test_bloques_chicos_dan_el_mismo_archivo(self):
+        """test: volcar a disco en bloques chicos no cambia lo grabado"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+            sim, grande = self._grabar(a, "vectorizado")
+            _, chico = self._grabar(b, "vectorizado", filas_por_bloque=7)
+            self.assertEqual(len(grande), len(chico))
+            for col in grande.columnas:
+                np.testing.assert_array_equal(grande.columnas[col], chico.columnas[col])
+            ultimo = grande.contadores(len(grande) - 1)
+            self.assertEqual(ultimo['total_aviones'], sim.estadisticas['total_aviones'])
+            self.assertEqual(ultimo['cierre'], "horario")
+            
+    def test_trayectoria_de_un_avion(self):
+        """test: la trayectoria de un avion sale en minutos consecutivos desde que aparece"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as directorio:
+            _, lector = self._grabar(directorio, "objetos")
+            tray = lector.trayectoria(3)
+            self.assertTrue(np.all(tray['id'] == 3))
+            self.assertTrue(np.all(np.diff(tray['minuto']) == 1))
+            self.assertLess(float(tray['x'][0]), 100)
+            self.assertEqual(len(tray['minuto']), len(tray['x']))
+            with self.assertRaises(KeyError):
+                lector.trayectoria(10**6)
+                
+    def test_grabar_simulacion_guarda_parametros(self):
+        """test: grabar_simulacion deja los parametros de la corrida en la grabacion (los usa el replay)"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as directorio:
+            sim = grabar_simulacion(directorio, **self.config)
+            lector = LectorTrayectorias(directorio)
+            self.assertEqual(lector.parametros, self.config)
+            self.assertEqual(lector.contadores(len(lector) - 1)['aterrizados'], sim.estadisticas['aterrizados'])
+            self.assertEqual(int(lector.minutos[-1]), 1440)
+
+class TestExportarVideo(unittest.TestCase):
+    """tests para la exportacion sin ventana a imagenes y video"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        import tempfile
+        self.directorio = tempfile.mkdtemp()
+        self.grabacion = os.path.join(self.directorio, "grabacion")
+        with contextlib.redirect_stdout(io.StringIO()):
+            grabar_simulacion(self.grabacion, lambda_param=0.3, dias_simulacion=1, semilla=4)
+        
+    def tearDown(self) -> None:
+        import shutil
+        shutil.rmtree(self.directorio, ignore_errors=True)
+        
+    def test_rangos_en_paralelo_dan_los_mismos_cuadros(self):
+        """test: repartir los cuadros entre procesos da la misma secuencia que dibujarlos en orden"""
+        secuencial = os.path.join(self.directorio, "secuencial")
+        paralelo = os.path.join(self.directorio, "paralelo")
+        opciones = dict(desde_minuto=600, hasta_minuto=620, pasos_por_cuadro=2, dpi=40)
+        cuadros = exportar_video.exportar_grabacion(self.grabacion, secuencial, num_workers=1, **opciones)
+        self.assertEqual(exportar_video.exportar_grabacion(self.grabacion, paralelo, num_workers=3, **opciones), cuadros)
+        
+        self.assertEqual(cuadros, 11)
+        self.assertEqual(sorted(os.listdir(secuencial)), sorted(os.listdir(paralelo)))
+        for nombre in os.listdir(secuencial):
+            with open(os.path.join(secuencial, nombre), "rb") as a, open(os.path.join(paralelo, nombre), "rb") as b:
+                self.assertEqual(a.read(), b.read())
+                
+    def test_exportar_gif(self):
+        """test: la salida .gif une los cuadros en orden en un solo archivo"""
+        from PIL import Image
+        salida = os.path.join(self.directorio, "corrida.gif")
+        cuadros = exportar_video.exportar_grabacion(self.grabacion, salida, desde_minuto=700, hasta_minuto=704, dpi=30)
+        with Image.open(salida) as gif:
+            self.assertEqual(gif.n_frames, cuadros)
+            self.assertEqual(gif.info['loop'], 0)
+
+    def test_gif_cuadro_a_cuadro_conserva_los_cuadros(self):
+        """test: cada cuadro del gif escrito de a uno es igual al png codificado solo como gif"""
+        from PIL import Image
+        cuadros_dir = os.path.join(self.directorio, "cuadros")
+        cuadros = exportar_video.exportar_grabacion(self.grabacion, cuadros_dir, desde_minuto=700, hasta_minuto=703, dpi=30)
+        rutas = [os.path.join(cuadros_dir, f"cuadro_{k:06d}.png") for k in range(cuadros)]
+        salida = os.path.join(self.directorio, "cuadros.gif")
+        exportar_video._escribir_gif(rutas, salida, 100)
+
+        with Image.open(salida) as gif:
+            self.assertEqual(gif.n_frames, cuadros)
+            for k, ruta in enumerate(rutas):
+                gif.seek(k)
+                self.assertEqual(gif.info['duration'], 100)
+                solo = os.path.join(self.directorio, f"solo_{k}.gif")
+                with Image.open(ruta) as png:
+                    png.save(solo)
+                with Image.open(solo) as esperado:
+                    self.assertEqual(gif.convert("RGB").tobytes(), esperado.convert("RGB").tobytes())
+
+    def test_formato_desconocido(self):
+        """test: una extension que no es gif ni video da error"""
+        with self.assertRaises(ValueError):
+            exportar_video.exportar_grabacion(self.grabacion, os.path.join(self.directorio, "x.txt"),
+                                              desde_minuto=700, hasta_minuto=700, dpi=30)
+
+class TestTrabajadorSimulacion(unittest.TestCase):
+    """tests para la simulacion en un hilo que publica instantaneas"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        self.config = dict(lambda_param=0.2, dias_simulacion=1, semilla=11)
+        
+    def esperar_instantanea(self, trabajador, condicion, timeout=30.0):
+        """espera (consumiendo la cola) una instantanea que cumpla la condicion"""
+        import time
+        limite = time.perf_counter() + timeout
+        while time.perf_counter() < limite:
+            instantanea = trabajador.ultima_instantanea()
+            if instantanea is not None and condicion(instantanea):
+                return instantanea
+            time.sleep(0.001)
+        self.fail("el trabajador no publico la instantanea esperada")
+        
+    def test_mismo_resultado_que_sin_hilo(self):
+        """test: correr en el hilo da las mismas estadisticas finales que correr directo con la misma semilla"""
+        directa = Simulacion(**self.config)
+        while directa.tiempo_actual < directa.dias_simulacion * 1440:
+            directa.procesar_paso_temporal()
+        directa.calcular_estadisticas_finales()
+        
+        trabajador = TrabajadorSimulacion(Simulacion(**self.config), intervalo_base=1e-6)
+        trabajador.start()
+        final = self.esperar_instantanea(trabajador, lambda i: i.terminada)
+        trabajador.detener()
+        trabajador.join(timeout=5)
+        
+        self.assertFalse(trabajador.is_alive())
+        self.assertEqual(final.tiempo_actual, 1440)
+        self.assertEqual(final.estadisticas, directa.obtener_estadisticas())
+        
+    def test_pausa_y_reinicio(self):
+        """test: en pausa no avanza, al reanudar si, y reiniciar publica el estado inicial"""
+        import time
+        trabajador = TrabajadorSimulacion(Simulacion(**self.config), intervalo_base=1e-4)
+        inicial = trabajador.ultima_instantanea()
+        trabajador.pausar(True)
+        trabajador.start()
+        time.sleep(0.05)
+        self.assertIsNone(trabajador.ultima_instantanea())
+        
+        trabajador.pausar(False)
+        avanzada = self.esperar_instantanea(trabajador, lambda i: i.tiempo_actual > inicial.tiempo_actual + 100)
+        self.assertIsNotNone(avanzada.anteriores)
+        
+        trabajador.pausar(True)
+        trabajador.reiniciar()
+        reiniciada = self.esperar_instantanea(trabajador, lambda i: i.tiempo_actual == 0)
+        self.assertEqual(reiniciada.estadisticas['total_aviones'], 0)
+        self.assertEqual(len(reiniciada.columnas['id']), 0)
+        trabajador.detener()
+        trabajador.join(timeout=5)
+
+    def test_reinicio_descarta_instantaneas_viejas(self):
+        """test: despues de reiniciar no se entregan instantaneas de la corrida anterior, aunque se publiquen tarde"""
+        sim = Simulacion(**self.config)
+        trabajador = TrabajadorSimulacion(sim)  # sin arrancar el hilo: los pasos del trabajador se hacen a mano
+        for _ in range(700):
+            sim.procesar_paso_temporal()
+        trabajador._publicar(None)  # quedo en la cola antes del reinicio
+
+        trabajador.reiniciar()
+        self.assertIsNone(trabajador.ultima_instantanea())
+        sim.procesar_paso_temporal()
+        trabajador._publicar(None)  # el trabajador publica otra antes de atender el mensaje de reinicio
+        self.assertIsNone(trabajador.ultima_instantanea())
+
+        self.assertTrue(trabajador._atender(*trabajador.control.get_nowait()))
+        reiniciada = trabajador.ultima_instantanea()
+        self.assertEqual(reiniciada.tiempo_actual, 0)
+        self.assertEqual(reiniciada.reinicio, 1)
+
+    def test_instantaneas_inmutables(self):
+        """test: las columnas publicadas son copias de solo lectura que no cambian al seguir simulando"""
+        sim = Simulacion(**self.config)
+        for _ in range(700):
+            sim.procesar_paso_temporal()
+        trabajador = TrabajadorSimulacion(sim)
+        instantanea = trabajador.ultima_instantanea()
+        x = instantanea.columnas['x'].copy()
+        self.assertGreater(len(x), 0)
+        with self.assertRaises(ValueError):
+            instantanea.columnas['x'][0] = 0.0
+        for _ in range(5):
+            sim.procesar_paso_temporal()
+        np.testing.assert_array_equal(instantanea.columnas['x'], x)
+
+
+class TestExperimentos(unittest.TestCase):
+    """tests para la corrida de experimentos desde archivos de configuracion"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        import tempfile
+        self.directorio = tempfile.mkdtemp()
+        self.config = {
+            "comun": {"dias_simulacion": 1, "num_simulaciones": 3, "semilla": 5},
+            "experimentos": [
+                {"nombre": "base", "lambda_param": 0.1},
+                {"lambda_param": 0.2, "viento_activo": True, "semilla": 6},
+            ],
+        }
+        
+    def tearDown(self) -> None:
+        import shutil
+        shutil.rmtree(self.directorio, ignore_errors=True)
+        
+    def escribir(self, nombre, contenido):
+        """escribe un archivo de configuracion json en el directorio temporal"""
+        import json
+        ruta = os.path.join(self.directorio, nombre)
+        with open(ruta, "w") as f:
+            json.dump(contenido, f)
+        return ruta
+        
+    def test_cargar_con_valores_comunes(self):
+        """test: cada experimento hereda "comun", puede pisarlo y sin nombre toma uno del archivo"""
+        base, viento = experimentos.cargar_experimentos(self.escribir("barrido.json", self.config))
+        self.assertEqual(base, {"nombre": "base", "dias_simulacion": 1, "num_simulaciones": 3, "semilla": 5, "lambda_param": 0.1})
+        self.assertEqual(viento["nombre"], "barrido[1]")
+        self.assertEqual(viento["semilla"], 6)
+        self.assertTrue(viento["viento_activo"])
+        
+        unico, = experimentos.cargar_experimentos(self.escribir("unico.json", {"lambda_param": 0.1, "dias_simulacion": 2}))
+        self.assertEqual(unico["nombre"], "unico")
+        
+    def test_configuraciones_invalidas(self):
+        """test: parametros desconocidos, faltantes o formatos no soportados dan error"""
+        with self.assertRaises(ValueError):
+            experimentos.cargar_experimentos(self.escribir("a.json", {"lambda": 0.1, "dias_simulacion": 1}))
+        with self.assertRaises(ValueError):
+            experimentos.cargar_experimentos(self.escribir("b.json", {"lambda_param": 0.1}))
+        with self.assertRaises(ValueError):
+            experimentos.cargar_experimentos(self.escribir("c.toml", {"lambda_param": 0.1, "dias_simulacion": 1}))
+            
+    @unittest.skipUnless(importlib.util.find_spec("yaml"), "requiere PyYAML")
+    def test_yaml_igual_que_json(self):
+        """test: el mismo contenido en yaml define los mismos experimentos"""
+        import yaml
+        ruta = os.path.join(self.directorio, "barrido.yaml")
+        with open(ruta, "w") as f:
+            yaml.safe_dump(self.config, f)
+        self.assertEqual(experimentos.cargar_experimentos(ruta),
+                         experimentos.cargar_experimentos(self.escribir("barrido.json", self.config)))
+        
+    def test_resultados_iguales_a_ejecutar_directo(self):
+        """test: los resultados guardados coinciden con ejecutar_multiples_simulaciones y son json valido"""
+        import json
+        resultado = experimentos.ejecutar_configs([self.escribir("barrido.json", self.config)])
+        salida = os.path.join(self.directorio, "res", "resultado.json")
+        experimentos.guardar_resultados(resultado, salida)
+        experimentos.guardar_resumen_csv(resultado, os.path.join(self.directorio, "res", "resumen.csv"))
+        with open(salida) as f:
+            guardado = json.load(f)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            directo = ejecutar_multiples_simulaciones(0.1, 1, 3, semilla=5)
+        base = guardado["experimentos"][0]
+        self.assertEqual(base["nombre"], "base")
+        for clave in ("aterrizados", "desviados", "tiempo_promedio_aterrizaje"):
+            self.assertAlmostEqual(base["estadisticas"][clave]["promedio"], float(directo[clave]["promedio"]))
+            self.assertEqual(base["estadisticas"][clave]["valores"], [float(v) for v in directo[clave]["valores"]])
+        with open(os.path.join(self.directorio, "res", "resumen.csv")) as f:
+            self.assertEqual(len(f.readlines()), 1 + 2 * len(CLAVES_REPLICA))
+            
+    def test_no_importa_matplotlib(self):
+        """test: correr experimentos desde la linea de comandos no carga matplotlib"""
+        import subprocess
+        ruta = self.escribir("chico.json", {"lambda_param": 0.1, "dias_simulacion": 1, "num_simulaciones": 1, "semilla": 1})
+        codigo = ("import sys, experimentos; sys.argv = ['experimentos.py', %r, '--salida', %r]; "
+                  "codigo = experimentos.main(); print('matplotlib' in sys.modules); sys.exit(codigo)"
+                  % (ruta, os.path.join(self.directorio, "r.json")))
+        salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=120)
+        self.assertEqual(salida.returncode, 0, salida.stderr)
+        self.assertEqual(salida.stdout.strip(), "False")
+        self.assertTrue(os.path.exists(os.path.join(self.directorio, "r.json")))
+
+
+class TestCacheReplicas(unittest.TestCase):
+    """tests para el cache en disco de replicas"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        import tempfile
+        self.directorio = tempfile.mkdtemp()
+        self.config = dict(lambda_param=0.1, dias_simulacion=1, viento_activo=True, p_goaround=0.2)
+        
+    def tearDown(self) -> None:
+        import shutil
+        shutil.rmtree(self.directorio, ignore_errors=True)
+        
+    def correr(self, num_simulaciones, **cambios):
+        """ejecutar_multiples_simulaciones en silencio"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return ejecutar_multiples_simulaciones(num_simulaciones=num_simulaciones, **{**self.config, **cambios})
+        
+    def test_clave_depende_de_config_y_semilla(self):
+        """test: la clave no depende del orden de las claves pero si de cada valor y de la semilla"""
+        self.assertEqual(clave_escenario({'a': 1, 'b': 2.5}, 3), clave_escenario({'b': 2.5, 'a': 1}, 3))
+        self.assertNotEqual(clave_escenario({'a': 1, 'b': 2.5}, 3), clave_escenario({'a': 1, 'b': 2.5}, 4))
+        self.assertNotEqual(clave_escenario({'a': 1, 'b': 2.5}, 3), clave_escenario({'a': 1, 'b': 2.6}, 3))
+
+    def test_version_invalida_lo_guardado(self):
+        """test: cambiar VERSION cambia la clave, asi las replicas de una logica anterior no se reutilizan"""
+        import cache_replicas
+        actual = cache_replicas.VERSION
+        clave = clave_escenario(self.config, 8)
+        cache_replicas.VERSION = actual - 1
+        try:
+            self.assertNotEqual(clave_escenario(self.config, 8), clave)
+            self.correr(2, semilla=8, cache=self.directorio)
+        finally:
+            cache_replicas.VERSION = actual
+        self.assertEqual(clave_escenario(self.config, 8), clave)
+        self.assertEqual(len(os.listdir(self.directorio)), 1)
+        self.correr(2, semilla=8, cache=self.directorio)  # no encuentra las de la version anterior: calcula otra entrada
+        self.assertEqual(len(os.listdir(self.directorio)), 2)
+
+    def test_agregar_solo_las_faltantes(self):
+        """test: pedir mas replicas agrega solo las que faltan y el resultado es igual a correr todo sin cache"""
+        import sim_core
+        sin_cache = self.correr(6, semilla=8)
+        self.correr(4, semilla=8, cache=self.directorio)
+        
+        calculadas = []
+        original = sim_core._ejecutar_replica
+        def contar(config, semilla=None):
+            calculadas.append(semilla.spawn_key)
+            return original(config, semilla)
+        sim_core._ejecutar_replica = contar
+        try:
+            con_cache = self.correr(6, semilla=8, cache=self.directorio)
+            repetida = self.correr(6, semilla=8, cache=self.directorio)
+            menos = self.correr(3, semilla=8, cache=self.directorio)
+        finally:
+            sim_core._ejecutar_replica = original
+            
+        self.assertEqual(calculadas, [(4,), (5,)])
+        for key in CLAVES_REPLICA:
+            self.assertEqual(con_cache[key]['valores'], sin_cache[key]['valores'])
+            self.assertEqual(repetida[key]['valores'], sin_cache[key]['valores'])
+            self.assertEqual(menos[key]['valores'], sin_cache[key]['valores'][:3])
+            
+    def test_escenarios_separados(self):
+        """test: otra semilla u otra configuracion no reutilizan las replicas guardadas"""
+        self.correr(2, semilla=1, cache=self.directorio)
+        self.correr(2, semilla=2, cache=self.directorio)
+        self.correr(2, semilla=1, cache=self.directorio, enable_metering=True)
+        self.assertEqual(len(os.listdir(self.directorio)), 3)
+        
+    def test_memmap_y_fila_incompleta(self):
+        """test: las replicas se leen con memmap y una fila a medio escribir se descarta al agregar"""
+        almacen = CacheReplicas(self.directorio)
+        config = {'lambda_param': 0.1}
+        fila = {key: i for i, key in enumerate(CLAVES_REPLICA)}
+        almacen.agregar(config, 1, [fila, fila])
+        self.assertIsInstance(almacen.leer(config, 1), np.memmap)
+        ruta = os.path.join(self.directorio, clave_escenario(config, 1), "replicas.bin")
+        with open(ruta, "ab") as f:
+            f.write(b"\x00" * 5)
+        self.assertEqual(almacen.cantidad(config, 1), 2)
+        almacen.agregar(config, 1, [fila])
+        self.assertEqual(almacen.replicas(config, 1, 10), [fila] * 3)
+        
+    def test_requiere_semilla(self):
+        """test: el cache sin semilla o con el motor de replicas da error"""
+        with self.assertRaises(ValueError):
+            self.correr(2, cache=self.directorio)
+        with self.assertRaises(ValueError):
+            self.correr(2, semilla=1, motor="replicas", cache=self.directorio)
+
+
+class TestConteosPoisson(unittest.TestCase):
+    """tests para el estimador vectorizado de conteos poisson por ventana"""
+    
+    def setUp(self) -> None:
+        """configuracion inicial para cada test"""
+        np.random.seed(42)
+        
+    def test_formas_y_valores_teoricos(self):
+        """test: una fila por lambda, una columna por ventana y un valor por k, con la pmf teorica exacta"""
+        import math
+        resultado = estimar_conteos_poisson([0.05, 0.1], [30, 60, 90], k=[0, 3, 5], num_simulaciones=500, semilla=1)
+        self.assertEqual(resultado['probabilidad_simulada'].shape, (2, 3, 3))
+        self.assertEqual(resultado['probabilidad_al_menos_teorica'].shape, (2, 3, 3))
+        self.assertNotIn('histograma', resultado)
+        self.assertNotIn('conteos', resultado)
+        
+        mu = 0.1 * 60
+        self.assertAlmostEqual(resultado['probabilidad_teorica'][1, 1, 2], mu**5 * math.exp(-mu) / math.factorial(5))
+        self.assertAlmostEqual(resultado['probabilidad_al_menos_teorica'][1, 1, 1],
+                               1 - sum(mu**j * math.exp(-mu) / math.factorial(j) for j in range(3)))
+        np.testing.assert_allclose(resultado['probabilidad_al_menos_teorica'][..., 0], 1.0)
+        
+    def test_simulado_cerca_de_teorico(self):
+        """test: con muchas simulaciones lo simulado queda dentro de unos pocos errores estandar de lo teorico"""
+        resultado = estimar_conteos_poisson([1 / 60, 0.1, 0.25], [15, 60], k=[1, 5, 12], num_simulaciones=20000, semilla=3)
+        error = np.abs(resultado['probabilidad_simulada'] - resultado['probabilidad_teorica'])
+        tolerancia = 5 * np.sqrt(resultado['probabilidad_teorica'] * (1 - resultado['probabilidad_teorica']) / 20000) + 1e-4
+        self.assertTrue((error <= tolerancia).all())
+        
+    def test_histograma_y_muestras_consistentes(self):
+        """test: el histograma (con bin de desborde) coincide con las muestras crudas y no depende del lote"""
+        resultado = estimar_conteos_poisson([0.2], [60], k=5, num_simulaciones=300, k_max=15,
+                                            histograma=True, muestras=True, semilla=4)
+        conteos = resultado['conteos'][0, 0]
+        histograma = resultado['histograma'][0, 0]
+        self.assertEqual(len(histograma), 17)
+        np.testing.assert_array_equal(histograma[:16], np.bincount(conteos, minlength=16)[:16])
+        self.assertEqual(histograma[16], int((conteos > 15).sum()))
+        self.assertAlmostEqual(resultado['probabilidad_simulada'][0, 0, 0], float(np.mean(conteos == 5)))
+        self.assertAlmostEqual(resultado['probabilidad_al_menos_simulada'][0, 0, 0], float(np.mean(conteos >= 5)))
+        self.assertAlmostEqual(resultado['histograma_teorico'][0, 0].sum(), 1.0)
+        
+        por_lotes = estimar_conteos_poisson([0.2], [60], k=5, num_simulaciones=300, k_max=15, histograma=True,
+                                            semilla=4, tamano_lote=7)
+        self.assertEqual(por_lotes['histograma'].sum(), 300)
+        
+    def test_mu_grande_y_cero(self):
+        """test: la pmf teorica no se anula con medias grandes y con lambda 0 toda la masa esta en 0"""
+        resultado = estimar_conteos_poisson([0.0, 20.0], [60], k=[0, 1200], num_simulaciones=10, semilla=5)
+        self.assertEqual(resultado['probabilidad_teorica'][0, 0, 0], 1.0)
+        self.assertEqual(resultado['probabilidad_simulada'][0, 0, 0], 1.0)
+        self.assertGreater(resultado['probabilidad_teorica'][1, 0, 1], 0.0)
+        with self.assertRaises(ValueError):
+            estimar_conteos_poisson([-0.1], [60])
+
+
 def ejecutar_todos_los_tests() -> bool:
     """funcion para ejecutar todos los tests y mostrar resultados"""
     print("ejecutando tests comprehensivos de la simulacion de aviones...")
@@ -867,14 +2262,33 @@ def ejecutar_todos_los_tests() -> bool:
     # agregar todas las clases de test
     test_classes = [
         TestPlane,
+        TestPlaneCompacto,
         TestSimulacion,
         TestTormentas,
         TestViento,
         TestCasosBorde,
         TestEstadisticas,
+        TestModoStreaming,
         TestFuncionesAuxiliares,
         TestSimulacionesMultiples,
-        TestIntegracion
+        TestFlujosAproximacionDesvio,
+        TestIntegracion,
+        TestColaAviones,
+        TestSaltoPeriodosInactivos,
+        TestMotorVectorizado,
+        TestGeneradorPropio,
+        TestBenchmarks,
+        TestPerfilador,
+        TestCheckpoint,
+        TestComparacionPareada,
+        TestSimulacionesAdaptativas,
+        TestMotorReplicas,
+        TestTrayectorias,
+        TestExportarVideo,
+        TestTrabajadorSimulacion,
+        TestExperimentos,
+        TestCacheReplicas,
+        TestConteosPoisson
     ]
     
     for test_class in test_classes:
@@ -0,0 +1,199 @@
+"""
+grabacion y lectura de trayectorias de una simulacion
+
+formato en disco (un directorio):
+    <columna>.bin        una fila por avion activo y minuto grabado, en orden de minuto (binario crudo, memmap)
+    minutos.npy          minuto de la simulacion de cada paso grabado
+    offsets.npy          fila inicial de cada paso (len = pasos + 1): el paso i son las filas offsets[i]:offsets[i+1]
+    contadores.npy       estadisticas acumuladas y motivo de cierre al final de cada paso (una fila por paso)
+    primer_paso.npy      primer y ultimo paso grabado de cada avion (indexado por id), para leer una trayectoria
+    ultimo_paso.npy      sin recorrer todo el archivo
+    meta.json            tipos, cantidad de filas, columnas de contadores y parametros de la simulacion
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+# columnas por avion y su tipo en disco
+COLUMNAS = {
+    "id": np.int32,
+    "x": np.float32,
+    "v": np.float32,
+    "estado": np.uint8,              # codigo de const.ESTADOS
+    "tiempo_estimado": np.float32,   # nan = sin estimacion
+    "sta_meter": np.float32,         # nan = sin sta de metering
+}
+
+# contadores por paso (acumulados, como en Simulacion.estadisticas) y motivo de cierre del aeropuerto
+CONTADORES = ("total_aviones", "aterrizados", "desviados", "desvios_a_montevideo", "desvios_viento",
+              "desvios_tormenta", "desvios_cierre", "reincerciones_exitosas", "cierre")
+CIERRES = (None, "horario", "tormenta")  # codigo de la columna cierre
+
+FORMATO = 1
+
+
+# graba una fila por avion y minuto en buffers columnares que se vuelcan a disco por bloques.
+# uso: with GrabadorTrayectorias(ruta) as g: Simulacion(..., grabador=g).ejecutar_simulacion_completa()
+class GrabadorTrayectorias:
+
+    def __init__(self, ruta: str, filas_por_bloque: int = 1 << 16, parametros: Optional[dict] = None) -> None:
+        os.makedirs(ruta, exist_ok=True)
+        self.ruta = ruta
+        self.parametros = parametros or {}    # configuracion de la simulacion, se guarda en meta.json para el replay
+        self.filas_por_bloque = filas_por_bloque
+        self._archivos = {col: open(os.path.join(ruta, f"{col}.bin"), "wb") for col in COLUMNAS}
+        self._buffers = {col: np.empty(filas_por_bloque, dtype=tipo) for col, tipo in COLUMNAS.items()}
+        self._llenas = 0                      # filas ocupadas del buffer
+        self.filas = 0                        # filas grabadas en total
+        self._minutos = []
+        self._offsets = [0]
+        self._contadores = []
+        self._primer_paso = np.full(1024, -1, dtype=np.int64)
+        self._ultimo_paso = np.full(1024, -1, dtype=np.int64)
+        self.cerrado = False
+
+    def __enter__(self) -> "GrabadorTrayectorias":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    # escribe a disco las filas pendientes del buffer
+    def _volcar(self) -> None:
+        for col, archivo in self._archivos.items():
+            self._buffers[col][:self._llenas].tofile(archivo)
+        self._llenas = 0
+
+    # graba el estado de los aviones activos en el minuto dado; columnas es un dict con un arreglo por COLUMNAS
+    def registrar(self, minuto: int, columnas: Dict[str, np.ndarray], contadores: Dict[str, int]) -> None:
+        n = len(columnas["id"])
+        paso = len(self._minutos)
+        if self._llenas + n > self.filas_por_bloque:
+            self._volcar()
+        if n > self.filas_por_bloque:  # no entra en el buffer: directo al archivo
+            for col, archivo in self._archivos.items():
+                np.asarray(columnas[col], dtype=COLUMNAS[col]).tofile(archivo)
+        elif n:
+            for col in COLUMNAS:
+                self._buffers[col][self._llenas:self._llenas + n] = columnas[col]
+            self._llenas += n
+
+        if n:
+            ids = np.asarray(columnas["id"], dtype=np.int64)
+            tope = int(ids.max()) + 1
+            if tope > len(self._primer_paso):
+                capacidad = max(tope, 2 * len(self._primer_paso))
+                self._primer_paso = np.concatenate([self._primer_paso, np.full(capacidad - len(self._primer_paso), -1)])
+                self._ultimo_paso = np.concatenate([self._ultimo_paso, np.full(capacidad - len(self._ultimo_paso), -1)])
+            nuevos = ids[self._primer_paso[ids] < 0]
+            self._primer_paso[nuevos] = paso
+            self._ultimo_paso[ids] = paso
+
+        self.filas += n
+        self._minutos.append(minuto)
+        self._offsets.append(self.filas)
+        self._contadores.append([contadores[k] for k in CONTADORES])
+
+    # vuelca lo pendiente y escribe el indice; el directorio queda listo para LectorTrayectorias
+    def cerrar(self) -> None:
+        if self.cerrado:
+            return
+        self._volcar()
+        for archivo in self._archivos.values():
+            archivo.close()
+        np.save(os.path.join(self.ruta, "minutos.npy"), np.array(self._minutos, dtype=np.int64))
+        np.save(os.path.join(self.ruta, "offsets.npy"), np.array(self._offsets, dtype=np.int64))
+        np.save(os.path.join(self.ruta, "contadores.npy"),
+                np.array(self._contadores, dtype=np.int64).reshape(-1, len(CONTADORES)))
+        tope = int(np.flatnonzero(self._primer_paso >= 0).max()) + 1 if (self._primer_paso >= 0).any() else 0
+        np.save(os.path.join(self.ruta, "primer_paso.npy"), self._primer_paso[:tope])
+        np.save(os.path.join(self.ruta, "ultimo_paso.npy"), self._ultimo_paso[:tope])
+        meta = {
+            "formato": FORMATO,
+            "filas": self.filas,
+            "pasos": len(self._minutos),
+            "columnas": {col: np.dtype(tipo).name for col, tipo in COLUMNAS.items()},
+            "contadores": list(CONTADORES),
+            "parametros": self.parametros,
+        }
+        with open(os.path.join(self.ruta, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        self.cerrado = True
+
+
+# lee un directorio de trayectorias con memmap: solo se cargan las filas que se piden
+class LectorTrayectorias:
+
+    def __init__(self, ruta: str) -> None:
+        with open(os.path.join(ruta, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta["formato"] != FORMATO:
+            raise ValueError(f"formato de trayectorias no soportado: {self.meta['formato']}")
+        self.parametros = self.meta.get("parametros", {})
+        filas = self.meta["filas"]
+        self.columnas = {}
+        for col, tipo in self.meta["columnas"].items():
+            if filas:
+                self.columnas[col] = np.memmap(os.path.join(ruta, f"{col}.bin"), dtype=tipo, mode="r", shape=(filas,))
+            else:  # memmap no acepta archivos vacios
+                self.columnas[col] = np.zeros(0, dtype=tipo)
+        self.minutos = np.load(os.path.join(ruta, "minutos.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(ruta, "offsets.npy"), mmap_mode="r")
+        self._contadores = np.load(os.path.join(ruta, "contadores.npy"), mmap_mode="r")
+        self._primer_paso = np.load(os.path.join(ruta, "primer_paso.npy"), mmap_mode="r")
+        self._ultimo_paso = np.load(os.path.join(ruta, "ultimo_paso.npy"), mmap_mode="r")
+
+    # cantidad de pasos grabados
+    def __len__(self) -> int:
+        return len(self.minutos)
+
+    # indice del ultimo paso grabado en o antes del minuto dado (los periodos sin aviones que se saltean no se graban)
+    def indice_minuto(self, minuto: int) -> int:
+        i = int(np.searchsorted(self.minutos, minuto, side="right")) - 1
+        if i < 0:
+            raise IndexError(f"no hay pasos grabados antes del minuto {minuto}")
+        return i
+
+    # aviones del paso i: dict columna -> arreglo (copia chica, solo las filas de ese paso)
+    def paso(self, i: int) -> Dict[str, np.ndarray]:
+        inicio, fin = int(self.offsets[i]), int(self.offsets[i + 1])
+        return {col: np.array(valores[inicio:fin]) for col, valores in self.columnas.items()}
+
+    # aviones en el minuto dado (el ultimo paso grabado en o antes de ese minuto)
+    def minuto(self, minuto: int) -> Dict[str, np.ndarray]:
+        return self.paso(self.indice_minuto(minuto))
+
+    # contadores acumulados al final del paso i (cierre como None, "horario" o "tormenta")
+    def contadores(self, i: int) -> dict:
+        fila = self._contadores[i]
+        resultado = {k: int(v) for k, v in zip(self.meta["contadores"], fila)}
+        resultado["cierre"] = CIERRES[resultado["cierre"]]
+        return resultado
+
+    # trayectoria de un avion: minuto y columnas de cada paso en que estuvo activo.
+    # solo lee el bloque contiguo de filas entre su primer y su ultimo paso
+    def trayectoria(self, id: int) -> Dict[str, np.ndarray]:
+        if not 0 <= id < len(self._primer_paso) or self._primer_paso[id] < 0:
+            raise KeyError(f"el avion {id} no aparece en la grabacion")
+        primero, ultimo = int(self._primer_paso[id]), int(self._ultimo_paso[id])
+        inicio, fin = int(self.offsets[primero]), int(self.offsets[ultimo + 1])
+        propias = np.flatnonzero(self.columnas["id"][inicio:fin] == id)
+        por_paso = np.diff(self.offsets[primero:ultimo + 2])
+        minuto_fila = np.repeat(self.minutos[primero:ultimo + 1], por_paso)
+        resultado = {"minuto": minuto_fila[propias]}
+        for col, valores in self.columnas.items():
+            resultado[col] = np.array(valores[inicio:fin][propias])
+        return resultado
+
+
+# corre una simulacion completa grabando cada paso en ruta (config son los parametros de Simulacion).
+# devuelve la simulacion terminada; la grabacion se abre con LectorTrayectorias(ruta)
+def grabar_simulacion(ruta: str, filas_por_bloque: int = 1 << 16, **config):
+    from sim_core import Simulacion  # import diferido: sim_core importa este modulo
+    with GrabadorTrayectorias(ruta, filas_por_bloque=filas_por_bloque, parametros=config) as grabador:
+        sim = Simulacion(**config, grabador=grabador)
+        sim.ejecutar_simulacion_completa()
+    return sim
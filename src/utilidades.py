@@ -1,3 +1,4 @@
+import bisect
 import const as c
 import numpy as np
 from typing import Optional, Tuple
@@ -6,18 +7,98 @@ from typing import Optional, Tuple
 def knots_to_mn_per_min(knots: float) -> float:
     return knots / 60.0
 
+# versiones numpy de las tablas compiladas de const (para el motor vectorizado)
+BORDES_RANGOS = np.array(c.BORDES_RANGOS, dtype=float)
+VMIN_RANGOS = np.array(c.VMIN_RANGOS, dtype=float)
+VMAX_RANGOS = np.array(c.VMAX_RANGOS, dtype=float)
+MINUTOS_VMAX_DESDE_BORDE = np.array(c.MINUTOS_VMAX_DESDE_BORDE)
+_LISTA_RANGOS = np.array(c.LISTA_RANGOS, dtype=float)
+_ANCHOS_LISTA_RANGOS = np.array(c.ANCHOS_LISTA_RANGOS, dtype=float)
+_ETA_BASE_LISTA_RANGOS = np.array(c.ETA_BASE_LISTA_RANGOS)
+
+# indice del rango de la distancia en las tablas compiladas (0 = rango de 0 a 5 mn), por debajo de 0 usa el primero
+def indice_rango(distancia: float) -> int:
+    return max(0, bisect.bisect_right(c.BORDES_RANGOS, distancia) - 1)
+
+# version vectorizada de indice_rango
+def indice_rango_vec(x: np.ndarray) -> np.ndarray:
+    return np.maximum(np.searchsorted(BORDES_RANGOS, x, side="right") - 1, 0)
+
 # devuelve rango de velocidades permitidas con forma de tupla (vmin, vmax)
 def velocidad_permitida(distancia) -> Optional[Tuple[int, int]]:
-    for dmin, dmax, rango in c.rangos:
-        if dmin <= distancia < dmax:
-            return rango
-    return None
+    if not 0 <= distancia < float('inf'):
+        return None
+    return c.RANGOS_VELOCIDAD[bisect.bisect_right(c.BORDES_RANGOS, distancia) - 1]
+
+# version vectorizada de velocidad_permitida, devuelve los arreglos (vmin, vmax)
+def velocidad_permitida_vec(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    k = indice_rango_vec(x)
+    return VMIN_RANGOS[k], VMAX_RANGOS[k]
+
+# devuelve los limites (dmin, dmax) del rango de la distancia
+def limites_rango(distancia: float) -> Tuple[float, float]:
+    i = indice_rango(distancia)
+    return (c.BORDES_RANGOS[i], c.TOPES_RANGOS[i])
+
+# minutos minimos para llegar de la distancia hasta el umbral (0 mn) volando a vmax en cada rango
+def minutos_vmax_al_umbral(distancia: float) -> float:
+    i = indice_rango(distancia)
+    return c.MINUTOS_VMAX_DESDE_BORDE[i] + 60 * (distancia - c.BORDES_RANGOS[i]) / c.VMAX_RANGOS[i]
+
+# version vectorizada de minutos_vmax_al_umbral
+def minutos_vmax_al_umbral_vec(x: np.ndarray) -> np.ndarray:
+    k = indice_rango_vec(x)
+    return MINUTOS_VMAX_DESDE_BORDE[k] + 60 * (x - BORDES_RANGOS[k]) / VMAX_RANGOS[k]
+
+# estimacion de arribo de Plane.time_to_arrive: base acumulada de los tramos completos + el tramo actual a velocidad v
+def tiempo_estimado_arribo(x: float, v: float) -> float:
+    k = bisect.bisect_left(c.LISTA_RANGOS, x)  # primer limite >= x
+    if k == len(c.LISTA_RANGOS):
+        return c.ETA_BASE_LISTA_RANGOS[k]
+    return c.ETA_BASE_LISTA_RANGOS[k] + tiempo_min_para_mn(v, c.ANCHOS_LISTA_RANGOS[k])
+
+# version vectorizada de tiempo_estimado_arribo
+def tiempo_estimado_arribo_vec(x: np.ndarray, v: np.ndarray) -> np.ndarray:
+    k = np.searchsorted(_LISTA_RANGOS, x, side="left")
+    t = _ETA_BASE_LISTA_RANGOS[k]
+    dentro = k < len(_LISTA_RANGOS)
+    with np.errstate(divide="ignore"):
+        tramo = 60 * _ANCHOS_LISTA_RANGOS[np.minimum(k, len(_ANCHOS_LISTA_RANGOS) - 1)] / v
+    return np.where(dentro, t + tramo, t)
 
 # dar un valor de uniforme en el rango x,y
 def random_uniform(x,y) -> float:
     numero_random = np.random.uniform(x, y)
     return numero_random
 
+# uniformes [0, 1) sorteados en bloque desde un np.random.Generator y entregados de a uno:
+# evita el costo de una llamada escalar de numpy por cada sorteo
+class BufferAleatorio:
+
+    def __init__(self, rng: np.random.Generator, tamano_bloque: int = 4096) -> None:
+        self.rng = rng
+        self.tamano_bloque = tamano_bloque
+        self._bloque = []
+        self._i = 0
+
+    # siguiente uniforme del bloque, vuelve a sortear un bloque entero cuando se agota
+    def siguiente(self) -> float:
+        if self._i >= len(self._bloque):
+            self._bloque = self.rng.random(self.tamano_bloque).tolist()
+            self._i = 0
+        valor = self._bloque[self._i]
+        self._i += 1
+        return valor
+
+    # uniforme en [x, y)
+    def uniforme(self, x: float, y: float) -> float:
+        return x + (y - x) * self.siguiente()
+
+    # True con probabilidad p
+    def bernoulli(self, p: float) -> bool:
+        return self.siguiente() < p
+
+
 def tiempo_min_para_mn(nudos,mn) -> float:
     # evitar division por cero
     if nudos == 0:
@@ -55,21 +136,11 @@ def clamp(x, lo, hi):
 def tiempo_min_vmax_a_punto(x_from: float, x_to: float) -> float:
     """
     Tiempo mínimo (min) para ir de x_from -> x_to (x_to <= x_from),
-    usando v_max de cada rango de const.rangos.
+    usando v_max de cada rango de const.rangos (diferencia de la tabla acumulada).
     """
     if x_from <= x_to:
         return 0.0
-    t = 0.0
-    a = x_to
-    b = x_from
-    for dmin, dmax, (vmin, vmax) in c.rangos:
-        hi = dmax if dmax != float('inf') else b
-        seg_lo = max(dmin, a)
-        seg_hi = min(hi, b)
-        if seg_hi > seg_lo:
-            dist = seg_hi - seg_lo  # mn
-            t += tiempo_min_para_mn(vmax, dist)
-    return t
+    return minutos_vmax_al_umbral(x_from) - minutos_vmax_al_umbral(x_to)
 
 def eta_const_speed_to_point(x_actual: float, v_actual: float, x_point: float, now_min: int) -> float:
     """
@@ -1,16 +1,23 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.widgets import Slider, Button
+from matplotlib.colors import to_rgba
 import numpy as np
 import time
+import os
 from sim_core import Simulacion
-from plane import Plane
+from trayectorias import LectorTrayectorias, grabar_simulacion
+from simulacion_en_hilo import Instantanea, TrabajadorSimulacion, columnas_aviones
 from utilidades import ask_bool, ask_pos_int, ask_prob_01
 import const as c
-from typing import List, Dict, Any, Optional
+from typing import Dict, Optional
 
-# visualizador tipo videojuego para la simulacion de aviones
+# visualizador tipo videojuego para la simulacion de aviones.
+# la simulacion corre en un TrabajadorSimulacion (otro hilo); la interfaz dibuja la ultima instantanea publicada
+# y le manda la pausa, la velocidad y el reset como mensajes
 class visualizador_videojuego:
+
+    trabajador: Optional[TrabajadorSimulacion] = None  # el replay no tiene simulacion en vivo
     
     def __init__(self, lambda_param: float, dias_simulacion: int = 3, viento: bool = False, p_go: float = 0.10,
                  tormenta: bool = False, p_tormenta: float = 0.0,  t_dur: int = 30, enable_metering: bool = False) -> None:
@@ -20,14 +27,26 @@ class visualizador_videojuego:
                               storm_prob=p_tormenta,
                               storm_duracion_min=t_dur,
                               enable_metering=enable_metering)
+        self.trabajador = TrabajadorSimulacion(self.sim)
+        self._instantanea: Instantanea = self.trabajador.ultima_instantanea()  # ultimo estado publicado por el trabajador
+        self._finales_mostradas = False
+        self._iniciar_figura()
+        self.trabajador.intervalo_base = self.intervalo_simulacion_base
+        self.ultimo_tiempo_simulacion = self._instantanea.publicada
+
+    def _iniciar_figura(self) -> None:
+        # crea la figura, el estado de la animacion y los controles (comun a la visualizacion en vivo y al replay)
         self.fig, self.ax = plt.subplots(figsize=(14, 8))
         self.setup_plot()
         
-        # sistema de interpolacion para movimiento suave
-        self.aviones_anterior = []  # posiciones anteriores para interpolacion
+        # sistema de interpolacion para movimiento suave: x del paso anterior indexada por id (nan = sin dato)
+        self._x_anterior = np.full(1024, np.nan)
+        self._ids_anterior = np.empty(0, dtype=np.int64)  # ids guardados en _x_anterior
         
-        # sistema de animacion vertical para desviacion y reinsercion
-        self.aviones_vertical_animation = {}  # dict para trackear animacion vertical por avion
+        # sistema de animacion vertical para desviacion y reinsercion: y actual indexada por id
+        self._y_actual = np.full(1024, np.nan)
+        self._ids_dibujados = np.empty(0, dtype=np.int64)  # ids dibujados en el cuadro anterior
+        self.velocidad_animacion_vertical = 0.2  # velocidad base de transicion vertical
         
         # colores para diferentes estados
         self.colores_estado = {
@@ -37,6 +56,9 @@ class visualizador_videojuego:
             'desviado': '#ff0000',      # rojo
             'aterrizado': '#888888'     # gris
         }
+        self._colores_por_codigo = np.array([to_rgba(self.colores_estado.get(nombre, '#000000')) for nombre in c.ESTADOS])
+        abreviaturas = {'en_fila': 'FILA', 'desacelerando': 'DESAC', 'reinsercion': 'REINS', 'desviado': 'DESV', 'aterrizado': 'ATER'}
+        self._status_abreviado = [abreviaturas.get(nombre, nombre.upper()) for nombre in c.ESTADOS]
 
         # controles de velocidad y play/pausa
         self.velocidad_multiplier = 1.0
@@ -89,180 +111,173 @@ class visualizador_videojuego:
                                        verticalalignment='top', horizontalalignment='right', fontsize=10,
                                        bbox=dict(boxstyle='round,pad=0.5', facecolor='lightgreen', alpha=0.8))
         
-        self.storm_indicator_lines = []  # lista para almacenar las lineas diagonales
-        self.storm_text = None  # texto "TORMENTA"
-        
-    def obtener_aviones_interpolados(self) -> List[Plane]:
-        # retorna posiciones interpoladas de los aviones para movimiento suave
-        if not self.aviones_anterior or not self.sim.aviones:
-            return self.sim.aviones
+        # artistas persistentes: se crean una vez y en cada cuadro solo se actualizan (ver artistas_animados)
+        self.scatter_aviones = self.ax.scatter(np.empty(0), np.empty(0), s=150, alpha=0.8, # todos los aviones en un solo scatter
+                                               edgecolors='black', linewidth=1, zorder=3)
+        self.etiquetas_aviones = []  # pool de etiquetas, crece a demanda y las que sobran se ocultan
+
+        self.storm_indicator_lines = [self.ax.axvline(x=0, color='black', linewidth=4, alpha=0.8)] # linea vertical central
+        num_lineas = 11 # lineas diagonales rojas
+        for i in range(num_lineas):
+            y_pos = -1.5 + (i * 3.0 / (num_lineas - 1)) # calcular posicion y de la linea diagonal
+            linea = self.ax.plot([-3, 3], [y_pos - 0.3, y_pos + 0.3], color='red', linewidth=6, alpha=0.8)[0]
+            self.storm_indicator_lines.append(linea)
+        self.storm_text = self.ax.text(0, 0, 'TORMENTA', # texto "TORMENTA" en el eje y, rotado 90 grados
+                                       ha='center', va='center', fontsize=16,
+                                       fontweight='bold', color='red',
+                                       rotation=90,
+                                       bbox=dict(boxstyle='round,pad=0.5',
+                                                 facecolor='white', alpha=0.9,
+                                                 edgecolor='red', linewidth=2))
+        self.limpiar_indicador_tormenta()
+
+    def artistas_animados(self) -> list:
+        # artistas que cambian cuadro a cuadro; FuncAnimation (blit=True) redibuja solo estos sobre el fondo guardado
+        return ([self.scatter_aviones, self.texto_info, self.texto_stats, self.storm_text]
+                + self.storm_indicator_lines + self.etiquetas_aviones)
+        
+    def aviones_actuales(self) -> Dict[str, np.ndarray]:
+        # columnas (id, x, v, estado) de los aviones del paso actual
+        if self.trabajador is None:
+            return columnas_aviones(self.sim)
+        return self._instantanea.columnas
+
+    def motivo_cierre_actual(self) -> Optional[str]:
+        # motivo de cierre del aeropuerto en el paso actual (None si esta abierto)
+        return self._instantanea.motivo_cierre
+
+    def _asegurar_capacidad(self, ids: np.ndarray) -> None:
+        # agranda los arreglos indexados por id si aparece un id mas grande que su largo
+        if len(ids) and int(ids.max()) >= len(self._x_anterior):
+            extra = max(int(ids.max()) + 1, 2 * len(self._x_anterior)) - len(self._x_anterior)
+            self._x_anterior = np.concatenate([self._x_anterior, np.full(extra, np.nan)])
+            self._y_actual = np.concatenate([self._y_actual, np.full(extra, np.nan)])
+
+    def guardar_posiciones_anteriores(self, columnas: Optional[Dict[str, np.ndarray]] = None) -> None:
+        # guarda la x de cada avion (indexada por id) para interpolar hacia el paso siguiente
+        if columnas is None:
+            columnas = self.aviones_actuales()
+        self._x_anterior[self._ids_anterior] = np.nan # borrar lo guardado del paso anterior
+        ids = np.asarray(columnas['id'], dtype=np.int64)
+        self._asegurar_capacidad(ids)
+        self._x_anterior[ids] = columnas['x']
+        self._ids_anterior = ids.copy()
+
+    def olvidar_posiciones_anteriores(self) -> None:
+        # sin posiciones anteriores los aviones se dibujan en su posicion actual (saltos, reversa, reset)
+        self._x_anterior[self._ids_anterior] = np.nan
+        self._ids_anterior = np.empty(0, dtype=np.int64)
+
+    def obtener_aviones_interpolados(self) -> Dict[str, np.ndarray]:
+        # retorna las columnas del paso actual con x interpolada entre el paso anterior y el actual (una operacion vectorizada)
+        columnas = self.aviones_actuales()
+        ids = np.asarray(columnas['id'], dtype=np.int64)
+        if not len(self._ids_anterior) or not len(ids):
+            return columnas
         
         intervalo_requerido = self.intervalo_simulacion_base / self.velocidad_multiplier # calcular factor de interpolacion basado en tiempo acumulado
         factor = min(1.0, self.tiempo_acumulado / intervalo_requerido)
         
-        aviones_interpolados = []
-        for avion_actual in self.sim.aviones:
-            avion_anterior = None # buscar avion correspondiente en la posicion anterior
-            for avion_ant in self.aviones_anterior:
-                if avion_ant.id == avion_actual.id:
-                    avion_anterior = avion_ant
-                    break
-            
-            if avion_anterior:
-                # interpolacion normal para todos los casos (incluyendo reinsercion), esto permite ver el movimiento suave hacia atras durante la reinsercion
-                avion_interp = Plane(
-                    id=avion_actual.id,
-                    t_spawn=avion_actual.t_spawn,
-                    x=avion_anterior.x + (avion_actual.x - avion_anterior.x) * factor,
-                    v=avion_actual.v,  # velocidad actual
-                    status=avion_actual.status,
-                    tiempo_estimado=avion_actual.tiempo_estimado
-                )
-                aviones_interpolados.append(avion_interp)
-            else:
-                aviones_interpolados.append(avion_actual) # si no hay posicion anterior, usar posicion actual
-        
-        return aviones_interpolados
+        self._asegurar_capacidad(ids)
+        x_anterior = self._x_anterior[ids]
+        x = np.asarray(columnas['x'], dtype=float)
+        # interpolacion normal para todos los casos (incluyendo reinsercion), sin posicion anterior se usa la actual
+        x = np.where(np.isnan(x_anterior), x, x_anterior + (x - x_anterior) * factor)
+        return dict(columnas, x=x)
     
     def dibujar_indicador_tormenta(self) -> None:
-        # dibuja el indicador visual de tormenta en el eje y
-        self.limpiar_indicador_tormenta() # limpiar indicadores anteriores
-        
-        m_actual = self.sim.tiempo_actual % 1440 # verificar si hay tormenta activa usando la funcion existente
-        motivo_cierre = self.sim._motivo_cierre_actual(m_actual)
-        
-        if motivo_cierre == "tormenta":
-            self.ax.axvline(x=0, color='black', linewidth=4, alpha=0.8) # dibujar linea vertical central
-            
-            num_lineas = 11 # dibujar lineas diagonales rojas
-            for i in range(num_lineas):
-                y_pos = -1.5 + (i * 3.0 / (num_lineas - 1)) # calcular posicion y de la linea diagonal
-                
-                x_start = -3 # dibujar linea diagonal (pendiente positiva)
-                x_end = 3
-                y_start = y_pos - 0.3
-                y_end = y_pos + 0.3
-                
-                linea = self.ax.plot([x_start, x_end], [y_start, y_end], 
-                                   color='red', linewidth=6, alpha=0.8)[0]
-                self.storm_indicator_lines.append(linea)
-            
-            self.storm_text = self.ax.text(0, 0, 'TORMENTA', # agregar texto "TORMENTA" en el eje y, rotado 90 grados
-                                         ha='center', va='center', fontsize=16, 
-                                         fontweight='bold', color='red',
-                                         rotation=90,
-                                         bbox=dict(boxstyle='round,pad=0.5', 
-                                                 facecolor='white', alpha=0.9,
-                                                 edgecolor='red', linewidth=2))
+        # muestra u oculta el indicador de tormenta (los artistas ya existen, solo cambia la visibilidad)
+        visible = self.motivo_cierre_actual() == "tormenta"
+        if self.storm_text.get_visible() != visible:
+            for linea in self.storm_indicator_lines:
+                linea.set_visible(visible)
+            self.storm_text.set_visible(visible)
     
     def limpiar_indicador_tormenta(self) -> None:
-        # limpia el indicador de tormenta del grafico
-        for linea in self.storm_indicator_lines: # remover lineas diagonales
-            linea.remove()
-        self.storm_indicator_lines.clear()
-        
-        if self.storm_text is not None: # remover texto
-            self.storm_text.remove()
-            self.storm_text = None
+        # oculta el indicador de tormenta
+        for linea in self.storm_indicator_lines:
+            linea.set_visible(False)
+        self.storm_text.set_visible(False)
     
-    def calcular_posicion_y(self, avion) -> float:
-        # calcula la posicion y con animacion vertical suave
-        avion_id = avion.id
-        
-        if avion.status == "desviado": # posiciones objetivo segun el estado
-            y_objetivo = 0.8  # fila superior para aviones desviados
-        else:
-            y_objetivo = 0.0  # fila principal para todos los demas aviones
-        
-        if avion_id not in self.aviones_vertical_animation: # inicializar animacion si no existe
-            self.aviones_vertical_animation[avion_id] = {
-                'y_actual': y_objetivo,
-                'y_objetivo': y_objetivo,
-                'velocidad_animacion_base': 0.2  # velocidad base de transicion vertical
-            }
-        
-        animacion = self.aviones_vertical_animation[avion_id]
-        
-        if animacion['y_objetivo'] != y_objetivo: # actualizar objetivo si cambio el estado
-            animacion['y_objetivo'] = y_objetivo
-        
-        velocidad_animacion_escalada = animacion['velocidad_animacion_base'] * self.velocidad_multiplier # escalar velocidad de animacion con el multiplicador de velocidad de simulacion
-        
-        diferencia = animacion['y_objetivo'] - animacion['y_actual'] # interpolar hacia el objetivo
-        if abs(diferencia) > 0.01:  # solo animar si hay diferencia significativa
-            animacion['y_actual'] += diferencia * velocidad_animacion_escalada
-        else:
-            animacion['y_actual'] = animacion['y_objetivo']
-        
-        return animacion['y_actual']
+    def calcular_posicion_y(self, ids: np.ndarray, estados: np.ndarray) -> np.ndarray:
+        # calcula la posicion y de todos los aviones con animacion vertical suave (y actual guardada por id)
+        self._asegurar_capacidad(ids)
+        y_objetivo = np.where(estados == c.DESVIADO, 0.8, 0.0) # fila superior para desviados, principal para el resto
+        y = self._y_actual[ids]
+        y = np.where(np.isnan(y), y_objetivo, y) # aviones nuevos arrancan en su fila
+        
+        velocidad_animacion_escalada = min(1.0, self.velocidad_animacion_vertical * self.velocidad_multiplier) # escalar velocidad de animacion con el multiplicador de velocidad de simulacion
+        
+        diferencia = y_objetivo - y # interpolar hacia el objetivo, solo si la diferencia es significativa
+        y = np.where(np.abs(diferencia) > 0.01, y + diferencia * velocidad_animacion_escalada, y_objetivo)
+        self._y_actual[ids] = y
+        return y
     
-    def limpiar_animaciones_aviones_removidos(self) -> None:
-        # limpia las animaciones de aviones que ya no estan en la simulacion
-        aviones_actuales_ids = {avion.id for avion in self.sim.aviones}
-        aviones_a_remover = []
-        
-        for avion_id in self.aviones_vertical_animation:
-            if avion_id not in aviones_actuales_ids:
-                aviones_a_remover.append(avion_id)
-        
-        for avion_id in aviones_a_remover:
-            del self.aviones_vertical_animation[avion_id]
+    def limpiar_animaciones_aviones_removidos(self, ids: np.ndarray) -> None:
+        # olvida la y de los aviones dibujados en el cuadro anterior que ya no estan
+        removidos = np.setdiff1d(self._ids_dibujados, ids, assume_unique=True)
+        self._y_actual[removidos] = np.nan
+        self._ids_dibujados = ids.copy()
+
+    def reiniciar_animaciones(self) -> None:
+        # borra posiciones anteriores y animaciones verticales
+        self.olvidar_posiciones_anteriores()
+        self._y_actual[:] = np.nan
+        self._ids_dibujados = np.empty(0, dtype=np.int64)
         
     def limpiar_aviones_y_etiquetas(self) -> None:
-        # limpia todos los aviones y etiquetas del grafico
-        for artista in self.ax.collections[:]: # limpiar aviones anteriores
-            if hasattr(artista, '_es_avion'):
-                artista.remove()
-        
-        for artista in self.ax.texts[:]: # limpiar etiquetas de texto anteriores
-            if hasattr(artista, '_es_etiqueta_avion'):
-                artista.remove()
+        # vacia el scatter y oculta todas las etiquetas
+        self.scatter_aviones.set_offsets(np.empty((0, 2)))
+        for etiqueta in self.etiquetas_aviones:
+            etiqueta.set_visible(False)
+
+    def _etiqueta(self, i: int):
+        # devuelve la etiqueta i del pool, creandola si hace falta
+        while len(self.etiquetas_aviones) <= i:
+            etiqueta = self.ax.annotate('', (0, 0), xytext=(0, 25), textcoords='offset points',
+                                        fontsize=8, ha='center', va='bottom', zorder=4,
+                                        bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8, edgecolor='black'))
+            self.etiquetas_aviones.append(etiqueta)
+        return self.etiquetas_aviones[i]
         
     def dibujar_aviones(self) -> None:
-        # dibuja todos los aviones en el grafico
-        self.limpiar_aviones_y_etiquetas() # limpiar aviones y etiquetas anteriores
-        
-        self.limpiar_animaciones_aviones_removidos() # limpiar animaciones de aviones removidos
-        
+        # actualiza el scatter y las etiquetas con los aviones del paso (sin crear ni borrar artistas)
         aviones_a_dibujar = self.obtener_aviones_interpolados() # obtener aviones interpolados para movimiento suave
+        ids = np.asarray(aviones_a_dibujar['id'], dtype=np.int64)
+        self.limpiar_animaciones_aviones_removidos(ids) # limpiar animaciones de aviones removidos
         
-        if not aviones_a_dibujar:
+        if not len(ids):
+            self.limpiar_aviones_y_etiquetas()
             return
-            
-        for i, avion in enumerate(aviones_a_dibujar): # dibujar cada avion
-            color = self.colores_estado.get(avion.status, '#000000')
-            
-            y_pos = self.calcular_posicion_y(avion) # calcular posicion y con animacion vertical
-            
-            avion_artista = self.ax.scatter(avion.x, y_pos, # dibujar avion como circulo
-                                          color=color, s=150, alpha=0.8, 
-                                          edgecolors='black', linewidth=1)
-            avion_artista._es_avion = True
-            
-            status_abreviado = { # etiqueta simplificada con solo id, status y velocidad
-                'en_fila': 'FILA',
-                'desacelerando': 'DESAC',
-                'reinsercion': 'REINS',
-                'desviado': 'DESV',
-                'aterrizado': 'ATER'
-            }.get(avion.status, avion.status.upper())
-            
-            info_text = f'ID: {avion.id}\n{status_abreviado}\n{avion.v:.0f}kt'
-                
-            etiqueta = self.ax.annotate(info_text, (avion.x, y_pos),
-                           xytext=(0, 25 if y_pos > 0 else -25), 
-                           textcoords='offset points',
-                           fontsize=8, ha='center', va='bottom' if y_pos > 0 else 'top',
-                           bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8, edgecolor='black'))
-            etiqueta._es_etiqueta_avion = True
+        
+        x = np.asarray(aviones_a_dibujar['x'], dtype=float)
+        estados = np.asarray(aviones_a_dibujar['estado'], dtype=np.int64)
+        y = self.calcular_posicion_y(ids, estados) # calcular posicion y con animacion vertical
+        self.scatter_aviones.set_offsets(np.column_stack([x, y]))
+        self.scatter_aviones.set_facecolors(self._colores_por_codigo[estados])
+        
+        for i, (avion_id, x_i, y_i, v_i, estado) in enumerate(zip(ids.tolist(), x.tolist(), y.tolist(),
+                                                                 aviones_a_dibujar['v'].tolist(), estados.tolist())):
+            etiqueta = self._etiqueta(i) # etiqueta simplificada con solo id, status y velocidad
+            etiqueta.set_text(f'ID: {avion_id}\n{self._status_abreviado[estado]}\n{v_i:.0f}kt')
+            etiqueta.xy = (x_i, y_i)
+            etiqueta.set_position((0, 25 if y_i > 0 else -25))
+            etiqueta.set_verticalalignment('bottom' if y_i > 0 else 'top')
+            etiqueta.set_visible(True)
+        
+        for etiqueta in self.etiquetas_aviones[len(ids):]: # ocultar las que sobran
+            etiqueta.set_visible(False)
     
     def actualizar_informacion(self) -> None:
         # actualiza la informacion de tiempo y estado
-        hora_actual = self.sim.obtener_hora_actual()
-        dia_actual = self.sim.obtener_dia_actual()
-        aeropuerto_abierto = self.sim.esta_aeropuerto_abierto()
+        # todo lo que cambia paso a paso sale de la instantanea; los parametros fijos se leen de la simulacion
+        inst = self._instantanea
+        minutos_en_dia = inst.tiempo_actual % 1440
+        hora_actual = f"{minutos_en_dia // 60:02d}:{minutos_en_dia % 60:02d}"
+        dia_actual = inst.tiempo_actual // 1440 + 1
+        storm_inicio_min = inst.storm_inicio_min or 0
         
-        estado_aeropuerto = "abierto" if aeropuerto_abierto else "cerrado"
+        estado_aeropuerto = "abierto" if inst.motivo_cierre is None else "cerrado"
         
         info_text = (
             f"dia: {dia_actual}\n"
@@ -272,15 +287,15 @@ class visualizador_videojuego:
             f"viento: {'on' if self.sim.viento_activo else 'off'} "
             f"(p de desvio = {self.sim.p_goaround:.2f})\n"
             f"tormenta: {'on' if self.sim.storm_activa else 'off'} "
-            f"({(self.sim.storm_inicio_min or 0)//60:02d}:{(self.sim.storm_inicio_min or 0)%60:02d}"
-            f"-{((self.sim.storm_inicio_min or 0)+self.sim.storm_duracion_min)%1440//60:02d}:"
-            f"{((self.sim.storm_inicio_min or 0)+self.sim.storm_duracion_min)%60:02d})"
+            f"({storm_inicio_min//60:02d}:{storm_inicio_min%60:02d}"
+            f"-{(storm_inicio_min+self.sim.storm_duracion_min)%1440//60:02d}:"
+            f"{(storm_inicio_min+self.sim.storm_duracion_min)%60:02d})"
         )
         
         self.texto_info.set_text(info_text)
         
-        stats = self.sim.obtener_estadisticas() # estadisticas
-        stats_text = f"aviones activos: {len(self.sim.aviones)}\n"
+        stats = inst.estadisticas # estadisticas
+        stats_text = f"aviones activos: {len(inst.columnas['id'])}\n"
         stats_text += f"total generados: {stats['total_aviones']}\n"
         stats_text += f"aterrizados: {stats['aterrizados']}\n"
         stats_text += f"desviados por congestion: {stats['desviados']}\n"
@@ -292,47 +307,40 @@ class visualizador_videojuego:
         self.texto_stats.set_text(stats_text)
     
     
-    def animar(self, frame) -> None:
-        # funcion de animacion principal con interpolacion suave
+    def animar(self, frame) -> list:
+        # funcion de animacion principal con interpolacion suave, devuelve los artistas a redibujar (blit)
+        # los pasos los da el trabajador: aca solo se toma la instantanea mas nueva (si hay) y se dibuja
         if self.paused:
-            return
+            return self.artistas_animados()
 
-        tiempo_actual = time.time()
-        delta_tiempo = tiempo_actual - self.ultimo_tiempo_simulacion
-        self.ultimo_tiempo_simulacion = tiempo_actual
-        
-        self.tiempo_acumulado += delta_tiempo # acumular tiempo y procesar pasos de simulacion segun la velocidad
-        intervalo_requerido = self.intervalo_simulacion_base / self.velocidad_multiplier
-        
-        while self.tiempo_acumulado >= intervalo_requerido: # procesar pasos de simulacion si ha pasado suficiente tiempo
-            self.tiempo_acumulado -= intervalo_requerido
-            
-            self.aviones_anterior = [] # guardar posiciones anteriores para interpolacion
-            for avion in self.sim.aviones:
-                avion_copia = Plane(
-                    id=avion.id,
-                    t_spawn=avion.t_spawn,
-                    x=avion.x,
-                    v=avion.v,
-                    status=avion.status,
-                    tiempo_estimado=avion.tiempo_estimado
-                )
-                self.aviones_anterior.append(avion_copia)
-            
-            if self.sim.tiempo_actual < self.sim.dias_simulacion * 1440: # procesar paso de simulacion
-                self.sim.procesar_paso_temporal()
+        nueva = self.trabajador.ultima_instantanea()
+        if nueva is not None:
+            if nueva.anteriores is not None: # posiciones antes del ultimo paso, para interpolar hacia las nuevas
+                self.guardar_posiciones_anteriores(nueva.anteriores)
             else:
-                self.mostrar_estadisticas_finales() # simulacion terminada
-                return
+                self.olvidar_posiciones_anteriores()
+            self._instantanea = nueva
+            self.ultimo_tiempo_simulacion = nueva.publicada
+        # fraccion del intervalo entre pasos ya transcurrida desde que se publico el ultimo (la usa la interpolacion)
+        self.tiempo_acumulado = min(time.perf_counter() - self.ultimo_tiempo_simulacion,
+                                    self.intervalo_simulacion_base / self.velocidad_multiplier)
+
+        if self._instantanea.terminada and not self._finales_mostradas: # simulacion terminada
+            self._finales_mostradas = True
+            self.mostrar_estadisticas_finales()
         
         self.dibujar_aviones() # actualizar visualizacion con interpolacion (siempre, para movimiento suave)
         self.dibujar_indicador_tormenta()
         self.actualizar_informacion()
+        return self.artistas_animados()
     
     def mostrar_estadisticas_finales(self) -> None:
         # muestra las estadisticas finales cuando termina la simulacion
-        self.sim.calcular_estadisticas_finales()
-        stats = self.sim.obtener_estadisticas()
+        if self.trabajador is not None and self.trabajador.is_alive():
+            stats = self._instantanea.estadisticas # el trabajador ya las calculo al terminar
+        else:
+            self.sim.calcular_estadisticas_finales()
+            stats = self.sim.obtener_estadisticas()
         
         print("\n" + "="*50)
         print("estadisticas finales de la simulacion")
@@ -359,17 +367,29 @@ class visualizador_videojuego:
     def ejecutar_visualizacion(self) -> None:
         # ejecuta la visualizacion tipo videojuego
         print("iniciando visualizacion tipo videojuego...")
+        if self.trabajador is not None:
+            self.trabajador.start()
         
         try:
             anim = animation.FuncAnimation(self.fig, self.animar, # crear animacion con interpolacion suave, usar intervalo fijo y controlar velocidad con el multiplicador
+                                         init_func=self.artistas_animados,
                                          interval=33,  # ~30 fps para movimiento suave
-                                         blit=False, repeat=False, cache_frame_data=False)
+                                         blit=True, repeat=False, cache_frame_data=False) # blit: solo se redibujan los artistas animados
             
             plt.show()
             
         except KeyboardInterrupt:
             print("\nvisualizacion detenida por el usuario")
+            self.detener_simulacion()
             self.mostrar_estadisticas_finales()
+        finally:
+            self.detener_simulacion()
+
+    def detener_simulacion(self) -> None:
+        # termina el hilo trabajador; despues la simulacion se puede leer directamente
+        if self.trabajador is not None and self.trabajador.is_alive():
+            self.trabajador.detener()
+            self.trabajador.join()
 
     def setup_controls(self) -> None:
         # agrega controles interactivos de velocidad, play/pausa y reset
@@ -388,25 +408,231 @@ class visualizador_videojuego:
     def cambiar_velocidad(self, val) -> None:
         # se llama cuando se modifica el slider de velocidad
         self.velocidad_multiplier = val
+        if self.trabajador is not None:
+            self.trabajador.cambiar_velocidad(val)
     
     def toggle_pause(self, event) -> None:
         # toggle de play/pausa
         self.paused = not self.paused
+        if self.trabajador is not None:
+            self.trabajador.pausar(self.paused)
         self.pause_button.label.set_text('Reanudar' if self.paused else 'Pausa')
+        self.fig.canvas.draw_idle() # el boton no es un artista animado
 
     def reset_velocidad(self, event) -> None:
         # resetea toda la simulacion a su estado inicial
-        self.sim.reiniciar_simulacion() # resetear la simulacion
+        self.trabajador.reiniciar() # resetear la simulacion (la reinicia el trabajador, que publica el estado inicial)
         
-        self.aviones_anterior = [] # resetear estado de visualizacion
-        self.aviones_vertical_animation = {}
+        self.reiniciar_animaciones() # resetear estado de visualizacion
         self.tiempo_acumulado = 0.0
-        self.ultimo_tiempo_simulacion = time.time()
+        self.ultimo_tiempo_simulacion = time.perf_counter()
+        self._finales_mostradas = False
         
         self.velocidad_multiplier = 1.0 # resetear controles
         self.paused = False
+        self.trabajador.pausar(False)
+        self.slider_velocidad.reset() # dispara cambiar_velocidad(1.0)
+        self.pause_button.label.set_text('Pausa')
+
+# reproduce una grabacion de trayectorias (ver trayectorias.py) en lugar de una simulacion en vivo.
+# cada cuadro lee solo el paso que se muestra (memmap), asi se puede saltar a cualquier minuto con el slider
+# de tiempo, reproducir muy por encima de 20x y retroceder paso a paso
+class visualizador_replay(visualizador_videojuego):
+
+    VELOCIDAD_MINIMA = 0.1
+    VELOCIDAD_MAXIMA = 2000.0  # el slider de velocidad es logaritmico entre estos dos valores
+
+    def __init__(self, ruta: str) -> None:
+        self.lector = LectorTrayectorias(ruta)
+        if len(self.lector) == 0:
+            raise ValueError(f"la grabacion en {ruta} no tiene pasos")
+        self.parametros = self.lector.parametros
+        self.paso_actual = 0
+        self.direccion = 1  # 1 hacia adelante, -1 hacia atras
+        self._paso = self.lector.paso(0)  # columnas del paso mostrado
+        self.slider_tiempo = None
+        self._iniciar_figura()
+
+    def aviones_actuales(self) -> Dict[str, np.ndarray]:
+        return self._paso
+
+    def motivo_cierre_actual(self) -> Optional[str]:
+        return self.lector.contadores(self.paso_actual)['cierre']
+
+    def ir_a_paso(self, i: int, interpolar: bool = True) -> None:
+        # salta directo al paso i (acotado a la grabacion); solo se leen el paso i y su vecino para interpolar
+        i = int(np.clip(i, 0, len(self.lector) - 1))
+        if i == self.paso_actual:
+            return
+        anterior = i - self.direccion
+        if interpolar and 0 <= anterior < len(self.lector):
+            self.guardar_posiciones_anteriores(self._paso if anterior == self.paso_actual else self.lector.paso(anterior))
+        else:
+            self.olvidar_posiciones_anteriores()
+        self.paso_actual = i
+        self._paso = self.lector.paso(i)
+
+    def ir_a_minuto(self, minuto: int) -> None:
+        # salta al ultimo paso grabado en o antes del minuto dado
+        self.ir_a_paso(self.lector.indice_minuto(max(minuto, int(self.lector.minutos[0]))), interpolar=False)
+
+    def _texto_minuto(self, minuto: int) -> str:
+        return f"dia {minuto // 1440 + 1} {minuto % 1440 // 60:02d}:{minuto % 60:02d}"
+
+    def actualizar_informacion(self) -> None:
+        # actualiza la informacion de tiempo y estado a partir de la grabacion
+        minuto = int(self.lector.minutos[self.paso_actual])
+        contadores = self.lector.contadores(self.paso_actual)
+        p = self.parametros
+
+        info_text = (
+            f"replay: {self._texto_minuto(minuto)}\n"
+            f"paso {self.paso_actual + 1}/{len(self.lector)} "
+            f"({'adelante' if self.direccion > 0 else 'atras'}, {self.velocidad_multiplier:.1f}x)\n"
+            f"aeropuerto: {'abierto' if contadores['cierre'] is None else 'cerrado'}\n"
+            f"lambda: {p.get('lambda_param', float('nan')):.4f}\n"
+            f"viento: {'on' if p.get('viento_activo') else 'off'} "
+            f"(p de desvio = {p.get('p_goaround', 0.0):.2f})\n"
+            f"tormenta: {'on' if p.get('storm_activa') else 'off'}"
+        )
+        self.texto_info.set_text(info_text)
+
+        stats_text = f"aviones activos: {len(self._paso['id'])}\n"
+        stats_text += f"total generados: {contadores['total_aviones']}\n"
+        stats_text += f"aterrizados: {contadores['aterrizados']}\n"
+        stats_text += f"desviados por congestion: {contadores['desviados']}\n"
+        stats_text += f"desvios por viento: {contadores['desvios_viento']}\n"
+        stats_text += f"desvios por tormenta: {contadores['desvios_tormenta']}\n"
+        stats_text += f"desvios por cierre: {contadores['desvios_cierre']}\n"
+        stats_text += f"desvios a montevideo: {contadores['desvios_a_montevideo']}"
+        self.texto_stats.set_text(stats_text)
+
+    def _redibujar(self) -> None:
+        # dibuja el paso actual y mueve el slider de tiempo sin disparar otro salto
+        self.dibujar_aviones()
+        self.dibujar_indicador_tormenta()
+        self.actualizar_informacion()
+        minuto = int(self.lector.minutos[self.paso_actual])
+        if self.slider_tiempo is not None and self.slider_tiempo.val != minuto:
+            self.slider_tiempo.eventson = False # mover el slider desde el codigo no dispara cambiar_tiempo
+            self.slider_tiempo.set_val(minuto)
+            self.slider_tiempo.eventson = True
+        if self.slider_tiempo is not None:
+            self.slider_tiempo.valtext.set_text(self._texto_minuto(minuto))
+
+    def artistas_animados(self) -> list:
+        # ademas de los del grafico, el slider de tiempo se mueve en cada cuadro: la barra, sus lineas (incluye
+        # la manija) y el texto. solo se usan atributos publicos del slider y de su axes
+        artistas = super().artistas_animados()
+        if self.slider_tiempo is not None:
+            artistas += [self.slider_tiempo.poly, *self.slider_tiempo.ax.lines, self.slider_tiempo.valtext]
+        return artistas
+
+    def animar(self, frame) -> list:
+        # avanza (o retrocede) tantos pasos como corresponda a la velocidad, saltando directo al paso destino
+        if self.paused:
+            self.ultimo_tiempo_simulacion = time.time() # al reanudar no se recupera el tiempo en pausa
+            return self.artistas_animados()
+
+        tiempo_actual = time.time()
+        self.tiempo_acumulado += tiempo_actual - self.ultimo_tiempo_simulacion
+        self.ultimo_tiempo_simulacion = tiempo_actual
+
+        intervalo_requerido = self.intervalo_simulacion_base / self.velocidad_multiplier
+        pasos = int(self.tiempo_acumulado // intervalo_requerido)
+        if pasos:
+            self.tiempo_acumulado -= pasos * intervalo_requerido
+            destino = self.paso_actual + self.direccion * pasos
+            self.ir_a_paso(destino)
+            if destino != self.paso_actual: # llego a un extremo de la grabacion
+                self.tiempo_acumulado = 0.0
+                self.olvidar_posiciones_anteriores()
+                self.toggle_pause(None)
+
+        self._redibujar()
+        return self.artistas_animados()
+
+    def mostrar_estadisticas_finales(self) -> None:
+        # muestra los contadores al final de la grabacion
+        contadores = self.lector.contadores(len(self.lector) - 1)
+        print("\n" + "="*50)
+        print("estadisticas finales de la grabacion")
+        print("="*50)
+        for clave, valor in contadores.items():
+            print(f"{clave}: {valor}")
+        print("="*50)
+
+    def setup_controls(self) -> None:
+        # controles del replay: velocidad logaritmica, slider de tiempo, pausa, paso atras/adelante, reversa y reinicio
+        ax_tiempo = plt.axes([0.15, 0.065, 0.53, 0.03]) # slider de tiempo (acceso aleatorio por minuto)
+        minutos = self.lector.minutos
+        self.slider_tiempo = Slider(ax_tiempo, 'Tiempo', int(minutos[0]), max(int(minutos[-1]), int(minutos[0]) + 1),
+                                    valinit=int(minutos[0]), valstep=1)
+        self.slider_tiempo.on_changed(self.cambiar_tiempo)
+        self.slider_tiempo.drawon = False # lo redibuja el blit de la animacion, no un draw completo por cuadro
+
+        ax_speed = plt.axes([0.15, 0.02, 0.3, 0.03]) # slider de velocidad en escala log10
+        self.slider_velocidad = Slider(ax_speed, 'Velocidad', np.log10(self.VELOCIDAD_MINIMA),
+                                       np.log10(self.VELOCIDAD_MAXIMA), valinit=0.0)
+        self.slider_velocidad.on_changed(self.cambiar_velocidad)
+        self.slider_velocidad.valtext.set_text('1.0x')
+
+        ax_pause = plt.axes([0.50, 0.02, 0.08, 0.03])
+        self.pause_button = Button(ax_pause, 'Pausa')
+        self.pause_button.on_clicked(self.toggle_pause)
+
+        ax_atras = plt.axes([0.60, 0.02, 0.04, 0.03])
+        self.atras_button = Button(ax_atras, '<')
+        self.atras_button.on_clicked(lambda event: self.paso_manual(-1))
+
+        ax_adelante = plt.axes([0.645, 0.02, 0.04, 0.03])
+        self.adelante_button = Button(ax_adelante, '>')
+        self.adelante_button.on_clicked(lambda event: self.paso_manual(1))
+
+        ax_reversa = plt.axes([0.70, 0.02, 0.08, 0.03])
+        self.reversa_button = Button(ax_reversa, 'Reversa')
+        self.reversa_button.on_clicked(self.toggle_direccion)
+
+        ax_reset = plt.axes([0.80, 0.02, 0.08, 0.03])
+        self.reset_button = Button(ax_reset, 'Reiniciar')
+        self.reset_button.on_clicked(self.reset_velocidad)
+
+    def cambiar_velocidad(self, val) -> None:
+        # el slider esta en log10: 0 = 1x, 3 = 1000x
+        self.velocidad_multiplier = 10 ** val
+        self.slider_velocidad.valtext.set_text(f'{self.velocidad_multiplier:.1f}x')
+
+    def cambiar_tiempo(self, val) -> None:
+        # salto por el slider de tiempo
+        self.ir_a_minuto(int(val))
+        self.tiempo_acumulado = 0.0
+        self._redibujar()
+
+    def paso_manual(self, delta: int) -> None:
+        # pausa y mueve un paso (delta=-1 atras, 1 adelante)
+        if not self.paused:
+            self.toggle_pause(None)
+        self.ir_a_paso(self.paso_actual + delta, interpolar=False)
+        self._redibujar()
+
+    def toggle_direccion(self, event) -> None:
+        # alterna reproduccion hacia adelante / hacia atras
+        self.direccion = -self.direccion
+        self.olvidar_posiciones_anteriores()
+        self.reversa_button.label.set_text('Adelante' if self.direccion < 0 else 'Reversa')
+
+    def reset_velocidad(self, event) -> None:
+        # vuelve al principio de la grabacion a velocidad 1x
+        self.direccion = 1
+        self.reversa_button.label.set_text('Reversa')
+        self.ir_a_paso(0, interpolar=False)
+        self.reiniciar_animaciones()
+        self.tiempo_acumulado = 0.0
+        self.ultimo_tiempo_simulacion = time.time()
+        self.paused = False
         self.slider_velocidad.reset()
         self.pause_button.label.set_text('Pausa')
+        self._redibujar()
 
 def main() -> None:
     # funcion principal para ejecutar la simulacion con visualizacion
@@ -414,8 +640,9 @@ def main() -> None:
     print("selecciona una opcion:")
     print("1. visualización")
     print("2. simulacion con parametros personalizados")
+    print("3. replay de una simulacion grabada")
     
-    opcion = input("ingresa tu opcion (1-2): ")
+    opcion = input("ingresa tu opcion (1-3): ")
     
     if opcion == "1":
         lambda_param = float(input("ingresa lambda: "))
@@ -453,6 +680,27 @@ def main() -> None:
         for key, value in stats.items():
             print(f"{key}: {value['promedio']:.2f} ± {value['error_estandar']:.2f}")
     
+    elif opcion == "3":
+        ruta = input("ingresa el directorio de la grabacion: ")
+        if not os.path.exists(os.path.join(ruta, "meta.json")): # no hay grabacion: simular y grabar primero
+            print("no hay una grabacion en ese directorio, se graba una simulacion nueva")
+            lambda_param = float(input("ingresa lambda: "))
+            dias_simulacion = int(input("ingresa cantidad de dias a simular (ej: 3): "))
+            dia_ventoso = ask_bool("ingresa 'True' si los dias son ventosos (si no 'False'): ")
+            p_go = ask_prob_01("ingresa probabilidad de go-around por viento (0-1): ") if dia_ventoso else 0.0
+
+            tormenta = ask_bool("ingresa 'True' si puede haber tormenta (si no 'False'): ")
+            p_tormenta = ask_prob_01("ingresa probabilidad diaria de tormenta (0-1): ") if tormenta else 0.0
+            tiempo = ask_pos_int("ingresa duración (en minutos) de cada tormenta: ") if tormenta else 0
+
+            usar_metering = ask_bool("usar protocolo nuevo (metering)? True/False: ")
+            grabar_simulacion(ruta, lambda_param=lambda_param, dias_simulacion=dias_simulacion, viento_activo=dia_ventoso,
+                              p_goaround=p_go, storm_activa=tormenta, storm_prob=p_tormenta,
+                              storm_duracion_min=tiempo, enable_metering=usar_metering)
+
+        viz = visualizador_replay(ruta)
+        viz.ejecutar_visualizacion()
+    
     else:
         print("opcion invalida")
 